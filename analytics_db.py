@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Embedded SQL backend for the Analysis Dashboard aggregations.
+
+The weekly outcomes table (data_outcomes_with_tiers.csv) is loaded into an
+in-process database, rolled up to one row per student in SQL, and the
+Attendance Analysis tier pivots and tier means are answered by GROUP BY
+queries instead of pandas.
+
+DuckDB is used when it is installed: it scans the columnar cache's Parquet
+files directly (no pandas copy) and aggregates on all cores. Otherwise the
+standard library's sqlite3 is used, with the weekly rows loaded through
+pandas once. Both get indexes on student_id and week.
+"""
+import sqlite3
+import threading
+
+import pandas as pd
+
+from data_store import columnar_files, read_table
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Outcome fields are constant within a student, so MAX() picks the student's value
+STUDENT_ROLLUP_SQL = '''
+CREATE TABLE students AS
+SELECT
+    student_id,
+    NULLIF(MAX("Baseline Score"), 0) AS "Baseline_Score",
+    MAX("Score Difference") AS "Score_Difference",
+    MAX("Survey Tier") AS "Survey Tier",
+    MAX("Large Group Tier") AS "Large Group Tier",
+    MAX("Small Group Tier") AS "Small Group Tier",
+    MAX("Class Participation Tier") AS "Class Participation Tier"
+FROM weekly
+WHERE student_id IS NOT NULL
+GROUP BY student_id
+'''
+
+INDEXES = {
+    'weekly': ['student_id', 'week'],
+    'students': ['student_id']
+}
+
+
+def default_engine():
+    """'duckdb' when it is installed, else 'sqlite'."""
+    return 'duckdb' if duckdb is not None else 'sqlite'
+
+
+def _quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quote_literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class AnalyticsDB:
+    """In-memory DuckDB or SQLite database over the weekly outcomes table."""
+
+    def __init__(self, outcomes_path, engine=None):
+        self.engine = engine or default_engine()
+        self._lock = threading.Lock()
+        if self.engine == 'duckdb':
+            if duckdb is None:
+                raise ImportError("duckdb is not installed")
+            self._con = duckdb.connect(':memory:')
+            files = columnar_files(outcomes_path)
+            if files is not None:
+                self._con.execute(
+                    f"CREATE TABLE weekly AS SELECT * FROM read_parquet([{', '.join(map(_quote_literal, files))}])"
+                )
+            else:
+                weekly_df = read_table(outcomes_path)
+                self._con.register('weekly_df', weekly_df)
+                self._con.execute("CREATE TABLE weekly AS SELECT * FROM weekly_df")
+                self._con.unregister('weekly_df')
+        elif self.engine == 'sqlite':
+            # Shared by Streamlit sessions across threads; queries are serialized by the lock
+            self._con = sqlite3.connect(':memory:', check_same_thread=False)
+            read_table(outcomes_path).to_sql('weekly', self._con, index=False)
+        else:
+            raise ValueError(f"Unknown engine: {self.engine}")
+
+        self._con.execute(STUDENT_ROLLUP_SQL)
+        for table, columns in INDEXES.items():
+            for column in columns:
+                self._con.execute(f"CREATE INDEX idx_{table}_{column} ON {table} ({_quote_identifier(column)})")
+
+    def query(self, sql, params=()):
+        """Run a query and return the result as a DataFrame."""
+        with self._lock:
+            if self.engine == 'duckdb':
+                return self._con.execute(sql, list(params)).df()
+            cursor = self._con.execute(sql, params)
+            columns = [d[0] for d in cursor.description]
+            rows = cursor.fetchall()
+        return pd.DataFrame(rows, columns=columns)
+
+    def tier_pivot(self, tier_column, score_column='Baseline_Score', bins=(480, 490, 500, 510, 520),
+                   labels=('480-489', '490-499', '500-509', '510-520')):
+        """Students per score range x tier, like pd.cut + pivot_table(aggfunc='count', fill_value=0)."""
+        score, tier = _quote_identifier(score_column), _quote_identifier(tier_column)
+        # (low, high] ranges, as pd.cut builds them
+        cases = ' '.join(
+            f"WHEN {score} > {low} AND {score} <= {high} THEN {_quote_literal(label)}"
+            for low, high, label in zip(bins[:-1], bins[1:], labels)
+        )
+        counts = self.query(
+            f"SELECT Score_Range, tier, COUNT(*) AS students FROM ("
+            f"SELECT CASE {cases} END AS Score_Range, {tier} AS tier FROM students "
+            f"WHERE {score} IS NOT NULL AND {tier} IS NOT NULL"
+            f") AS ranged WHERE Score_Range IS NOT NULL GROUP BY Score_Range, tier"
+        )
+        pivot = counts.pivot(index='Score_Range', columns='tier', values='students')
+        pivot = pivot.reindex([label for label in labels if label in pivot.index]).sort_index(axis=1)
+        pivot.columns.name = tier_column
+        return pivot.fillna(0).astype('int64')
+
+    def tier_means(self, tier_column, metric='Score_Difference'):
+        """Mean of `metric` and student count per tier, ordered by tier."""
+        tier, value = _quote_identifier(tier_column), _quote_identifier(metric)
+        return self.query(
+            f"SELECT {tier} AS Tier, AVG({value}) AS Avg_Score_Improvement, COUNT({value}) AS Student_Count "
+            f"FROM students WHERE {value} IS NOT NULL AND {tier} IS NOT NULL GROUP BY {tier} ORDER BY {tier}"
+        )
@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the dashboard's loaders, aggregations and page builds.
+
+The student-data files are replicated 1x, 10x and 100x (each copy gets its
+own block of student IDs) into a scratch directory, then three groups of
+timings are taken at every scale:
+
+* loaders    - CSV parse into the columnar cache (cold) and Parquet reads (warm)
+* transforms - outcome table, student features, school categories, student
+               partitions, the JW exam topic model and the individual
+               dashboard transforms/charts
+* pages      - full Streamlit reruns of each dashboard and analysis page via
+               streamlit.testing, first with empty caches and then warm
+
+The imports group is independent of the data size and runs once: main.py's
+module-level imports are timed in a fresh interpreter, which is what every
+cold start pays before the first page renders.
+
+Usage:
+    python benchmark.py [--scales 1 10 100] [--repeat 5] [--groups imports loaders transforms pages]
+                        [--save results.json] [--compare baseline.json --tolerance 0.25]
+                        [--import-budget 1.4]
+
+With --compare the script exits non-zero if any benchmark's median is more
+than `tolerance` slower than the baseline, so it can gate a deploy. It also
+exits non-zero when the median import time exceeds --import-budget seconds.
+"""
+import argparse
+import ast
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+from chart_data import shared_data
+from cohorts import PERFORMER_COHORTS, compare_cohorts
+from data_store import read_table
+from exam_topics import ExamTopicModel
+from rules import SCHOOL_CATEGORIES, evaluate_rules
+from student_charts import (
+    INDIVIDUAL_DATA_FILES, STUDENT_CHARTS, engagement_averages, load_individual_tables, prepare_student_engagement
+)
+from student_features import build_outcome_table, build_student_features
+from student_index import StudentPartitions
+
+SOURCE_DIR = os.path.join(REPO_DIR, 'student-data')
+OUTCOMES_FILE = 'data_outcomes_with_tiers.csv'
+JFD_FILE = 'jfd-combined.csv'
+
+# Seconds allowed for main.py's module-level imports in a fresh interpreter
+IMPORT_BUDGET = 1.4
+
+ANALYSIS_PAGES = ["Key Actionable Insights", "Exam Analysis", "Question Bank Analytics", "Attendance Analysis", "Performer Analysis"]
+
+
+def timed(fn, repeat):
+    """Run `fn` `repeat` times and return the wall-clock durations in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def scale_frame(df, factor, id_columns=('student_id',)):
+    """Tile `df` `factor` times, shifting student IDs so every copy is a distinct cohort."""
+    if factor == 1:
+        return df
+    copies = []
+    for k in range(factor):
+        copy = df.copy()
+        for col in id_columns:
+            if col in copy.columns:
+                offset = k * (int(pd.to_numeric(df[col], errors='coerce').max()) + 1)
+                copy[col] = copy[col] + offset
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def write_scaled_dataset(target_dir, factor):
+    """Write every student-data CSV (and the root outcomes CSV) scaled by `factor`."""
+    data_dir = os.path.join(target_dir, 'student-data')
+    os.makedirs(data_dir, exist_ok=True)
+    for filename in INDIVIDUAL_DATA_FILES + [JFD_FILE, OUTCOMES_FILE]:
+        df = pd.read_csv(os.path.join(SOURCE_DIR, filename))
+        scale_frame(df, factor).to_csv(os.path.join(data_dir, filename), index=False)
+    # The Analysis Dashboard reads the outcomes file from the root directory
+    shutil.copy(os.path.join(data_dir, OUTCOMES_FILE), os.path.join(target_dir, OUTCOMES_FILE))
+    return data_dir
+
+
+def clear_columnar_cache(directory):
+    shutil.rmtree(os.path.join(directory, '.columnar-cache'), ignore_errors=True)
+
+
+def loader_benchmarks(target_dir, data_dir, repeat):
+    files = [(f, ['start_date','end_date'] if 'engagement' in f else ['test_date'] if 'test-data' in f else None)
+             for f in INDIVIDUAL_DATA_FILES + [JFD_FILE]]
+    files.append((os.path.join('..', OUTCOMES_FILE), None))
+    results = {}
+    for filename, parse_dates in files:
+        path = os.path.normpath(os.path.join(data_dir, filename))
+        directory = os.path.dirname(path)
+        name = os.path.basename(path)
+
+        def cold():
+            clear_columnar_cache(directory)
+            read_table(path, parse_dates=parse_dates)
+
+        results[f'loaders/{name}/cold'] = timed(cold, repeat)
+        results[f'loaders/{name}/warm'] = timed(lambda: read_table(path, parse_dates=parse_dates), repeat)
+    results['loaders/individual_tables/warm'] = timed(lambda: load_individual_tables(data_dir + os.sep), repeat)
+    return results
+
+
+def transform_benchmarks(target_dir, data_dir, repeat):
+    results = {}
+    csv_df = read_table(os.path.join(target_dir, OUTCOMES_FILE))
+    outcomes = build_outcome_table(csv_df)
+    results['transforms/outcome_table'] = timed(lambda: build_outcome_table(csv_df), repeat)
+    results['transforms/student_features'] = timed(lambda: build_student_features(outcomes, csv_df), repeat)
+    features = build_student_features(outcomes, csv_df)
+    performer_metrics = ['Score_Difference', 'Baseline_Score', 'Actual_MCAT', 'class_accuracy',
+                         'total_completed_passages_discrete_sets']
+    results['transforms/cohort_comparison'] = timed(
+        lambda: compare_cohorts(features, PERFORMER_COHORTS, performer_metrics), repeat)
+
+    jfd_df = read_table(os.path.join(data_dir, JFD_FILE))
+    jfd_df = jfd_df.fillna({'highest_exam_score': 0})
+    results['transforms/school_categories'] = timed(lambda: evaluate_rules(jfd_df, SCHOOL_CATEGORIES), repeat)
+
+    tables = load_individual_tables(data_dir + os.sep)
+    results['transforms/student_partitions'] = timed(lambda: [StudentPartitions(df) for df in tables], repeat)
+
+    partitions = [StudentPartitions(df) for df in tables]
+    engagement_partitions, test_partitions = partitions[0], partitions[1]
+    student_ids = engagement_partitions.student_ids
+    rng = np.random.default_rng(0)
+
+    def select_student():
+        student_id = student_ids[rng.integers(len(student_ids))].item()
+        df = prepare_student_engagement(engagement_partitions.get(student_id))
+        engagement_averages(df)
+        return student_id, df
+
+    def mask_student():
+        # The boolean-mask lookup the partitions replaced, for comparison
+        student_id = student_ids[rng.integers(len(student_ids))].item()
+        return tables[0][tables[0]['student_id'] == student_id]
+
+    results['transforms/individual_select_student'] = timed(select_student, repeat)
+    results['transforms/individual_mask_lookup'] = timed(mask_student, repeat)
+
+    df_sections = tables[2]
+    results['transforms/exam_topic_model'] = timed(lambda: ExamTopicModel(df_sections), repeat)
+    exam_topics = ExamTopicModel(df_sections)
+    section_names = exam_topics.section_names
+
+    def topic_table():
+        student_id = student_ids[rng.integers(len(student_ids))].item()
+        return exam_topics.student_topic_table(student_id, section_names[rng.integers(len(section_names))])
+
+    def topic_mask_lookup():
+        # The two boolean masks the topic model replaced, for comparison
+        student_id = student_ids[rng.integers(len(student_ids))].item()
+        section = section_names[rng.integers(len(section_names))]
+        return df_sections[(df_sections['student_id'] == student_id) & (df_sections['Exam Section'] == section)]
+
+    results['transforms/exam_topic_table'] = timed(topic_table, repeat)
+    results['transforms/exam_topic_mask_lookup'] = timed(topic_mask_lookup, repeat)
+    results['transforms/exam_topic_cohort'] = timed(exam_topics.cohort_topic_accuracy, repeat)
+
+    def build_charts():
+        student_id, df = select_student()
+        df_tests = test_partitions.get(student_id)
+        df_tests = df_tests.assign(test_date=pd.to_datetime(df_tests['test_date']))
+        df = shared_data(df)
+        for _, build_chart, uses_engagement in STUDENT_CHARTS:
+            build_chart(df if uses_engagement else df_tests).to_dict()
+
+    results['transforms/individual_charts'] = timed(build_charts, repeat)
+    return results
+
+
+def module_imports(path):
+    """Source of the module-level import statements in `path`."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return '\n'.join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def import_benchmarks(repeat):
+    """Time main.py's module-level imports, each run in a new interpreter (startup excluded)."""
+    code = '\n'.join([
+        'import time',
+        '_start = time.perf_counter()',
+        module_imports(os.path.join(REPO_DIR, 'main.py')),
+        'print(time.perf_counter() - _start)'
+    ])
+    durations = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', code], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+        durations.append(float(result.stdout.strip().splitlines()[-1]))
+    return {'imports/main.py': durations}
+
+
+def page_benchmarks(target_dir, repeat):
+    import logging
+    from streamlit.testing.v1 import AppTest
+    import streamlit as st
+
+    # Bare-mode warnings from Streamlit would otherwise drown out the results
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    # The navigation radio only exposes two dashboards; the benchmark copy adds
+    # the third option so the Analysis Dashboard pages can be reached.
+    source = open(os.path.join(REPO_DIR, 'main.py'), encoding='utf-8').read().replace(
+        '["Individual Student Dashboard", "Students by School"]',
+        '["Individual Student Dashboard", "Students by School", "Analysis Dashboard"]'
+    )
+    script_path = os.path.join(target_dir, 'benchmark_main.py')
+    with open(script_path, 'w', encoding='utf-8') as f:
+        f.write(source)
+
+    results = {}
+    cwd = os.getcwd()
+    os.chdir(target_dir)
+    try:
+        def clear_caches():
+            st.cache_data.clear()
+            st.cache_resource.clear()
+            clear_columnar_cache(os.path.join(target_dir, 'student-data'))
+            clear_columnar_cache(target_dir)
+
+        def run_page(dashboard, analysis_type=None):
+            at = AppTest.from_file(script_path, default_timeout=600)
+            at.run()
+            if dashboard != "Individual Student Dashboard":
+                at.sidebar.radio[0].set_value(dashboard).run()
+            if analysis_type is not None:
+                [r for r in at.sidebar.radio if r.label == 'Choose Analysis Type:'][0].set_value(analysis_type).run()
+            if at.exception:
+                raise RuntimeError(f"{dashboard} / {analysis_type}: {at.exception[0].value}")
+            return at
+
+        pages = [("Individual Student Dashboard", None), ("Students by School", None)]
+        pages += [("Analysis Dashboard", page) for page in ANALYSIS_PAGES]
+        for dashboard, analysis_type in pages:
+            name = f'pages/{analysis_type or dashboard}'
+
+            def cold():
+                clear_caches()
+                run_page(dashboard, analysis_type)
+
+            results[f'{name}/cold'] = timed(cold, max(1, repeat // 2))
+            at = run_page(dashboard, analysis_type)
+            results[f'{name}/warm'] = timed(lambda: at.run(), repeat)
+
+        # Picking another student is the individual dashboard's hot path
+        at = run_page("Individual Student Dashboard")
+        options = at.selectbox[0].options
+        rng = np.random.default_rng(0)
+        results['pages/Individual Student Dashboard/select_student'] = timed(
+            lambda: at.selectbox[0].set_value(options[rng.integers(len(options))]).run(), repeat
+        )
+    finally:
+        os.chdir(cwd)
+    return results
+
+
+def summarize(results):
+    return {
+        name: {'median': statistics.median(durations), 'min': min(durations), 'runs': len(durations)}
+        for name, durations in results.items()
+    }
+
+
+def print_table(summary_by_scale):
+    names = sorted({name for summary in summary_by_scale.values() for name in summary})
+    scales = list(summary_by_scale)
+    header = f"{'benchmark':<60}" + ''.join(f"{f'{s}x median (ms)':>20}" for s in scales)
+    print(header)
+    print('-' * len(header))
+    for name in names:
+        row = f"{name:<60}"
+        for scale in scales:
+            entry = summary_by_scale[scale].get(name)
+            row += f"{entry['median'] * 1000:>20.1f}" if entry else f"{'-':>20}"
+        print(row)
+
+
+def compare(summary_by_scale, baseline_path, tolerance):
+    """Print benchmarks slower than the baseline by more than `tolerance`; return their count."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = 0
+    for scale, summary in summary_by_scale.items():
+        for name, entry in summary.items():
+            previous = baseline.get(str(scale), {}).get(name)
+            if previous is None:
+                continue
+            ratio = entry['median'] / previous['median'] if previous['median'] > 0 else 1
+            if ratio > 1 + tolerance:
+                regressions += 1
+                print(f"REGRESSION {scale}x {name}: {previous['median'] * 1000:.1f} ms -> {entry['median'] * 1000:.1f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the dashboard loaders, transforms and pages.')
+    parser.add_argument('--scales', nargs='+', type=int, default=[1, 10, 100],
+                        help='Data size multipliers (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Runs per benchmark (default: %(default)s)')
+    parser.add_argument('--groups', nargs='+', choices=['imports', 'loaders', 'transforms', 'pages'],
+                        default=['imports', 'loaders', 'transforms', 'pages'],
+                        help='Benchmark groups to run (default: all)')
+    parser.add_argument('--save', help='Write the results as JSON to this path')
+    parser.add_argument('--compare', help='Baseline JSON from an earlier --save run')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown vs. the baseline before failing (default: %(default)s)')
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET,
+                        help='Maximum median seconds for main.py imports (default: %(default)s)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    summary_by_scale = {}
+    import_results = {}
+    if 'imports' in args.groups:
+        print("Timing main.py imports...", file=sys.stderr)
+        import_results = import_benchmarks(args.repeat)
+    for scale in args.scales:
+        print(f"Running benchmarks at {scale}x...", file=sys.stderr)
+        with tempfile.TemporaryDirectory(prefix=f'dashboard-bench-{scale}x-') as target_dir:
+            data_dir = write_scaled_dataset(target_dir, scale)
+            # Import timings do not depend on the data size; report them once
+            results = dict(import_results) if scale == args.scales[0] else {}
+            if 'loaders' in args.groups:
+                results.update(loader_benchmarks(target_dir, data_dir, args.repeat))
+            if 'transforms' in args.groups:
+                results.update(transform_benchmarks(target_dir, data_dir, args.repeat))
+            if 'pages' in args.groups:
+                results.update(page_benchmarks(target_dir, args.repeat))
+        summary_by_scale[scale] = summarize(results)
+
+    print_table(summary_by_scale)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({str(scale): summary for scale, summary in summary_by_scale.items()}, f, indent=2)
+
+    failed = False
+    if import_results:
+        import_time = statistics.median(import_results['imports/main.py'])
+        if import_time > args.import_budget:
+            print(f"IMPORT BUDGET EXCEEDED: main.py imports took {import_time:.2f}s (budget {args.import_budget:.2f}s)")
+            failed = True
+
+    if args.compare:
+        if compare(summary_by_scale, args.compare, args.tolerance):
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
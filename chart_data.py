@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Chart data for the Individual Student Dashboard's Altair charts.
+
+Altair embeds a chart's DataFrame in its Vega-Lite spec, so every weekly
+chart used to carry all of a student's engagement columns. Each chart now
+gets only the fields it encodes (CHART_FIELDS), and series longer than
+LTTB_THRESHOLD points are downsampled with Largest-Triangle-Three-Buckets,
+which keeps the peaks and dips that plain striding would drop.
+
+Documents holding several charts (the HTML export) go one step further:
+shared_data builds one projected copy of the rows, stored once under
+ENGAGEMENT_DATASET, and every engagement chart references it by name
+(alt.NamedData) instead of embedding its own.
+"""
+import numpy as np
+import pandas as pd
+
+ENGAGEMENT_DATASET = 'student_engagement'
+
+# Longest series drawn point for point; longer ones are downsampled
+LTTB_THRESHOLD = 52
+
+# Chart -> (x and tooltip fields, value fields). The first key field is the x axis.
+ENGAGEMENT_KEYS = ['week', 'date_range']
+CHART_FIELDS = {
+    'exam_scores': (['test_date'], ['actual_exam_score']),
+    'lessons': (ENGAGEMENT_KEYS, ['completed_lessons']),
+    'question_sets': (ENGAGEMENT_KEYS, ['total_completed_passages_discrete_sets']),
+    'participation': (ENGAGEMENT_KEYS, ['class_participation', 'homework_participation']),
+    'accuracy': (ENGAGEMENT_KEYS, ['sciences_accuracy', 'cars_accuracy', 'class_accuracy']),
+    'attendance': (ENGAGEMENT_KEYS, ['large_session', 'small_session'])
+}
+ENGAGEMENT_CHARTS = ['lessons', 'question_sets', 'participation', 'accuracy', 'attendance']
+
+
+def lttb(x, y, threshold):
+    """Positions of the `threshold` points that Largest-Triangle-Three-Buckets keeps.
+
+    The first and last points are always kept; the rest are split into
+    threshold - 2 buckets and each bucket keeps the point forming the largest
+    triangle with the previous kept point and the mean of the next bucket.
+    Missing values are never picked over a present one.
+    """
+    n = len(y)
+    if threshold < 3 or n <= threshold:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x, next_y = x[hi:edges[i + 2]], y[hi:edges[i + 2]]
+        else:
+            next_x, next_y = x[n - 1:], y[n - 1:]
+        present = ~np.isnan(next_y)
+        avg_x = next_x.mean()
+        avg_y = next_y[present].mean() if present.any() else np.nan
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        keep[i + 1] = a
+    return keep
+
+
+def _x_values(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(np.float64)
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.arange(len(series), dtype=np.float64)
+
+
+def downsample(df, x_field, value_fields, threshold=LTTB_THRESHOLD):
+    """Rows of `df` kept by LTTB on any of `value_fields`, or `df` when it is short enough."""
+    if threshold is None or len(df) <= threshold:
+        return df
+    df = df.sort_values(x_field, kind='stable')
+    x = _x_values(df[x_field])
+    keep = np.unique(np.concatenate([
+        lttb(x, df[field].to_numpy(dtype=np.float64, na_value=np.nan), threshold)
+        for field in value_fields
+    ]))
+    return df.iloc[keep]
+
+
+def chart_data(df, chart, threshold=LTTB_THRESHOLD):
+    """The rows and columns `chart` encodes; named datasets (alt.NamedData) pass through unchanged."""
+    if not isinstance(df, pd.DataFrame):
+        return df
+    keys, values = CHART_FIELDS[chart]
+    columns = [col for col in keys + values if col in df.columns]
+    return downsample(df[columns], keys[0], [col for col in values if col in df.columns], threshold)
+
+
+def shared_data(df, charts=None, threshold=LTTB_THRESHOLD):
+    """One frame with the fields of all `charts` (default: the engagement charts), for a single named dataset.
+
+    Downsampling keeps the union of each chart's LTTB points, so every chart
+    still shows at least the points it would have kept on its own.
+    """
+    charts = charts or ENGAGEMENT_CHARTS
+    keys, values = [], []
+    for chart in charts:
+        chart_keys, chart_values = CHART_FIELDS[chart]
+        keys += [col for col in chart_keys if col not in keys and col in df.columns]
+        values += [col for col in chart_values if col not in values and col in df.columns]
+    df = df.sort_values(keys[0], kind='stable').reset_index(drop=True)[keys + values]
+    if threshold is None or len(df) <= threshold:
+        return df
+    keep = np.unique(np.concatenate([chart_data(df, chart, threshold).index.to_numpy() for chart in charts]))
+    return df.iloc[keep]
+
+
+def dataset_json(df):
+    """`df` as a Vega-Lite inline dataset (JSON array of records)."""
+    return df.to_json(orient='records', date_format='iso', double_precision=6)
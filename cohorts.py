@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Compare any number of student cohorts on any set of metrics in one pass.
+
+A cohort is a named rule in the rules.py format: a list of conditions that
+must all hold, with rules.any_of for alternatives. Cohorts may overlap. All
+cohorts are evaluated together (shared conditions once), and every statistic
+is computed for all cohorts and metrics at once from the cohort x row
+membership matrix:
+
+* size, and n, mean, median and standard deviation per cohort and metric
+* against the reference cohort (the first one by default): difference in
+  means and medians, Cohen's d, a two-sample t-test (Student's, as
+  scipy.stats.ttest_ind, or Welch's) and Mann-Whitney U
+
+A metric is a column name, or a (label, conditions) pair whose value is 1
+where the rule holds and 0 elsewhere, so its mean is the share of the
+cohort matching it. Specs are plain dicts of lists; freeze_cohorts turns one into a hashable
+key so the dashboard can cache results per cohort definition.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from rules import any_of, evaluate_rules, rule_mask, rule_matrix
+
+# Key Actionable Insights outcome: improvement of more than 5 points
+IMPROVEMENT_COHORTS = {
+    'Improvement (>5 pts)': [('Score_Difference', '>', 5)],
+    'Lower, No, or Negative Score Change (≤5 pts)': [('Score_Difference', '<=', 5)]
+}
+
+# Performer Analysis groups
+PERFORMER_COHORTS = {
+    'High Performers': [any_of([('Score_Difference', '>', 12)], [('Actual_MCAT', '>', 505)])],
+    'Low Performers': [any_of([('Score_Difference', '<=', 0)], [('Actual_MCAT', '<', 502)])]
+}
+
+COMPARISON_COLUMNS = [
+    'cohort', 'metric', 'size', 'n', 'mean', 'median', 'std',
+    'difference', 'median_difference', 'effect_size', 'statistic', 'p_value', 'mannwhitney_p'
+]
+
+
+def improvement_cohorts(high, low):
+    """Question Bank Analytics groups: more than `high` vs fewer than `low` points of improvement."""
+    return {
+        f'High Improvement (>{high:g} pts)': [('Score_Difference', '>', high)],
+        f'Low Improvement (<{low:g} pts)': [('Score_Difference', '<', low)]
+    }
+
+
+def _freeze_rule(conditions):
+    return tuple(tuple(condition) for condition in conditions)
+
+
+def freeze_cohorts(cohorts):
+    """A hashable (name, conditions) tuple for a cohort spec; dict() turns it back."""
+    return tuple((name, _freeze_rule(conditions)) for name, conditions in cohorts.items())
+
+
+def freeze_metrics(metrics):
+    """A hashable tuple of metrics, for caching alongside freeze_cohorts."""
+    return tuple(metric if isinstance(metric, str) else (metric[0], _freeze_rule(metric[1])) for metric in metrics)
+
+
+def cohort_membership(df, cohorts):
+    """Boolean DataFrame with one column per cohort, True where the row is a member."""
+    return rule_matrix(evaluate_rules(df, cohorts), cohorts)
+
+
+def cohort_rows(df, cohorts, columns, label='Cohort'):
+    """Member rows of every cohort stacked in long format, with the cohort name in `label`.
+
+    A row in several cohorts appears once per cohort.
+    """
+    membership = cohort_membership(df, cohorts).to_numpy()
+    cohort_index, row_index = np.nonzero(membership.T)
+    rows = df[columns].iloc[row_index].reset_index(drop=True)
+    rows.insert(0, label, pd.Categorical.from_codes(cohort_index, categories=list(cohorts)))
+    return rows
+
+
+def _metric_values(df, metrics):
+    """Float matrix with one column per metric (column name or (label, conditions))."""
+    condition_masks = {}
+    columns = []
+    for metric in metrics:
+        if isinstance(metric, str):
+            columns.append(pd.to_numeric(df[metric], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan))
+        else:
+            columns.append(rule_mask(df, metric[1], condition_masks).astype(np.float64))
+    return np.column_stack(columns) if columns else np.empty((len(df), 0))
+
+
+def metric_labels(metrics):
+    """Display names of `metrics`: the column name or the rule's label."""
+    return [metric if isinstance(metric, str) else metric[0] for metric in metrics]
+
+
+def _cohort_stats(values, membership):
+    """Counts, means and variances per cohort x metric from matrix products."""
+    present = ~np.isnan(values)
+    # Centre each metric first so the sum of squares keeps its precision on MCAT-scale scores
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        shift = np.nan_to_num(np.nanmean(values, axis=0))
+    filled = np.where(present, values - shift, 0.0)
+    member = membership.astype(np.float64)
+    n = member.T @ present.astype(np.float64)
+    sums = member.T @ filled
+    squares = member.T @ (filled * filled)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = sums / n
+        var = (squares - n * mean * mean) / (n - 1)
+    return n, mean + shift, np.clip(var, 0.0, None)
+
+
+def compare_cohorts(df, cohorts, metrics, reference=None, equal_var=True):
+    """Statistics for every cohort and metric, compared with the `reference` cohort.
+
+    Returns one row per (cohort, metric) in COMPARISON_COLUMNS order; the
+    comparison columns are NaN on the reference cohort's own rows and where
+    a group has too few values for the statistic.
+    """
+    # scipy.stats is slow to import; keep it off the dashboard's cold start
+    from scipy import stats
+
+    names = list(cohorts)
+    reference = names[0] if reference is None else reference
+    ref = names.index(reference)
+    membership = cohort_membership(df, cohorts).to_numpy()
+    values = _metric_values(df, metrics)
+
+    n, mean, var = _cohort_stats(values, membership)
+    # Cohort x row x metric, NaN outside the cohort
+    stacked = np.where(membership.T[:, :, None], values[None, :, :], np.nan)
+    with warnings.catch_warnings():
+        # All-NaN slices (a cohort with no values of a metric) stay NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        median = np.nanmedian(stacked, axis=1)
+
+    n_ref, mean_ref, var_ref = n[ref], mean[ref], var[ref]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pooled = ((n - 1) * var + (n_ref - 1) * var_ref) / (n + n_ref - 2)
+        effect_size = (mean - mean_ref) / np.sqrt(pooled)
+        if equal_var:
+            statistic = (mean - mean_ref) / np.sqrt(pooled * (1 / n + 1 / n_ref))
+            dof = n + n_ref - 2
+        else:
+            se = var / n + var_ref / n_ref
+            statistic = (mean - mean_ref) / np.sqrt(se)
+            dof = se ** 2 / ((var / n) ** 2 / (n - 1) + (var_ref / n_ref) ** 2 / (n_ref - 1))
+    p_value = 2 * stats.t.sf(np.abs(statistic), dof)
+
+    mannwhitney = np.full(mean.shape, np.nan)
+    for k in range(len(names)):
+        if k == ref:
+            continue
+        testable = (n[k] > 0) & (n_ref > 0)
+        if testable.any():
+            mannwhitney[k, testable] = stats.mannwhitneyu(
+                stacked[k][:, testable], stacked[ref][:, testable], axis=0, nan_policy='omit', method='asymptotic'
+            ).pvalue
+
+    comparison = {
+        'difference': mean - mean_ref,
+        'median_difference': median - median[ref],
+        'effect_size': effect_size,
+        'statistic': statistic,
+        'p_value': p_value,
+        'mannwhitney_p': mannwhitney
+    }
+    for column in comparison.values():
+        column[ref] = np.nan
+
+    k, m = mean.shape
+    result = pd.DataFrame({
+        'cohort': np.repeat(names, m),
+        'metric': np.tile(metric_labels(metrics), k),
+        'size': np.repeat(membership.sum(axis=0), m),
+        'n': n.ravel().astype(np.int64),
+        'mean': mean.ravel(),
+        'median': median.ravel(),
+        'std': np.sqrt(var).ravel(),
+        **{name: column.ravel() for name, column in comparison.items()}
+    })
+    return result[COMPARISON_COLUMNS]
+
+
+def cohort_table(comparison, value='mean'):
+    """One column of a compare_cohorts result as a cohort x metric table, in cohort order."""
+    table = comparison.pivot(index='cohort', columns='metric', values=value)
+    return table.reindex(index=pd.unique(comparison['cohort']), columns=pd.unique(comparison['metric']))
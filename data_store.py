@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""Columnar cache for the dashboard's CSV files.
+
+Each CSV is parsed once and written to Parquet in a `.columnar-cache/`
+directory next to it, together with a small JSON manifest holding the
+source file's size, mtime and content hash. Later reads are served from the
+Parquet copy (memory-mapped) until the source CSV changes. Files with a
+schema in schemas.py are cast to compact dtypes before the copy is written.
+
+Rows can also be appended with `append_rows`: they are added to the CSV and
+written as an extra Parquet part next to the cached copy, so an append costs
+the size of the new rows rather than a re-parse of the whole file.
+"""
+import glob
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from schemas import apply_schema, schema_for
+
+# Directories searched for data files, in order (local development first,
+# root directory as the deployment fallback)
+DATA_DIRS = [
+    'student-data/',
+    './student-data/',
+    'student_data/',
+    './student_data/',
+    ''
+]
+
+CACHE_DIR_NAME = '.columnar-cache'
+MANIFEST_VERSION = 3
+
+
+def find_data_file(filename, search_dirs=None):
+    """Return the first existing path for `filename`, or None."""
+    for base_path in search_dirs if search_dirs is not None else DATA_DIRS:
+        file_path = os.path.join(base_path, filename)
+        if os.path.exists(file_path):
+            return file_path
+    return None
+
+
+def find_data_dir(filenames, search_dirs=None):
+    """Return the first directory that contains every file in `filenames`, or None."""
+    for base_path in search_dirs if search_dirs is not None else DATA_DIRS:
+        if all(os.path.exists(os.path.join(base_path, f)) for f in filenames):
+            return base_path
+    return None
+
+
+def file_version(path):
+    """Cheap version key for a file: (path, size, mtime_ns)."""
+    stat = os.stat(path)
+    return (path, stat.st_size, stat.st_mtime_ns)
+
+
+def dataset_version(paths):
+    """Version key for a group of files, suitable as a Streamlit cache argument."""
+    return tuple(file_version(p) for p in paths if p is not None and os.path.exists(p))
+
+
+def content_hash(path, chunk_size=1 << 20):
+    """BLAKE2 hash of the file contents."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_paths(path):
+    cache_dir = os.path.join(os.path.dirname(path) or '.', CACHE_DIR_NAME)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return cache_dir, os.path.join(cache_dir, f'{stem}.parquet'), os.path.join(cache_dir, f'{stem}.json')
+
+
+def _parts_dir(parquet_path):
+    return os.path.splitext(parquet_path)[0] + '.parts'
+
+
+def _read_options(path, parse_dates, read_csv_kwargs):
+    return {
+        'parse_dates': sorted(parse_dates or []),
+        'read_csv_kwargs': {k: repr(v) for k, v in sorted(read_csv_kwargs.items())},
+        'schema': dict(sorted((schema_for(path) or {}).items()))
+    }
+
+
+def _read_manifest(manifest_path):
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, payload):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def read_parquet(parquet_path, columns=None):
+    """Read a cached Parquet file, memory-mapping it where supported."""
+    return pd.read_parquet(parquet_path, columns=columns, memory_map=True)
+
+
+def _read_cached(path, parquet_path, manifest, columns=None):
+    df = read_parquet(parquet_path, columns)
+    parts = manifest.get('parts') or []
+    if parts:
+        parts_dir = _parts_dir(parquet_path)
+        df = pd.concat([df] + [read_parquet(os.path.join(parts_dir, part), columns) for part in parts], ignore_index=True)
+    # Re-applied on read: categoricals with different categories per part
+    # concatenate to object, and all-null categoricals come back untyped
+    return apply_schema(df, schema_for(path) or {})
+
+
+def read_table(path, parse_dates=None, columns=None, **read_csv_kwargs):
+    """Read a CSV through the columnar cache.
+
+    The Parquet copy is reused while the CSV's size and mtime are unchanged.
+    If only the mtime moved (e.g. the file was re-copied), the content hash
+    decides whether the cached copy is still valid. Any failure to write the
+    cache (read-only filesystem, columns Arrow can't type) falls back to the
+    parsed CSV. With `columns`, only those columns are read from the cache.
+    """
+    cache_dir, parquet_path, manifest_path = _cache_paths(path)
+    options = _read_options(path, parse_dates, read_csv_kwargs)
+    stat = os.stat(path)
+    manifest = _read_manifest(manifest_path)
+
+    if (manifest is not None and manifest.get('version') == MANIFEST_VERSION
+            and manifest.get('options') == options and os.path.exists(parquet_path)
+            and manifest.get('size') == stat.st_size):
+        if manifest.get('mtime_ns') == stat.st_mtime_ns:
+            return _read_cached(path, parquet_path, manifest, columns)
+
+        sha = content_hash(path)
+        if manifest.get('sha') == sha:
+            # Touched but unchanged: remember the new mtime so we skip hashing next time
+            manifest['mtime_ns'] = stat.st_mtime_ns
+            try:
+                _write_json(manifest_path, manifest)
+            except OSError:
+                pass
+            return _read_cached(path, parquet_path, manifest, columns)
+
+    df = apply_schema(pd.read_csv(path, parse_dates=parse_dates, **read_csv_kwargs), schema_for(path) or {})
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f'{parquet_path}.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+        # The fresh copy already contains any previously appended rows
+        for stale_part in glob.glob(os.path.join(_parts_dir(parquet_path), '*.parquet')):
+            os.remove(stale_part)
+        _write_json(manifest_path, {
+            'version': MANIFEST_VERSION,
+            'source': os.path.basename(path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha': content_hash(path),
+            'options': options
+        })
+    except Exception:
+        # Cache is an optimization only - serve the parsed CSV
+        pass
+
+    return df[columns] if columns is not None else df
+
+
+def columnar_files(path, parse_dates=None, **read_csv_kwargs):
+    """Parquet files (base copy plus appended parts) holding the current contents of `path`.
+
+    Lets engines that read Parquet themselves skip pandas. The cache is built
+    first if it is missing or stale; returns None if it cannot be written.
+    """
+    cache_dir, parquet_path, manifest_path = _cache_paths(path)
+    options = _read_options(path, parse_dates, read_csv_kwargs)
+
+    def current(manifest):
+        stat = os.stat(path)
+        return (manifest is not None and manifest.get('version') == MANIFEST_VERSION
+                and manifest.get('options') == options and os.path.exists(parquet_path)
+                and manifest.get('size') == stat.st_size and manifest.get('mtime_ns') == stat.st_mtime_ns)
+
+    manifest = _read_manifest(manifest_path)
+    if not current(manifest):
+        read_table(path, parse_dates=parse_dates, **read_csv_kwargs)
+        manifest = _read_manifest(manifest_path)
+        if not current(manifest):
+            return None
+    parts_dir = _parts_dir(parquet_path)
+    return [parquet_path] + [os.path.join(parts_dir, part) for part in manifest.get('parts') or []]
+
+
+def append_rows(path, rows, csv_text, parse_dates=None, **read_csv_kwargs):
+    """Append already-validated rows to a CSV and to its columnar cache.
+
+    `rows` is the parsed frame (written as a new Parquet part) and `csv_text`
+    the same rows as CSV lines without a header (appended to the source file).
+    The cache is brought up to date first, so the manifest only ever describes
+    a CSV whose full contents are covered by the base copy plus its parts.
+    Returns the updated manifest.
+    """
+    read_table(path, parse_dates=parse_dates, **read_csv_kwargs)
+    cache_dir, parquet_path, manifest_path = _cache_paths(path)
+    manifest = _read_manifest(manifest_path)
+    if manifest is None or manifest.get('options') != _read_options(path, parse_dates, read_csv_kwargs):
+        raise RuntimeError(f"No columnar cache for {path}; cannot append incrementally")
+
+    parts_dir = _parts_dir(parquet_path)
+    os.makedirs(parts_dir, exist_ok=True)
+    part_name = f'part-{len(manifest.get("parts") or []):05d}.parquet'
+    tmp_path = os.path.join(parts_dir, f'{part_name}.tmp')
+    apply_schema(rows, schema_for(path) or {}).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, os.path.join(parts_dir, part_name))
+
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b'\n'
+        else:
+            needs_newline = False
+        f.write((('\n' if needs_newline else '') + csv_text).encode('utf-8'))
+
+    stat = os.stat(path)
+    manifest['parts'] = (manifest.get('parts') or []) + [part_name]
+    manifest['size'] = stat.st_size
+    manifest['mtime_ns'] = stat.st_mtime_ns
+    # Re-hashing the whole file would make appends O(history); a later
+    # touch-without-change just costs one full re-parse instead
+    manifest['sha'] = None
+    _write_json(manifest_path, manifest)
+    return manifest
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""Incremental weekly ingestion of engagement data.
+
+A new week's CSV is validated, appended to institution-1-engagement-data.csv
+and its columnar cache (as a new Parquet part, see data_store.append_rows),
+and folded into per-student running totals: sums and non-null counts for the
+averaged metrics, sums for completed work and cumulative attendance. The
+totals live next to the columnar cache and are only rebuilt from the full
+history when they no longer match the CSV, so a weekly refresh costs the size
+of one week rather than the whole program.
+
+Usage:
+    python engagement_ingest.py week-41.csv [--store student-data/institution-1-engagement-data.csv]
+"""
+import argparse
+import io
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from data_store import CACHE_DIR_NAME, append_rows, find_data_file, read_table
+
+ENGAGEMENT_FILE = 'institution-1-engagement-data.csv'
+PARSE_DATES = ['start_date', 'end_date']
+
+ENGAGEMENT_COLUMNS = [
+    'week', 'start_date', 'end_date', 'student_id', 'cars_accuracy', 'sciences_accuracy', 'class_accuracy',
+    'completed_lessons', 'total_completed_passages_discrete_sets', 'score_trends_on_completed_dailies',
+    'num_attended_large_session', 'num_scheduled_large_session', 'num_attended_small_session',
+    'num_scheduled_small_session', 'class_participation', 'homework_participation'
+]
+
+# Metrics averaged over a student's weeks (running sum and non-null count are kept)
+MEAN_COLUMNS = [
+    'cars_accuracy', 'sciences_accuracy', 'class_accuracy', 'score_trends_on_completed_dailies',
+    'class_participation', 'homework_participation'
+]
+# Metrics totalled over a student's weeks
+SUM_COLUMNS = [
+    'completed_lessons', 'total_completed_passages_discrete_sets',
+    'num_attended_large_session', 'num_scheduled_large_session',
+    'num_attended_small_session', 'num_scheduled_small_session'
+]
+# Columns that must lie in [0, 1]
+RATE_COLUMNS = ['cars_accuracy', 'sciences_accuracy', 'class_accuracy', 'class_participation', 'homework_participation']
+
+
+def validate_week(new_rows, ingested_weeks=()):
+    """Check a new week's rows before they are appended; raises ValueError listing every problem."""
+    problems = []
+    missing = [c for c in ENGAGEMENT_COLUMNS if c not in new_rows.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    if new_rows.empty:
+        raise ValueError("The file has no rows")
+
+    numeric = new_rows[ENGAGEMENT_COLUMNS].drop(columns=PARSE_DATES).apply(pd.to_numeric, errors='coerce')
+    for col in numeric.columns:
+        bad = numeric[col].isna() & new_rows[col].notna()
+        if bad.any():
+            problems.append(f"{col}: {int(bad.sum())} non-numeric values")
+    for col in ['week', 'student_id']:
+        if numeric[col].isna().any():
+            problems.append(f"{col}: {int(numeric[col].isna().sum())} missing values")
+
+    dates = new_rows[PARSE_DATES].apply(pd.to_datetime, errors='coerce', format='mixed')
+    for col in PARSE_DATES:
+        if dates[col].isna().any():
+            problems.append(f"{col}: {int(dates[col].isna().sum())} missing or unparseable dates")
+    if (dates['end_date'] < dates['start_date']).any():
+        problems.append("end_date is before start_date on some rows")
+
+    duplicated = new_rows.duplicated(['student_id', 'week'])
+    if duplicated.any():
+        problems.append(f"{int(duplicated.sum())} duplicate (student_id, week) rows")
+    already = sorted(set(numeric['week'].dropna().astype(int)) & set(ingested_weeks))
+    if already:
+        problems.append(f"week(s) {', '.join(map(str, already))} already ingested")
+
+    for col in RATE_COLUMNS:
+        out_of_range = (numeric[col] < 0) | (numeric[col] > 1)
+        if out_of_range.any():
+            problems.append(f"{col}: {int(out_of_range.sum())} values outside 0-1")
+    for kind in ['large', 'small']:
+        over = numeric[f'num_attended_{kind}_session'] > numeric[f'num_scheduled_{kind}_session']
+        if over.any():
+            problems.append(f"num_attended_{kind}_session exceeds scheduled on {int(over.sum())} rows")
+    negative = (numeric[SUM_COLUMNS] < 0).any(axis=1)
+    if negative.any():
+        problems.append(f"{int(negative.sum())} rows with negative counts")
+
+    if problems:
+        raise ValueError("Invalid engagement week:\n- " + "\n- ".join(problems))
+
+
+def running_totals(df):
+    """Per-student running totals for a block of weekly rows."""
+    grouped = df.groupby('student_id')
+    totals = pd.DataFrame({'weeks': grouped.size(), 'last_week': grouped['week'].max()})
+    for col in MEAN_COLUMNS:
+        totals[f'{col}_sum'] = grouped[col].sum()
+        totals[f'{col}_count'] = grouped[col].count()
+    for col in SUM_COLUMNS:
+        totals[f'{col}_sum'] = grouped[col].sum()
+    return totals
+
+
+def merge_totals(totals, delta):
+    """Add the running totals of new rows to existing totals."""
+    combined = totals.add(delta, fill_value=0)
+    combined['last_week'] = pd.concat([totals['last_week'], delta['last_week']], axis=1).max(axis=1)
+    return combined
+
+
+def totals_profile(totals):
+    """Per-student means, totals and cumulative attendance rates from running totals."""
+    profile = pd.DataFrame(index=totals.index)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for col in MEAN_COLUMNS:
+            profile[col] = totals[f'{col}_sum'] / totals[f'{col}_count'].replace(0, np.nan)
+        profile['completed_lessons'] = totals['completed_lessons_sum']
+        profile['completed_sets'] = totals['total_completed_passages_discrete_sets_sum']
+        profile['large_attendance_rate'] = totals['num_attended_large_session_sum'] / totals['num_scheduled_large_session_sum'].replace(0, np.nan)
+        profile['small_attendance_rate'] = totals['num_attended_small_session_sum'] / totals['num_scheduled_small_session_sum'].replace(0, np.nan)
+    return profile
+
+
+def _totals_paths(path):
+    cache_dir = os.path.join(os.path.dirname(path) or '.', CACHE_DIR_NAME)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f'{stem}.totals.parquet'), os.path.join(cache_dir, f'{stem}.totals.json')
+
+
+def _save_totals(path, totals, weeks):
+    totals_path, meta_path = _totals_paths(path)
+    os.makedirs(os.path.dirname(totals_path), exist_ok=True)
+    totals.to_parquet(f'{totals_path}.tmp')
+    os.replace(f'{totals_path}.tmp', totals_path)
+    stat = os.stat(path)
+    with open(f'{meta_path}.tmp', 'w') as f:
+        json.dump({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'weeks': sorted(weeks)}, f)
+    os.replace(f'{meta_path}.tmp', meta_path)
+
+
+def load_running_totals(path):
+    """Running totals for the engagement CSV at `path`, and the set of weeks they cover.
+
+    Served from the stored totals while they match the CSV; otherwise rebuilt
+    from the full history once and stored again.
+    """
+    totals_path, meta_path = _totals_paths(path)
+    stat = os.stat(path)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta['size'] == stat.st_size and meta['mtime_ns'] == stat.st_mtime_ns:
+            return pd.read_parquet(totals_path), set(meta['weeks'])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    df = read_table(path, parse_dates=PARSE_DATES)
+    totals = running_totals(df)
+    weeks = set(df['week'].dropna().astype(int))
+    try:
+        _save_totals(path, totals, weeks)
+    except OSError:
+        pass
+    return totals, weeks
+
+
+def ingest_week(path, new_week_path):
+    """Validate `new_week_path` and append it to the engagement store at `path`; returns the new totals."""
+    raw = pd.read_csv(new_week_path, dtype=str, keep_default_na=False)
+    missing = [c for c in ENGAGEMENT_COLUMNS if c not in raw.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    raw = raw[ENGAGEMENT_COLUMNS]
+    new_rows = raw.replace('', np.nan)
+
+    totals, weeks = load_running_totals(path)
+    validate_week(new_rows, weeks)
+
+    rows = new_rows.copy()
+    numeric_columns = [c for c in ENGAGEMENT_COLUMNS if c not in PARSE_DATES]
+    rows[numeric_columns] = rows[numeric_columns].apply(pd.to_numeric)
+    for col in PARSE_DATES:
+        rows[col] = pd.to_datetime(rows[col], format='mixed')
+
+    # Keep the source text as-is so the CSV stays byte-compatible with a full export
+    buffer = io.StringIO()
+    raw.to_csv(buffer, index=False, header=False, lineterminator='\n')
+    append_rows(path, rows, buffer.getvalue(), parse_dates=PARSE_DATES)
+
+    totals = merge_totals(totals, running_totals(rows))
+    weeks = weeks | set(rows['week'].astype(int))
+    try:
+        _save_totals(path, totals, weeks)
+    except OSError:
+        pass
+    return totals
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Append a week of engagement data to the columnar store.')
+    parser.add_argument('new_week', help='CSV with the new week(s) of engagement rows')
+    parser.add_argument('--store', default=None,
+                        help=f'Engagement CSV to append to (default: {ENGAGEMENT_FILE} in the data directory)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = args.store or find_data_file(ENGAGEMENT_FILE)
+    if store is None:
+        sys.exit(f"Could not find {ENGAGEMENT_FILE}")
+    try:
+        totals = ingest_week(store, args.new_week)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(f"Appended {args.new_week} to {store}; running totals cover {len(totals)} students "
+          f"through week {int(totals['last_week'].max())}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Dictionary-encoded model of the JW exam topic accuracy data.
+
+institution-1-2025-exam-data-jw-exams.csv has one row per student, exam,
+section and topic, repeating the long exam/section/topic strings on every
+row. Here each of those becomes an integer code into a small lookup array,
+and student accuracy is stored as a dense float32 array indexed
+[student, exam, topic]. Question frequency and site accuracy only depend on
+the exam and topic, so they are stored once per (exam, topic).
+
+Per-student, per-section and cohort-wide topic queries are then array
+slices instead of boolean masks over the full table.
+"""
+import numpy as np
+import pandas as pd
+
+TOPIC_TABLE_COLUMNS = ['Exam Name', 'Question Topic', 'Question Frequency', 'Student Accuracy']
+
+
+class ExamTopicModel:
+    """Student x exam x topic accuracy array with integer-coded exams, sections and topics."""
+
+    def __init__(self, df):
+        df = df.dropna(subset=['student_id'])
+
+        self.student_ids, student_rows = np.unique(df['student_id'].to_numpy(), return_inverse=True)
+        self._student_rows = {student_id: row for row, student_id in enumerate(self.student_ids.tolist())}
+
+        # Exams sort by name (the order the dashboard lists them in); sections
+        # and topics keep their order of first appearance
+        exam_codes, exam_names = pd.factorize(df['Exam Name'], sort=True)
+        section_codes, section_names = pd.factorize(df['Exam Section'])
+        # A topic name can appear under more than one section, so topics are keyed by (section, topic)
+        topic_codes, topic_keys = pd.factorize(pd.MultiIndex.from_arrays([section_codes, df['Question Topic']]))
+        self.exam_names = np.asarray(exam_names, dtype=object)
+        self.section_names = np.asarray(section_names, dtype=object)
+        self.topic_names = np.asarray(topic_keys.get_level_values(1), dtype=object)
+        self.topic_sections = np.asarray(topic_keys.get_level_values(0), dtype=np.int32)
+
+        shape = (len(self.student_ids), len(self.exam_names), len(self.topic_names))
+        self.accuracy = np.full(shape, np.nan, dtype=np.float32)
+        self.present = np.zeros(shape, dtype=bool)
+        self.accuracy[student_rows, exam_codes, topic_codes] = df['Student Accuracy'].to_numpy(dtype=np.float32)
+        self.present[student_rows, exam_codes, topic_codes] = True
+
+        self.frequency = np.zeros(shape[1:], dtype=np.int32)
+        self.frequency[exam_codes, topic_codes] = df['Question Frequency'].fillna(0).to_numpy(dtype=np.int32)
+        self.site_accuracy = np.full(shape[1:], np.nan, dtype=np.float32)
+        self.site_accuracy[exam_codes, topic_codes] = df['Site Accuracy'].to_numpy(dtype=np.float32)
+
+    def __contains__(self, student_id):
+        return student_id in self._student_rows
+
+    def __len__(self):
+        return len(self.student_ids)
+
+    @property
+    def nbytes(self):
+        """Memory held by the arrays (excluding the small lookup tables)."""
+        return self.accuracy.nbytes + self.present.nbytes + self.frequency.nbytes + self.site_accuracy.nbytes
+
+    def section_topics(self, section):
+        """Topic codes belonging to `section` (all topics for None)."""
+        if section is None:
+            return np.arange(len(self.topic_names))
+        matches = np.flatnonzero(self.section_names == section)
+        if len(matches) == 0:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self.topic_sections == matches[0])
+
+    def student_sections(self, student_id):
+        """Sections the student has topic results for."""
+        row = self._student_rows.get(student_id)
+        if row is None:
+            return []
+        topics = self.present[row].any(axis=0)
+        return [name for code, name in enumerate(self.section_names) if topics[self.topic_sections == code].any()]
+
+    def student_topic_table(self, student_id, section=None):
+        """A student's topic accuracy rows (exam, topic, frequency, accuracy) for one section."""
+        row = self._student_rows.get(student_id)
+        topics = self.section_topics(section)
+        if row is None or len(topics) == 0:
+            return pd.DataFrame(columns=TOPIC_TABLE_COLUMNS)
+        exams, positions = np.nonzero(self.present[row][:, topics])
+        topic_codes = topics[positions]
+        return pd.DataFrame({
+            'Exam Name': self.exam_names[exams],
+            'Question Topic': self.topic_names[topic_codes],
+            'Question Frequency': self.frequency[exams, topic_codes].astype(np.int64),
+            'Student Accuracy': self.accuracy[row, exams, topic_codes].astype(np.float64).round(4)
+        })
+
+    def cohort_topic_accuracy(self, section=None):
+        """Mean student accuracy per exam and topic across the cohort, next to the site accuracy."""
+        topics = self.section_topics(section)
+        present = self.present[:, :, topics]
+        students = present.sum(axis=0)
+        totals = np.where(present, self.accuracy[:, :, topics], 0).sum(axis=0, dtype=np.float64)
+        exams, positions = np.nonzero(students)
+        topic_codes = topics[positions]
+        return pd.DataFrame({
+            'Exam Name': self.exam_names[exams],
+            'Exam Section': self.section_names[self.topic_sections[topic_codes]],
+            'Question Topic': self.topic_names[topic_codes],
+            'Question Frequency': self.frequency[exams, topic_codes].astype(np.int64),
+            'Students': students[exams, positions],
+            'Cohort Accuracy': totals[exams, positions] / students[exams, positions],
+            'Site Accuracy': self.site_accuracy[exams, topic_codes].astype(np.float64).round(4)
+        })
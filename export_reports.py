@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""Headless batch export of Individual Student Dashboard reports.
+
+Writes one self-contained HTML file per student (tier cards, practice exam
+scores, topic accuracy per exam section and the weekly engagement,
+participation, accuracy and attendance charts), using the same transforms
+and chart builders as the Streamlit page.
+
+Usage:
+    python export_reports.py [--output-dir reports] [--students 1 2 3] [--workers 4]
+                             [--institution inst --cohort 2025]
+"""
+import argparse
+import html
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import altair as alt
+import pandas as pd
+
+from chart_data import ENGAGEMENT_DATASET, dataset_json, shared_data
+from data_store import find_data_dir
+from exam_topics import ExamTopicModel
+from student_charts import (
+    INDIVIDUAL_DATA_FILES, STUDENT_CHARTS, load_individual_tables, prepare_student_engagement,
+    student_tiers, tier_badge_html
+)
+from partitions import INDIVIDUAL_TABLES, discover_partitions, find_partition
+from student_index import StudentPartitions
+
+REPORT_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="https://cdn.jsdelivr.net/npm/vega@5"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-lite@5"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-embed@6"></script>
+<style>
+  body {{ font-family: 'Inter', sans-serif; color: #1e293b; max-width: 1000px; margin: 2rem auto; }}
+  h1, h2, h3 {{ font-weight: 600; }}
+  .tier-row {{ display: flex; gap: 1rem; }}
+  .tier-card {{ flex: 1; text-align: center; }}
+  table {{ border-collapse: collapse; width: 100%; margin-bottom: 1rem; }}
+  th, td {{ border-bottom: 1px solid #e2e8f0; padding: 4px 8px; text-align: left; }}
+  .chart {{ width: 100%; margin-bottom: 2rem; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+{body}
+<script>
+function withShared(spec) {{
+  spec.datasets = Object.assign({{}}, spec.datasets, shared);
+  return spec;
+}}
+{embeds}
+</script>
+</body>
+</html>
+"""
+
+# Set in each worker process by _init_worker
+_partitions = None
+
+
+def load_partitions(base_path):
+    """Load the four dashboard tables once and index them by student_id."""
+    df_engagement, df_tests, df_sections, df_tiers = load_individual_tables(base_path)
+    return StudentPartitions(df_engagement), StudentPartitions(df_tests), ExamTopicModel(df_sections), StudentPartitions(df_tiers)
+
+
+def render_student_report(student_id, partitions):
+    """Build the HTML report for one student."""
+    engagement_partitions, test_partitions, exam_topics, tier_partitions = partitions
+    df_engagement = prepare_student_engagement(engagement_partitions.get(student_id))
+    df_tests = test_partitions.get(student_id)
+
+    body = ['<h2>Student Tier Assessment</h2>']
+    tiers = student_tiers(tier_partitions.get(student_id))
+    if tiers:
+        cards = ''.join(
+            f"<div class='tier-card'><h5>{html.escape(category)}</h5>{tier_badge_html(tier)}</div>"
+            for category, tier in tiers
+        )
+        body.append(f"<div class='tier-row'>{cards}</div>")
+    else:
+        body.append('<p>No tier assessment data available for this student.</p>')
+
+    body.append('<h2>Practice Exam Scores</h2>')
+    body.append(df_tests[['test_name','test_date','actual_exam_score']].to_html(index=False))
+
+    body.append('<h2>Practice Exam - Accuracy per Subject</h2>')
+    for exam_section in exam_topics.student_sections(student_id):
+        body.append(f'<h3>{html.escape(str(exam_section))}</h3>')
+        body.append(exam_topics.student_topic_table(student_id, exam_section).to_html(index=False))
+
+    # Vega-Lite specs need JSON-serializable dates
+    df_tests_chart = df_tests.assign(test_date=pd.to_datetime(df_tests['test_date']))
+    # The engagement charts reference one shared copy of the weekly rows by name
+    engagement_data = alt.NamedData(name=ENGAGEMENT_DATASET)
+    embeds = [f"const shared = {{{ENGAGEMENT_DATASET!r}: {dataset_json(shared_data(df_engagement))}}};"]
+    for i, (title, build_chart, uses_engagement) in enumerate(STUDENT_CHARTS):
+        chart = build_chart(engagement_data if uses_engagement else df_tests_chart).properties(width='container')
+        body.append(f"<h2>{html.escape(title)}</h2><div id='chart-{i}' class='chart'></div>")
+        embeds.append(f"vegaEmbed('#chart-{i}', withShared({chart.to_json(indent=None)}), {{actions: false}});")
+
+    return REPORT_TEMPLATE.format(
+        title=f'Student {html.escape(str(student_id))} - Scholar Report',
+        body='\n'.join(body),
+        embeds='\n'.join(embeds)
+    )
+
+
+def _init_worker(partitions):
+    global _partitions
+    _partitions = partitions
+
+
+def _export_one(job):
+    student_id, output_dir = job
+    output_path = os.path.join(output_dir, f'student-{student_id}.html')
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(render_student_report(student_id, _partitions))
+    return output_path
+
+
+def export_reports(partitions, student_ids, output_dir, workers=None):
+    """Render reports for `student_ids` across a process pool; returns the written paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(student_id, output_dir) for student_id in student_ids]
+    if workers == 1:
+        _init_worker(partitions)
+        return [_export_one(job) for job in jobs]
+    # The partitions are handed to each worker once, not once per student
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(partitions,)) as pool:
+        return list(pool.map(_export_one, jobs, chunksize=max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Export per-student dashboard reports as static HTML.')
+    parser.add_argument('--output-dir', default='reports',
+                        help='Directory for the HTML files (default: %(default)s)')
+    parser.add_argument('--students', nargs='+', type=int,
+                        help='Student IDs to export (default: every student with engagement data)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: one per CPU; 1 disables the pool)')
+    parser.add_argument('--data-dir', default=None,
+                        help='Directory containing the student-data CSVs (default: searched)')
+    parser.add_argument('--institution', default=None,
+                        help='Institution partition to export (default: the flat student-data layout)')
+    parser.add_argument('--cohort', default=None,
+                        help="Cohort within --institution (default: the institution's latest)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.institution is not None:
+        partition = find_partition(discover_partitions(), args.institution, args.cohort)
+        if partition is None or not partition.has(INDIVIDUAL_TABLES):
+            sys.exit(f"No student data for institution {args.institution}" + (f" cohort {args.cohort}" if args.cohort else ''))
+        base_path = partition.paths(INDIVIDUAL_TABLES)
+    else:
+        base_path = args.data_dir if args.data_dir is not None else find_data_dir(INDIVIDUAL_DATA_FILES)
+        if base_path is None:
+            sys.exit(f"Could not find the student data files: {', '.join(INDIVIDUAL_DATA_FILES)}")
+        if base_path and not base_path.endswith(os.sep):
+            base_path += os.sep
+
+    print("Loading data...")
+    partitions = load_partitions(base_path)
+    student_ids = args.students if args.students else partitions[0].student_ids.tolist()
+
+    print(f"Exporting {len(student_ids)} student reports to {args.output_dir}/ ...")
+    paths = export_reports(partitions, student_ids, args.output_dir, workers=args.workers)
+    print(f"Wrote {len(paths)} reports.")
+
+
+if __name__ == '__main__':
+    main()
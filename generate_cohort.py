@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""Synthetic cohort generator for benchmarking and load testing.
+
+Writes the same files the dashboard reads, with the exact column names
+main.py expects:
+
+    institution-1-engagement-data.csv          weekly engagement and attendance
+    institution-1-test-data.csv                practice exam scores
+    institution-1-2025-exam-data-jw-exams.csv  JW exam topic accuracy
+    tierdata.csv                               per-student tiers
+    jfd-combined.csv                           per-student school roster
+    data_outcomes_with_tiers.csv               weekly rows joined to outcomes and tiers
+
+Each student gets a latent ability and engagement level; accuracy,
+attendance, tiers and score gains are drawn from those, so the generated
+data has the same kinds of relationships the analysis pages look for.
+Everything is generated with vectorized NumPy from one seeded Generator, so
+the same arguments always produce the same files.
+
+Usage:
+    python generate_cohort.py --students 100000 --weeks 40 --exams 6 --schools 25 --seed 7
+    python generate_cohort.py --output-dir synthetic-data --format parquet
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from rules import SCHOOL_CATEGORIES, evaluate_rules, rule_matrix
+
+# A subset of the topics in the real JW exam file, per exam section
+SECTION_TOPICS = {
+    'Biological and Biochemical Foundation of Living Systems': [
+        'Endocrine System', 'Plasma Membrane', 'Eukaryotic Gene Expression', 'Enzyme Kinetics & Regulation',
+        'Amino Acids', 'Renal & Skin Systems', 'Protein Structure & Folding', 'Nucleic Acids', 'Cell Cycle',
+        'Mendelian Genetics', 'Respiratory System', 'Bioenergetics'
+    ],
+    'Chemical and Physical Foundations of Biological Systems': [
+        'Electrochemistry', 'Stoichiometry', 'Gases', 'Analytic Techniques', 'Optics', 'Solutions',
+        'Atomic Structure', 'Bonding & IMFs', 'Acid-Base', 'Structure & Stereochemistry', 'Circuits', 'Static Fluids'
+    ],
+    'Critical Analysis and Reasoning Skills': [
+        'Sociology', 'Economics', 'Popular Culture', 'Music', 'Education', 'Political Science', 'Art', 'Literature'
+    ],
+    'Psychological, Social, and Biological Foundations of Behavior': [
+        'Social Inequality & Social Class', 'Psychological Disorders', 'Cognition', 'Memory', 'Motivation',
+        'Biological Bases of Behavior', 'Associative Learning', 'Emotion & Stress', 'Social Institutions',
+        'Consciousness', 'Language', 'Sensation'
+    ]
+}
+
+OUTCOMES_FILE = 'data_outcomes_with_tiers.csv'
+
+TIER_LABELS = np.array(['Tier 1', 'Tier 2', 'Tier 3'])
+
+ENGAGEMENT_COLUMNS = [
+    'week', 'start_date', 'end_date', 'student_id', 'cars_accuracy', 'sciences_accuracy', 'class_accuracy',
+    'completed_lessons', 'total_completed_passages_discrete_sets', 'score_trends_on_completed_dailies',
+    'num_attended_large_session', 'num_scheduled_large_session', 'num_attended_small_session',
+    'num_scheduled_small_session', 'class_participation', 'homework_participation'
+]
+
+
+def _tiers(rate):
+    """Tier labels from a 0-1 rate using the dashboard's ≥80% / 50-79% / <50% cut-offs."""
+    return TIER_LABELS[np.where(rate >= 0.8, 0, np.where(rate >= 0.5, 1, 2))]
+
+
+def _with_missing(rng, values, fraction):
+    values = values.astype(float)
+    values[rng.random(len(values)) < fraction] = np.nan
+    return values
+
+
+def _within_group_index(counts):
+    """0, 1, ... position of each row within its group, for groups laid out back to back."""
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.arange(counts.sum()) - starts
+
+
+def generate_cohort(n_students=150, n_weeks=40, n_exams=4, n_schools=5, seed=0, start_date='2025-06-02'):
+    """Generate every dashboard table for a synthetic cohort; returns {filename: DataFrame}."""
+    rng = np.random.default_rng(seed)
+    student_ids = np.arange(1, n_students + 1)
+
+    # Latent per-student traits
+    ability = rng.normal(0, 1, n_students)
+    engagement = 1 / (1 + np.exp(-(0.8 * ability + rng.normal(0.6, 1, n_students))))
+    school = rng.integers(1, n_schools + 1, n_students)
+
+    # Weekly engagement: one row per student per week
+    student = np.repeat(student_ids, n_weeks)
+    week = np.tile(np.arange(1, n_weeks + 1), n_students)
+    ability_w = np.repeat(ability, n_weeks)
+    engagement_w = np.repeat(engagement, n_weeks)
+    n_rows = len(student)
+
+    week_start = pd.Timestamp(start_date) + pd.to_timedelta(7 * (np.arange(n_weeks)), unit='D')
+    start_dates = np.tile(week_start.to_numpy(), n_students)
+    end_dates = start_dates + np.timedelta64(6, 'D')
+
+    # Sessions are scheduled per week for the whole cohort; some weeks have no small group
+    scheduled_large_week = rng.integers(1, 4, n_weeks)
+    scheduled_small_week = np.where(rng.random(n_weeks) < 0.3, np.nan, rng.integers(1, 3, n_weeks))
+    scheduled_large = np.tile(scheduled_large_week, n_students)
+    scheduled_small = np.tile(scheduled_small_week, n_students)
+    attended_large = rng.binomial(scheduled_large, engagement_w)
+    attended_small = np.where(
+        np.isnan(scheduled_small), np.nan,
+        rng.binomial(np.nan_to_num(scheduled_small).astype(int), engagement_w * 0.7)
+    )
+
+    def accuracy(mean):
+        return np.clip(mean + 0.1 * ability_w + rng.normal(0, 0.12, n_rows), 0, 1).round(2)
+
+    engagement_df = pd.DataFrame({
+        'week': week,
+        'start_date': start_dates,
+        'end_date': end_dates,
+        'student_id': student,
+        'cars_accuracy': _with_missing(rng, accuracy(0.71), 0.15),
+        'sciences_accuracy': _with_missing(rng, accuracy(0.76), 0.05),
+        'class_accuracy': _with_missing(rng, accuracy(0.83), 0.25),
+        'completed_lessons': rng.poisson(8 * engagement_w),
+        'total_completed_passages_discrete_sets': rng.poisson(10 * engagement_w),
+        'score_trends_on_completed_dailies': (rng.random(n_rows) * engagement_w * 1.2).round(2),
+        'num_attended_large_session': attended_large,
+        'num_scheduled_large_session': scheduled_large,
+        'num_attended_small_session': attended_small,
+        'num_scheduled_small_session': scheduled_small,
+        'class_participation': (rng.binomial(3, engagement_w * 0.8) / 3).round(2),
+        'homework_participation': (rng.random(n_rows) < engagement_w * 0.35).astype(float)
+    }, columns=ENGAGEMENT_COLUMNS)
+
+    # Tiers from each student's overall rates
+    large_rate = np.bincount(student - 1, attended_large, n_students + 1)[:n_students] / (scheduled_large_week.sum() or 1)
+    small_scheduled_total = np.nansum(scheduled_small_week) or 1
+    small_rate = np.bincount(student - 1, np.nan_to_num(attended_small), n_students + 1)[:n_students] / small_scheduled_total
+    participation_rate = np.bincount(student - 1, engagement_df['class_participation'].to_numpy(), n_students + 1)[:n_students] / n_weeks
+    survey_rate = np.clip(engagement + rng.normal(0, 0.15, n_students), 0, 1)
+    tier_df = pd.DataFrame({
+        'student_id': student_ids,
+        'Survey Tier': _tiers(survey_rate),
+        'Large Group Tier': _tiers(large_rate),
+        'Small Group Tier': _tiers(small_rate),
+        'Class Participation Tier': _tiers(participation_rate / 0.75 * 0.8),
+        'Final Tier': np.nan
+    })
+
+    # Practice exams: each student takes the first 1..n_exams exams in order
+    baseline = np.clip(np.round(495 + 5 * ability + rng.normal(0, 4, n_students)), 472, 528)
+    gain_per_exam = 1.5 * engagement + rng.normal(0, 1, n_students)
+    exam_counts = rng.integers(1, n_exams + 1, n_students)
+    test_student_idx = np.repeat(np.arange(n_students), exam_counts)
+    exam_idx = _within_group_index(exam_counts)
+    test_scores = np.clip(np.round(
+        baseline[test_student_idx] + gain_per_exam[test_student_idx] * exam_idx + rng.normal(0, 2.5, len(exam_idx))
+    ), 472, 528).astype(int)
+    test_dates = pd.Timestamp(start_date) + pd.to_timedelta(14 * (exam_idx + 1) + rng.integers(0, 7, len(exam_idx)), unit='D')
+    test_df = pd.DataFrame({
+        'student_id': student_ids[test_student_idx],
+        'test_name': pd.Categorical.from_codes(exam_idx, [f'JW Exam {k}' for k in range(1, n_exams + 1)]),
+        'test_date': test_dates.strftime('%Y-%m-%d'),
+        'actual_exam_score': test_scores,
+        'low_predicted_exam_score': np.nan,
+        'high_predicted_exam_score': np.nan
+    })
+
+    # JW exam topic accuracy: every exam taken x every topic
+    # String columns are built as categoricals from integer codes to keep memory flat
+    section_names = list(SECTION_TOPICS)
+    section_codes = np.array([i for i, topics in enumerate(SECTION_TOPICS.values()) for _ in topics])
+    topics = [t for topics in SECTION_TOPICS.values() for t in topics]
+    n_topics = len(topics)
+    row_test = np.repeat(np.arange(len(exam_idx)), n_topics)
+    row_topic = np.tile(np.arange(n_topics), len(exam_idx))
+    topic_difficulty = rng.normal(0, 10, n_topics)
+    site_accuracy = np.clip(65 - topic_difficulty + rng.normal(0, 3, (n_exams, n_topics)), 5, 100).round(2)
+    site_median = np.round(497 + rng.normal(0, 1, n_exams), 2)
+    row_exam = exam_idx[row_test]
+    row_student = test_student_idx[row_test]
+    topic_df = pd.DataFrame({
+        'student_id': student_ids[row_student],
+        'Exam Name': pd.Categorical.from_codes(row_exam, [f'Jack Westin MCAT Practice Exam {k}' for k in range(1, n_exams + 1)]),
+        'Exam Section': pd.Categorical.from_codes(section_codes[row_topic], section_names),
+        'Question Topic': pd.Categorical.from_codes(row_topic, topics),
+        'Question Frequency': rng.integers(1, 7, len(row_test)),
+        'Student Accuracy': np.clip(np.round(
+            site_accuracy[row_exam, row_topic] + 15 * ability[row_student] + rng.normal(0, 20, len(row_test))
+        ), 0, 100),
+        'Site Accuracy': site_accuracy[row_exam, row_topic],
+        'student_score': test_scores[row_test],
+        'site_median_score': site_median[row_exam]
+    })
+
+    # Outcomes: most recent practice exam, actual MCAT (not everyone has sat it yet)
+    last_row = np.cumsum(exam_counts) - 1
+    most_recent = test_scores[last_row].astype(float)
+    actual = np.where(rng.random(n_students) < 0.6,
+                      np.clip(np.round(most_recent + rng.normal(1, 4, n_students)), 472, 528), np.nan)
+    baseline_reported = np.where(rng.random(n_students) < 0.05, 0.0, baseline)
+    score_difference = np.where(baseline_reported > 0, np.where(np.isnan(actual), most_recent, actual) - baseline, np.nan)
+
+    outcome_cols = {
+        'Baseline Score': baseline_reported,
+        'Number of Practice Exams': exam_counts.astype(float),
+        'Most Recent Practice Exam': most_recent,
+        'Actual MCAT': actual,
+        'Score Difference': score_difference,
+        'Survey Tier': tier_df['Survey Tier'].to_numpy(),
+        'Small Group Tier': tier_df['Small Group Tier'].to_numpy(),
+        'Class Participation Tier': tier_df['Class Participation Tier'].to_numpy(),
+        'Large Group Tier': tier_df['Large Group Tier'].to_numpy()
+    }
+    outcomes_df = engagement_df.copy()
+    # The outcomes file stores dates as text; format each week once
+    outcomes_df['start_date'] = pd.Categorical.from_codes(week - 1, week_start.strftime('%Y-%m-%d'))
+    outcomes_df['end_date'] = pd.Categorical.from_codes(week - 1, (week_start + pd.Timedelta(days=6)).strftime('%Y-%m-%d'))
+    student_row = student - 1
+    for col, values in outcome_cols.items():
+        outcomes_df[col] = values[student_row]
+    outcomes_df.insert(0, 'Unnamed: 0', np.arange(n_rows))
+
+    # School roster with the flattened exam history and category flags
+    # Joined one exam column at a time (students x exams grid) rather than per student
+    exam_grid = np.full((n_students, n_exams), '', dtype=object)
+    exam_grid[test_student_idx, exam_idx] = np.char.add(
+        np.char.add('JW Exam ', (exam_idx + 1).astype(str)), np.char.add(': ', test_scores.astype(str))
+    ).astype(object)
+    all_exams = exam_grid[:, 0]
+    for k in range(1, n_exams):
+        all_exams = np.where(exam_grid[:, k] != '', all_exams + ', ' + exam_grid[:, k], all_exams)
+    jfd_df = pd.DataFrame({
+        'student_id': student_ids,
+        'jamp_school': school,
+        'survey_tier': tier_df['Survey Tier'],
+        'large_group_tier': tier_df['Large Group Tier'],
+        'small_group_tier': tier_df['Small Group Tier'],
+        'class_participation_tier': tier_df['Class Participation Tier'],
+        'anticipated_exam_date': np.where(
+            rng.random(n_students) < 0.7,
+            (pd.Timestamp(start_date) + pd.to_timedelta(rng.integers(90, 365, n_students), unit='D')).strftime('%Y-%m-%d'),
+            None
+        ),
+        'highest_exam_score': np.maximum.reduceat(test_scores, np.cumsum(exam_counts) - exam_counts).astype(float),
+        'all_exams_and_scores': all_exams,
+        'exam_count': exam_counts
+    })
+    categories = rule_matrix(evaluate_rules(jfd_df, SCHOOL_CATEGORIES), SCHOOL_CATEGORIES)
+    for i, name in enumerate(SCHOOL_CATEGORIES, start=1):
+        jfd_df[f'category_{i}'] = categories[name].astype(int).to_numpy()
+    jfd_df['jfd'] = school
+
+    return {
+        'institution-1-engagement-data.csv': engagement_df,
+        'institution-1-test-data.csv': test_df,
+        'institution-1-2025-exam-data-jw-exams.csv': topic_df,
+        'tierdata.csv': tier_df,
+        'jfd-combined.csv': jfd_df,
+        OUTCOMES_FILE: outcomes_df
+    }
+
+
+def write_cohort(tables, output_dir, file_format='csv'):
+    """Write the generated tables as CSV and/or Parquet; returns the written paths.
+
+    Files go to `output_dir/student-data/`, with the outcomes table also at
+    `output_dir/` where the Analysis Dashboard looks for it, so the dashboard
+    can be run from `output_dir` unchanged.
+    """
+    data_dir = os.path.join(output_dir, 'student-data')
+    os.makedirs(data_dir, exist_ok=True)
+    paths = []
+    for filename, df in tables.items():
+        directories = [data_dir, output_dir] if filename == OUTCOMES_FILE else [data_dir]
+        for directory in directories:
+            if file_format in ('csv', 'both'):
+                path = os.path.join(directory, filename)
+                df.to_csv(path, index=False, date_format='%Y-%m-%d')
+                paths.append(path)
+            if file_format in ('parquet', 'both'):
+                path = os.path.join(directory, os.path.splitext(filename)[0] + '.parquet')
+                df.to_parquet(path, index=False)
+                paths.append(path)
+    return paths
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic cohort in the student-data schemas.')
+    parser.add_argument('--students', type=int, default=150, help='Number of students (default: %(default)s)')
+    parser.add_argument('--weeks', type=int, default=40, help='Weeks of engagement data (default: %(default)s)')
+    parser.add_argument('--exams', type=int, default=4, help='Maximum practice exams per student (default: %(default)s)')
+    parser.add_argument('--schools', type=int, default=5, help='Number of schools (jfd values) (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: %(default)s)')
+    parser.add_argument('--start-date', default='2025-06-02', help='First week start date (default: %(default)s)')
+    parser.add_argument('--output-dir', default='synthetic-data', help='Output directory (default: %(default)s)')
+    parser.add_argument('--format', choices=['csv', 'parquet', 'both'], default='csv',
+                        help='Output file format (default: %(default)s)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    tables = generate_cohort(args.students, args.weeks, args.exams, args.schools, args.seed, args.start_date)
+    generated = time.perf_counter()
+    paths = write_cohort(tables, args.output_dir, args.format)
+    written = time.perf_counter()
+
+    for filename, df in tables.items():
+        print(f"{filename}: {len(df):,} rows")
+    print(f"Generated in {generated - start:.2f}s, wrote {len(paths)} files to {args.output_dir}/ in {written - generated:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
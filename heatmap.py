@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Plotly heat maps that stay fast for large pivots.
+
+Cell values are drawn by the heatmap trace itself (texttemplate) instead of
+one layout annotation per cell, and only while the map is small enough to
+read them (TEXT_CELL_LIMIT). Larger matrices - student x topic, school x
+tier - are block-aggregated on the server to at most MAX_ROWS x MAX_COLS
+cells before they are sent, so the browser draws one raster of bounded size
+whatever the input. render_heatmap adds a row range control for zooming in:
+the selected slice is re-aggregated at full resolution when it fits.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+# Cells labelled with their value; bigger maps show values on hover only
+TEXT_CELL_LIMIT = 400
+
+# Largest matrix sent to the browser; bigger ones are aggregated in blocks
+MAX_ROWS = 300
+MAX_COLS = 150
+
+AGGREGATIONS = ['mean', 'sum', 'max']
+
+
+def _block_starts(n, limit):
+    """Start positions of the blocks that fold `n` rows into at most `limit`."""
+    if n <= limit:
+        return np.arange(n)
+    return np.arange(0, n, math.ceil(n / limit))
+
+
+def _block_labels(labels, starts):
+    labels = [str(label) for label in labels]
+    ends = list(starts[1:] - 1) + [len(labels) - 1]
+    return [labels[s] if s == e else f'{labels[s]} – {labels[e]}' for s, e in zip(starts, ends)]
+
+
+def aggregate_matrix(df, max_rows=MAX_ROWS, max_cols=MAX_COLS, how='mean'):
+    """Fold `df` into blocks of consecutive rows and columns, at most max_rows x max_cols.
+
+    Blocks are labelled "first – last". Missing cells are ignored; a block
+    with no values stays missing. Returns `df` itself when it already fits.
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation: {how}")
+    if df.shape[0] <= max_rows and df.shape[1] <= max_cols:
+        return df
+    values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+    present = ~np.isnan(values)
+    rows = _block_starts(values.shape[0], max_rows)
+    cols = _block_starts(values.shape[1], max_cols)
+
+    if how == 'max':
+        folded = np.fmax.reduceat(np.fmax.reduceat(values, rows, axis=0), cols, axis=1)
+    else:
+        sums = np.add.reduceat(np.add.reduceat(np.where(present, values, 0.0), rows, axis=0), cols, axis=1)
+        counts = np.add.reduceat(np.add.reduceat(present.astype(np.int64), rows, axis=0), cols, axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            folded = np.where(counts > 0, sums / counts if how == 'mean' else sums, np.nan)
+    return pd.DataFrame(folded, index=_block_labels(df.index, rows), columns=_block_labels(df.columns, cols))
+
+
+def heatmap_figure(df, title=None, colorscale='Viridis', text_format='%{z}', textfont=None,
+                   max_rows=MAX_ROWS, max_cols=MAX_COLS, how='mean', row_range=None, col_range=None):
+    """A heat map of `df` (rows top to bottom, as in px.imshow) as one go.Heatmap trace.
+
+    `row_range` / `col_range` are (start, stop) positions to zoom into before
+    aggregating; values are printed in the cells up to TEXT_CELL_LIMIT cells.
+    """
+    if row_range is not None:
+        df = df.iloc[row_range[0]:row_range[1]]
+    if col_range is not None:
+        df = df.iloc[:, col_range[0]:col_range[1]]
+    shown = aggregate_matrix(df, max_rows, max_cols, how)
+
+    trace = dict(
+        z=shown.to_numpy(dtype=np.float64, na_value=np.nan),
+        x=[str(col) for col in shown.columns],
+        y=[str(row) for row in shown.index],
+        coloraxis='coloraxis',
+        hoverongaps=False,
+        hovertemplate='%{y}<br>%{x}<br>%{z}<extra></extra>'
+    )
+    if shown.size <= TEXT_CELL_LIMIT:
+        trace.update(texttemplate=text_format, textfont=textfont or {})
+    fig = go.Figure(go.Heatmap(**trace))
+    fig.update_layout(
+        title=title,
+        coloraxis=dict(colorscale=colorscale),
+        xaxis=dict(type='category'),
+        yaxis=dict(type='category', autorange='reversed')
+    )
+    return fig
+
+
+def render_heatmap(df, key, style=None, max_rows=MAX_ROWS, **figure_kwargs):
+    """Draw `df` with heatmap_figure, plus a row range control when it has more than `max_rows` rows.
+
+    `style` is applied to the figure before it is drawn (e.g. the page's
+    light mode styling). Widget state is kept per `key`.
+    """
+    row_range = None
+    if len(df) > max_rows:
+        row_range = st.slider("Rows", 0, len(df), (0, len(df)), key=f'{key}-rows')
+        if row_range[1] <= row_range[0]:
+            st.info("Select a range of at least one row to draw the heat map.")
+            return
+        rows_per_cell = math.ceil((row_range[1] - row_range[0]) / max_rows)
+        if rows_per_cell > 1:
+            st.caption(f"Each row of the map combines {rows_per_cell} rows ({figure_kwargs.get('how', 'mean')}); narrow the range to zoom in.")
+    fig = heatmap_figure(df, max_rows=max_rows, row_range=row_range, **figure_kwargs)
+    if style is not None:
+        fig = style(fig)
+    st.plotly_chart(fig, use_container_width=True)
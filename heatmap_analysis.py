@@ -1,146 +1,226 @@
-import pandas as pd
+"""Heat maps of tier assignments for students with large score improvements.
+
+Usage:
+    python heatmap_analysis.py [--input PATH] [--threshold 4] [--tier-columns ...]
+                               [--max-students 50] [--output-dir .] [--show] [--html]
+"""
+import argparse
+import os
+
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.colors import LinearSegmentedColormap
-
-# Load the data
-print("Loading data...")
-df = pd.read_csv('/Users/anastasiaperez/Downloads/institution-TJ/student-data/data_outcomes_with_tiers.csv')
-
-print(f"Data shape: {df.shape}")
-print(f"Columns: {df.columns.tolist()}")
-
-# Clean the data and filter for students with >4 point improvement
-print("\nFiltering students with >4 point improvement...")
-df_clean = df.dropna(subset=['Score Difference'])
-
-# Filter for >4 point improvement
-high_improvers = df_clean[df_clean['Score Difference'] > 4].copy()
-
-print(f"Students with >4 point improvement: {len(high_improvers)}")
-print(f"Score improvement range: {high_improvers['Score Difference'].min():.1f} to {high_improvers['Score Difference'].max():.1f} points")
-
-# Analyze tier columns
-tier_columns = ['Survey Tier', 'Large Group Tier', 'Small Group Tier', 'Class Participation Tier']
-print(f"\nTier columns available: {tier_columns}")
-
-# Create a summary of high improvers by tier
-print("\nHigh improvers by tier:")
-for col in tier_columns:
-    if col in high_improvers.columns:
-        tier_counts = high_improvers[col].value_counts()
-        print(f"\n{col}:")
-        for tier, count in tier_counts.items():
-            print(f"  {tier}: {count} students")
-
-# Create heat map data
-# We'll create a matrix showing: Student ID vs Tier Type, colored by improvement score
-print("\nPreparing heat map data...")
-
-# Get unique student IDs and create a matrix
-student_ids = high_improvers['student_id'].unique()
-print(f"Number of unique high-improving students: {len(student_ids)}")
-
-# Create a matrix: rows = students, columns = tier types
-tier_matrix = []
-student_labels = []
-improvement_values = []
-
-for student_id in sorted(student_ids)[:50]:  # Limit to top 50 for readability
-    student_data = high_improvers[high_improvers['student_id'] == student_id].iloc[0]
-    
-    row = []
-    for tier_col in tier_columns:
-        if tier_col in student_data and pd.notna(student_data[tier_col]):
-            # Convert tier to numeric: Tier 1 = 1, Tier 2 = 2, Tier 3 = 3
-            tier_value = int(student_data[tier_col].split(' ')[-1]) if 'Tier' in str(student_data[tier_col]) else 0
-            row.append(tier_value)
-        else:
-            row.append(0)  # Missing data
-    
-    tier_matrix.append(row)
-    student_labels.append(f"Student {int(student_id)}")
-    improvement_values.append(student_data['Score Difference'])
-
-tier_matrix = np.array(tier_matrix)
-
-# Create the heat map
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 12))
-
-# Heat map 1: Tier levels
-sns.heatmap(tier_matrix, 
-            xticklabels=[col.replace(' Tier', '') for col in tier_columns],
-            yticklabels=student_labels,
-            annot=True, 
-            cmap='RdYlBu_r',
-            cbar_kws={'label': 'Tier Level (1=Best, 3=Needs Improvement)'},
-            ax=ax1)
-ax1.set_title('Student Tier Assignments\n(Students with >4 Point Improvement)', fontsize=14, fontweight='bold')
-ax1.set_xlabel('Tier Categories', fontsize=12)
-ax1.set_ylabel('Students', fontsize=12)
-
-# Heat map 2: Score improvements
-improvement_matrix = np.array(improvement_values).reshape(-1, 1)
-sns.heatmap(improvement_matrix,
-            xticklabels=['Score Improvement'],
-            yticklabels=student_labels,
-            annot=True,
-            fmt='.1f',
-            cmap='Greens',
-            cbar_kws={'label': 'MCAT Score Improvement (Points)'},
-            ax=ax2)
-ax2.set_title('MCAT Score Improvements\n(Students with >4 Point Improvement)', fontsize=14, fontweight='bold')
-ax2.set_xlabel('Metric', fontsize=12)
-ax2.set_ylabel('Students', fontsize=12)
-
-plt.tight_layout()
-plt.savefig('/Users/anastasiaperez/Downloads/institution-TJ/high_improvers_heatmap.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-# Create a combined analysis heat map
-print("\nCreating combined analysis...")
-
-# Create a correlation matrix between tiers and improvement
-tier_improvement_data = []
-for student_id in student_ids:
-    student_data = high_improvers[high_improvers['student_id'] == student_id].iloc[0]
-    
-    row_data = {'student_id': student_id, 'improvement': student_data['Score Difference']}
+import pandas as pd
+from data_store import read_table
+
+DEFAULT_INPUT = 'student-data/data_outcomes_with_tiers.csv'
+DEFAULT_TIER_COLUMNS = ['Survey Tier', 'Large Group Tier', 'Small Group Tier', 'Class Participation Tier']
+
+# Students up to which cell values are printed in the PNG heat maps
+ANNOT_MAX_STUDENTS = 60
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Tier heat maps for high-improving students.')
+    parser.add_argument('--input', default=DEFAULT_INPUT,
+                        help='Weekly outcomes CSV (default: %(default)s)')
+    parser.add_argument('--threshold', type=float, default=4,
+                        help='Minimum Score Difference, exclusive (default: %(default)s)')
+    parser.add_argument('--tier-columns', nargs='+', default=DEFAULT_TIER_COLUMNS,
+                        help='Tier columns to include (default: %(default)s)')
+    parser.add_argument('--max-students', type=int, default=50,
+                        help='Students shown in the PNG heat map, 0 for all (default: %(default)s)')
+    parser.add_argument('--output-dir', default='.',
+                        help='Directory for high_improvers_heatmap.png (default: %(default)s)')
+    parser.add_argument('--show', action='store_true',
+                        help='Open the figure in a window after saving')
+    parser.add_argument('--html', action='store_true',
+                        help='Also write an interactive high_improvers_heatmap.html with every student')
+    return parser.parse_args(argv)
+
+
+def tier_levels(series):
+    """Convert "Tier N" labels to N (NaN for missing or non-tier values).
+
+    Labels are parsed once per distinct category, then mapped through the
+    categorical codes, so the cost does not depend on the number of rows.
+    """
+    categorical = series.astype('category')
+    levels = []
+    for label in categorical.cat.categories:
+        label = str(label)
+        levels.append(float(label.split(' ')[-1]) if 'Tier' in label and label.split(' ')[-1].isdigit() else np.nan)
+    # Code -1 (missing) indexes the trailing NaN
+    lookup = np.array(levels + [np.nan])
+    return pd.Series(lookup[categorical.cat.codes.to_numpy()], index=series.index)
+
+
+def build_tier_table(high_improvers, tier_columns):
+    """One row per student: improvement plus numeric tier levels, sorted by student_id."""
+    tier_columns = [c for c in tier_columns if c in high_improvers.columns]
+    first_rows = high_improvers.groupby('student_id', sort=True)[['Score Difference'] + tier_columns].first()
+    tier_df = pd.DataFrame({'improvement': first_rows['Score Difference']}, index=first_rows.index)
     for tier_col in tier_columns:
-        if tier_col in student_data and pd.notna(student_data[tier_col]):
-            tier_value = int(student_data[tier_col].split(' ')[-1]) if 'Tier' in str(student_data[tier_col]) else np.nan
-            row_data[tier_col] = tier_value
-        else:
-            row_data[tier_col] = np.nan
-    
-    tier_improvement_data.append(row_data)
-
-tier_df = pd.DataFrame(tier_improvement_data)
-
-# Create correlation analysis
-print("\nCorrelation between tiers and improvement:")
-correlations = {}
-for tier_col in tier_columns:
-    if tier_col in tier_df.columns:
-        corr = tier_df[tier_col].corr(tier_df['improvement'])
-        correlations[tier_col] = corr
+        tier_df[tier_col] = tier_levels(first_rows[tier_col])
+    return tier_df
+
+
+def tier_correlations(tier_df, tier_columns):
+    """Correlation between each tier level and improvement."""
+    return {
+        tier_col: tier_df[tier_col].corr(tier_df['improvement'])
+        for tier_col in tier_columns if tier_col in tier_df.columns
+    }
+
+
+def plot_heatmaps(tier_df, tier_columns, threshold, output_path, show=False):
+    """Render the tier and improvement heat maps side by side and save them."""
+    import matplotlib
+    if not show:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    tier_columns = [c for c in tier_columns if c in tier_df.columns]
+    # Missing tiers are drawn as 0
+    tier_matrix = tier_df[tier_columns].fillna(0).astype(int).to_numpy()
+    student_labels = [f"Student {int(student_id)}" for student_id in tier_df.index]
+    improvement_matrix = tier_df['improvement'].to_numpy().reshape(-1, 1)
+    # Per-cell text and one label per row only while they stay readable
+    annot = len(tier_df) <= ANNOT_MAX_STUDENTS
+    if not annot:
+        student_labels = 'auto'
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 12))
+
+    # Heat map 1: Tier levels
+    sns.heatmap(tier_matrix,
+                xticklabels=[col.replace(' Tier', '') for col in tier_columns],
+                yticklabels=student_labels,
+                annot=annot,
+                cmap='RdYlBu_r',
+                cbar_kws={'label': 'Tier Level (1=Best, 3=Needs Improvement)'},
+                ax=ax1)
+    ax1.set_title(f'Student Tier Assignments\n(Students with >{threshold:g} Point Improvement)', fontsize=14, fontweight='bold')
+    ax1.set_xlabel('Tier Categories', fontsize=12)
+    ax1.set_ylabel('Students', fontsize=12)
+
+    # Heat map 2: Score improvements
+    sns.heatmap(improvement_matrix,
+                xticklabels=['Score Improvement'],
+                yticklabels=student_labels,
+                annot=annot,
+                fmt='.1f',
+                cmap='Greens',
+                cbar_kws={'label': 'MCAT Score Improvement (Points)'},
+                ax=ax2)
+    ax2.set_title(f'MCAT Score Improvements\n(Students with >{threshold:g} Point Improvement)', fontsize=14, fontweight='bold')
+    ax2.set_xlabel('Metric', fontsize=12)
+    ax2.set_ylabel('Students', fontsize=12)
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    if show:
+        plt.show()
+    plt.close(fig)
+
+
+def write_html_heatmaps(tier_df, tier_columns, threshold, output_path):
+    """Interactive heat maps of every student, aggregated server-side when there are many."""
+    from plotly.subplots import make_subplots
+    from heatmap import MAX_ROWS, heatmap_figure
+
+    tier_columns = [c for c in tier_columns if c in tier_df.columns]
+    matrix = tier_df[tier_columns].rename(columns=lambda col: col.replace(' Tier', ''))
+    matrix.index = [f"Student {int(student_id)}" for student_id in tier_df.index]
+    improvement = pd.DataFrame({'Score Improvement': tier_df['improvement'].to_numpy()}, index=matrix.index)
+    tiers = heatmap_figure(matrix, colorscale='RdYlBu_r')
+    improvements = heatmap_figure(improvement, colorscale='Greens', text_format='%{z:.1f}')
+
+    fig = make_subplots(rows=1, cols=2, column_widths=[0.7, 0.3], horizontal_spacing=0.15,
+                        subplot_titles=['Student Tier Assignments', 'MCAT Score Improvements'])
+    fig.add_trace(tiers.data[0].update(coloraxis='coloraxis'), row=1, col=1)
+    fig.add_trace(improvements.data[0].update(coloraxis='coloraxis2'), row=1, col=2)
+    fig.update_layout(
+        title=f'High Improvers (>{threshold:g} Point Improvement)',
+        coloraxis=dict(colorscale='RdYlBu_r', colorbar=dict(title='Tier Level', x=0.55)),
+        coloraxis2=dict(colorscale='Greens', colorbar=dict(title='Points')),
+        height=max(600, min(len(matrix), MAX_ROWS) * 4)
+    )
+    fig.update_xaxes(type='category')
+    fig.update_yaxes(type='category', autorange='reversed')
+    fig.write_html(output_path, include_plotlyjs='cdn')
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tier_columns = args.tier_columns
+
+    # Load the data
+    print("Loading data...")
+    df = read_table(args.input)
+
+    print(f"Data shape: {df.shape}")
+    print(f"Columns: {df.columns.tolist()}")
+
+    # Clean the data and filter for students above the improvement threshold
+    print(f"\nFiltering students with >{args.threshold:g} point improvement...")
+    df_clean = df.dropna(subset=['Score Difference'])
+    high_improvers = df_clean[df_clean['Score Difference'] > args.threshold]
+
+    print(f"Students with >{args.threshold:g} point improvement: {len(high_improvers)}")
+    if high_improvers.empty:
+        print("No students above the threshold - nothing to plot.")
+        return
+    print(f"Score improvement range: {high_improvers['Score Difference'].min():.1f} to {high_improvers['Score Difference'].max():.1f} points")
+
+    print(f"\nTier columns available: {[c for c in tier_columns if c in high_improvers.columns]}")
+
+    # Create a summary of high improvers by tier
+    print("\nHigh improvers by tier:")
+    for col in tier_columns:
+        if col in high_improvers.columns:
+            tier_counts = high_improvers[col].value_counts()
+            # Tiers are categorical: skip levels no high improver is in
+            tier_counts = tier_counts[tier_counts > 0]
+            print(f"\n{col}:")
+            for tier, count in tier_counts.items():
+                print(f"  {tier}: {count} students")
+
+    # One row per student with numeric tier levels
+    print("\nPreparing heat map data...")
+    tier_df = build_tier_table(high_improvers, tier_columns)
+    print(f"Number of unique high-improving students: {len(tier_df)}")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, 'high_improvers_heatmap.png')
+    plot_heatmaps(tier_df.head(args.max_students) if args.max_students else tier_df,
+                  tier_columns, args.threshold, output_path, show=args.show)
+    if args.html:
+        html_path = os.path.join(args.output_dir, 'high_improvers_heatmap.html')
+        write_html_heatmaps(tier_df, tier_columns, args.threshold, html_path)
+        print(f"Interactive heat map saved as '{html_path}'")
+
+    # Correlation between tiers and improvement
+    print("\nCorrelation between tiers and improvement:")
+    for tier_col, corr in tier_correlations(tier_df, tier_columns).items():
         print(f"{tier_col}: {corr:.3f}")
 
-# Summary statistics
-print(f"\nSummary Statistics for High Improvers (>4 points):")
-print(f"Total students: {len(high_improvers)}")
-print(f"Average improvement: {high_improvers['Score Difference'].mean():.1f} points")
-print(f"Median improvement: {high_improvers['Score Difference'].median():.1f} points")
-print(f"Max improvement: {high_improvers['Score Difference'].max():.1f} points")
+    # Summary statistics
+    print(f"\nSummary Statistics for High Improvers (>{args.threshold:g} points):")
+    print(f"Total students: {len(high_improvers)}")
+    print(f"Average improvement: {high_improvers['Score Difference'].mean():.1f} points")
+    print(f"Median improvement: {high_improvers['Score Difference'].median():.1f} points")
+    print(f"Max improvement: {high_improvers['Score Difference'].max():.1f} points")
+
+    # Tier distribution analysis
+    print(f"\nTier Distribution Analysis:")
+    for tier_col in tier_columns:
+        if tier_col in high_improvers.columns:
+            print(f"\n{tier_col}:")
+            tier_stats = high_improvers.groupby(tier_col)['Score Difference'].agg(['count', 'mean', 'std']).round(1)
+            print(tier_stats)
 
-# Tier distribution analysis
-print(f"\nTier Distribution Analysis:")
-for tier_col in tier_columns:
-    if tier_col in high_improvers.columns:
-        print(f"\n{tier_col}:")
-        tier_stats = high_improvers.groupby(tier_col)['Score Difference'].agg(['count', 'mean', 'std']).round(1)
-        print(tier_stats)
+    print(f"\nHeat map saved as '{output_path}'")
 
-print("\nHeat map saved as 'high_improvers_heatmap.png'")
 
+if __name__ == '__main__':
+    main()
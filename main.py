@@ -1,19 +1,38 @@
 # -*- coding: utf-8 -*-
 import pandas as pd
 import streamlit as st
-from datetime import datetime, date
 import hmac
-import altair as alt
+import os
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.figure_factory as ff
-from plotly.subplots import make_subplots
-import seaborn as sns
-import matplotlib.pyplot as plt
-from scipy import stats
-from scipy.stats import pearsonr, spearmanr, kendalltau, ttest_ind
 import warnings
+from analytics_db import AnalyticsDB, default_engine
+from bootstrap import group_confidence_intervals
+from chart_data import shared_data
+from cohorts import (
+    IMPROVEMENT_COHORTS, PERFORMER_COHORTS, cohort_membership, cohort_rows, cohort_table, compare_cohorts,
+    freeze_cohorts, freeze_metrics, improvement_cohorts
+)
+from data_store import dataset_version, read_table
+from heatmap import render_heatmap
+from roster_table import RosterIndex, render_roster
+from rules import SCHOOL_CATEGORIES, evaluate_rules, rule_bits, rule_counts, rule_overlaps
+from student_charts import (
+    accuracy_chart, attendance_chart, engagement_averages, exam_scores_chart, lessons_chart,
+    load_individual_tables, participation_chart, prepare_student_engagement, question_sets_chart,
+    student_tiers, tier_badge_html
+)
+from student_features import OUTCOME_SOURCE_COLUMNS, build_outcome_table, build_student_features
+from exam_topics import ExamTopicModel
+from predictors import describe_predictor, format_p_value, test_predictors
+from progression import LEADERBOARD_LABELS, MIN_EXAMS, leaderboard, progressions, sort_tests
+from shared_store import shared_resource
+from similarity import build_similarity_index, score_outcomes
+from engagement_ingest import load_running_totals, totals_profile
+from partitions import (
+    INDIVIDUAL_TABLES, MAX_CACHED_PARTITIONS, Partition, discover_partitions, find_partition, institutions, rollup
+)
+from student_index import StudentPartitions
+from timing import RunTimer
 warnings.filterwarnings('ignore')
 
 # Configure Streamlit page
@@ -24,6 +43,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Opt-in render timing (DASHBOARD_TIMING=1 or ?timing=1); no-op otherwise
+timer = RunTimer()
+
 # Custom CSS for styling
 st.markdown("""
 <style>
@@ -239,22 +261,16 @@ BRAND_COLORS = {
     'chart_palette': ['#00B4A6', '#7C3AED', '#3b82f6', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6', '#06b6d4']
 }
 
-@st.cache_data
-def load_jfd_data():
-    """Load and prepare the JFD combined data."""
-    import os
+@timer.timed('loaders')
+@shared_resource(max_entries=MAX_CACHED_PARTITIONS)
+def load_jfd_data(file_path, data_version=None):
+    """Load and prepare the JFD combined data of one partition."""
     jfd_df = None
-    possible_files = [
-        'student-data/jfd-combined.csv',
-        './student-data/jfd-combined.csv'
-    ]
-    for file_path in possible_files:
+    if file_path is not None:
         try:
-            if os.path.exists(file_path):
-                jfd_df = pd.read_csv(file_path)
-                break
+            jfd_df = read_table(file_path)
         except Exception as e:
-            continue
+            jfd_df = None
     
     if jfd_df is not None:
         # Clean data
@@ -262,13 +278,80 @@ def load_jfd_data():
         jfd_df['exam_count'] = pd.to_numeric(jfd_df['exam_count'], errors='coerce').fillna(0).astype(int)
         
         # Fill NaN in tier columns with a placeholder for easier filtering and display
+        # (the tiers are ordered categoricals, so 'N/A' is added as the last level)
         tier_cols = ['survey_tier', 'large_group_tier', 'small_group_tier', 'class_participation_tier']
         for col in tier_cols:
              if col in jfd_df.columns:
-                jfd_df[col] = jfd_df[col].fillna('N/A')
+                jfd_df[col] = jfd_df[col].cat.add_categories('N/A').fillna('N/A')
 
     return jfd_df
 
+@timer.timed('loaders')
+@shared_resource
+def categorize_jfd_students(file_path, selected_jfd, data_version=None):
+    """Filter the JFD data to one school and tag each student with a category bitmask."""
+    jfd_df = load_jfd_data(file_path, data_version)
+
+    # Filter dataframe based on selection
+    if selected_jfd != 'All Schools':
+        filtered_jfd_df = jfd_df[jfd_df['jfd'] == selected_jfd].copy()
+    else:
+        # Shallow copy: the shared frame's columns are only copied if written
+        filtered_jfd_df = jfd_df.copy(deep=False)
+
+    # Fill NA for display and consistent filtering
+    filtered_jfd_df.fillna({'all_exams_and_scores': 'No scores reported', 'highest_exam_score': 0}, inplace=True)
+
+    filtered_jfd_df['category_mask'] = evaluate_rules(filtered_jfd_df, SCHOOL_CATEGORIES)
+    return filtered_jfd_df
+
+# Columns shown in the Students by School roster tables
+SCHOOL_ROSTER_COLUMNS = ['student_id', 'highest_exam_score', 'survey_tier', 'large_group_tier', 'small_group_tier', 'class_participation_tier', 'all_exams_and_scores']
+
+@timer.timed('loaders')
+@st.cache_resource(max_entries=16)
+def load_school_roster(file_path, selected_jfd, data_version=None):
+    """Sortable, searchable roster index for one school selection, built once per data version."""
+    return RosterIndex(categorize_jfd_students(file_path, selected_jfd, data_version), SCHOOL_ROSTER_COLUMNS)
+
+@timer.timed('loaders')
+@shared_resource(max_entries=MAX_CACHED_PARTITIONS)
+def load_individual_data(paths, data_version=None):
+    """Load the Individual Student Dashboard tables through the columnar cache.
+
+    `paths` are the partition's engagement, test, JW exam and tier files.
+    `data_version` is only used as part of the cache key so edited CSVs are picked up.
+    """
+    return load_individual_tables(paths)
+
+@timer.timed('loaders')
+@st.cache_resource(max_entries=MAX_CACHED_PARTITIONS)
+def load_individual_partitions(paths, data_version=None):
+    """Partition the individual dashboard tables by student_id.
+
+    Built once per data version and shared across reruns, so selecting a
+    student only touches that student's rows. The JW exam topic data is
+    held as a dictionary-encoded student x exam x topic model instead.
+    """
+    df_engagement, df_tests, df_sections, df_tiers = load_individual_data(paths, data_version)
+    return StudentPartitions(df_engagement), StudentPartitions(df_tests), ExamTopicModel(df_sections), StudentPartitions(df_tiers)
+
+@timer.timed('loaders')
+@shared_resource(max_entries=MAX_CACHED_PARTITIONS)
+def load_similarity_index(paths, data_version=None):
+    """Students-like-me similarity index and practice score outcomes, built once per data version."""
+    _, df_tests, _, _ = load_individual_data(paths, data_version)
+    exam_topics = load_individual_partitions(paths, data_version)[2]
+    # Engagement comes from the incrementally maintained running totals
+    engagement_totals, _ = load_running_totals(paths[0])
+    return build_similarity_index(totals_profile(engagement_totals), exam_topics), score_outcomes(df_tests)
+
+@timer.timed('loaders')
+@shared_resource
+def load_school_rollup(data_version=None):
+    """Students and exam scores per institution and cohort, reading only the score columns of each partition."""
+    return rollup(discover_partitions(), 'jfd', ['highest_exam_score', 'exam_count'])
+
 def get_chart_colors():
     """Get consistent color palette for charts"""
     return BRAND_COLORS['chart_palette']
@@ -367,44 +450,32 @@ dashboard_type = st.sidebar.radio(
     ["Individual Student Dashboard", "Students by School"]
 )
 
+# Institution / cohort partition: only the selected partition's files are read
+partitions = discover_partitions()
+institution_names = institutions(partitions)
+selected_institution = st.sidebar.selectbox("Institution:", institution_names) if len(institution_names) > 1 else next(iter(institution_names), None)
+cohort_names = [p.cohort for p in partitions if p.institution == selected_institution]
+selected_cohort = st.sidebar.selectbox("Cohort:", cohort_names, index=len(cohort_names) - 1) if len(cohort_names) > 1 else None
+partition = find_partition(partitions, selected_institution, selected_cohort) or Partition(None, None, {})
+
 if dashboard_type == "Individual Student Dashboard":
     # Original Individual Student Dashboard Code
+    timer.page(dashboard_type)
     
     ## Read data from CSV files (with error handling)
     import os
     
     # Try multiple possible paths for deployment compatibility
-    data_paths = [
-        'student-data/',          # Local development
-        './student-data/',        # Explicit relative path
-        'student_data/',          # Alternative naming
-        './student_data/',        # Alternative with explicit relative
-        ''                        # Root directory fallback
-    ]
-    
     individual_data_available = False
+    individual_paths = partition.paths(INDIVIDUAL_TABLES)
     
-    for base_path in data_paths:
+    if partition.has(INDIVIDUAL_TABLES):
         try:
-            # Test if all required files exist in this path
-            files_to_check = [
-                f'{base_path}institution-1-engagement-data.csv',
-                f'{base_path}institution-1-test-data.csv', 
-                f'{base_path}institution-1-2025-exam-data-jw-exams.csv',
-                f'{base_path}tierdata.csv'
-            ]
-            
-            # Check if all files exist
-            if all(os.path.exists(f) for f in files_to_check):
-                df_engagement_attendance = pd.read_csv(f'{base_path}institution-1-engagement-data.csv',parse_dates=['start_date','end_date'])
-                df_test_scores = pd.read_csv(f'{base_path}institution-1-test-data.csv',parse_dates=['test_date'])
-                df_test_section_scores = pd.read_csv(f'{base_path}institution-1-2025-exam-data-jw-exams.csv')
-                df_tier_data = pd.read_csv(f'{base_path}tierdata.csv')
-                individual_data_available = True
-
-                break
+            data_version = dataset_version(individual_paths)
+            engagement_partitions, test_partitions, exam_topics, tier_partitions = load_individual_partitions(individual_paths, data_version)
+            individual_data_available = True
         except Exception as e:
-            continue
+            individual_data_available = False
     
     if not individual_data_available:
         st.error(f"**Individual Student Dashboard Data Not Found**")
@@ -416,6 +487,9 @@ if dashboard_type == "Individual Student Dashboard":
         - `institution-1-2025-exam-data-jw-exams.csv`
         - `tierdata.csv`
         
+        or, per institution and cohort, `student-data/institutions/<institution>/<cohort>/` with
+        `engagement-data.csv`, `test-data.csv`, `exam-data-jw-exams.csv` and `tierdata.csv`.
+        
         **Current directory contents:**
         """)
         
@@ -443,33 +517,22 @@ if dashboard_type == "Individual Student Dashboard":
     
     if individual_data_available:
         ## Create dashboard filters
-        student_id = st.selectbox("Choose a student:", list(df_engagement_attendance['student_id'].unique()))
+        student_id = st.selectbox("Choose a student:", engagement_partitions.student_ids.tolist())
         st.write('Student Roster Listed Here')
 
         ## Transform dataframes
-        df_engagement_attendance_student_filtered = df_engagement_attendance[df_engagement_attendance['student_id'] == student_id]
-        # Create date_range column for tooltips
-        df_engagement_attendance_student_filtered['date_range'] = df_engagement_attendance_student_filtered.apply(
-            lambda row: f"{row['start_date'].strftime('%m/%d/%y')} - {row['end_date'].strftime('%m/%d/%y')}", 
-            axis=1
-        )
-        df_engagement_attendance_student_filtered['num_attended_large_session_cumsum'] = df_engagement_attendance_student_filtered['num_attended_large_session'].cumsum()
-        df_engagement_attendance_student_filtered['num_scheduled_large_session_cumsum'] = df_engagement_attendance_student_filtered['num_scheduled_large_session'].cumsum()
-        df_engagement_attendance_student_filtered['num_attended_small_session_cumsum'] = df_engagement_attendance_student_filtered['num_attended_small_session'].cumsum()
-        df_engagement_attendance_student_filtered['num_scheduled_small_session_cumsum'] = df_engagement_attendance_student_filtered['num_scheduled_small_session'].cumsum()
-        df_engagement_attendance_student_filtered['large_session'] = df_engagement_attendance_student_filtered['num_attended_large_session_cumsum'] / df_engagement_attendance_student_filtered['num_scheduled_large_session_cumsum']
-        df_engagement_attendance_student_filtered['small_session'] = df_engagement_attendance_student_filtered['num_attended_small_session_cumsum'] / df_engagement_attendance_student_filtered['num_scheduled_small_session_cumsum']
-        df_engagement_attendance_avg = df_engagement_attendance_student_filtered[['class_participation','homework_participation','cars_accuracy','sciences_accuracy','class_accuracy']].mean()
+        df_engagement_attendance_student_filtered = prepare_student_engagement(engagement_partitions.get(student_id))
+        df_engagement_attendance_avg = engagement_averages(df_engagement_attendance_student_filtered)
+        # Fields of the weekly charts only, downsampled once for all of them
+        df_engagement_chart = shared_data(df_engagement_attendance_student_filtered)
 
         class_participation = df_engagement_attendance_avg.loc['class_participation']
         homework_participation = df_engagement_attendance_avg.loc['homework_participation']
-        overall_participation = (class_participation + homework_participation) / 2
+        overall_participation = df_engagement_attendance_avg.loc['overall_participation']
 
-        df_test_scores['test_date'] = df_test_scores['test_date'].dt.date
-        df_test_scores_student_filtered = df_test_scores[df_test_scores['student_id'] == student_id]
+        df_test_scores_student_filtered = test_partitions.get(student_id)
 
-        df_test_section_scores_student_filtered = df_test_section_scores[df_test_section_scores['student_id'] == student_id]
-        df_tier_data_student_filtered = df_tier_data[df_tier_data['student_id'] == student_id]
+        df_tier_data_student_filtered = tier_partitions.get(student_id)
 
         ## Create sections and render dashboard
         st.write(' ')
@@ -479,40 +542,14 @@ if dashboard_type == "Individual Student Dashboard":
         st.write(' ')
 
         # Check if we have tier data for this student
-        if not df_tier_data_student_filtered.empty:
+        tiers = student_tiers(df_tier_data_student_filtered)
+        if tiers:
             # Create a container for consistent width
             with st.container():
-                # Create a more user-friendly display of tier data
-                tier_display = pd.DataFrame({
-                    'Assessment Category': ['Survey Completion', 'Class Attendance', 'Small Group Attendance', 'Class Participation'],
-                    'Performance Tier': [
-                        df_tier_data_student_filtered['Survey Tier'].values[0],
-                        df_tier_data_student_filtered['Large Group Tier'].values[0],
-                        df_tier_data_student_filtered['Small Group Tier'].values[0],
-                        df_tier_data_student_filtered['Class Participation Tier'].values[0]
-                    ]
-                })
-                
-                # Optional: Add a visual representation of the tiers using colored indicators
-                col1, col2, col3, col4 = st.columns(4)
-                
-                # Helper function to display tier with appropriate color
-                def display_tier(column, category, tier):
-                    colors = {
-                        'Tier 1': '#1B5E20',  # Dark green
-                        'Tier 2': '#FF9800',  # Light orange
-                        'Tier 3': '#EF5350',  # Red
-                        'Tier 4': '#EF5350'   # Red
-                    }
-                    color = colors.get(tier, '#9E9E9E')  # Default to grey if tier not recognized
+                # Display each category with its tier as a colored indicator
+                for column, (category, tier) in zip(st.columns(len(tiers)), tiers):
                     column.markdown(f"<h5 style='text-align: center'>{category}</h5>", unsafe_allow_html=True)
-                    column.markdown(f"<div style='background-color: {color}; padding: 10px; border-radius: 5px; text-align: center; color: white; font-weight: bold;'>{tier}</div>", unsafe_allow_html=True)
-                
-                # Display each category with its tier
-                display_tier(col1, 'Survey Completion', df_tier_data_student_filtered['Survey Tier'].values[0])
-                display_tier(col2, 'Class Attendance', df_tier_data_student_filtered['Large Group Tier'].values[0])
-                display_tier(col3, 'Small Group Attendance', df_tier_data_student_filtered['Small Group Tier'].values[0])
-                display_tier(col4, 'Class Participation', df_tier_data_student_filtered['Class Participation Tier'].values[0])
+                    column.markdown(tier_badge_html(tier), unsafe_allow_html=True)
             
         else:
             st.info("No tier assessment data available for this student.")
@@ -560,39 +597,11 @@ if dashboard_type == "Individual Student Dashboard":
         st.write(' ')
         st.write(' ')
 
-        point_exam_scores = alt.Chart(df_test_scores_student_filtered).mark_point().transform_fold(
-            fold=['actual_exam_score'],
-            as_=['variable','value']
-        ).encode(
-            x=alt.X(
-                'yearmonthdate(test_date):O',
-                axis=alt.Axis(
-                    labelAngle=-45,
-                    title='Test Date'
-                )
-            ),
-            y=alt.Y(
-                'value:Q',
-                axis=alt.Axis(
-                    title='Practice Exam Score'
-                ),
-                scale=alt.Scale(domain=[470, 528])
-            ),
-            tooltip=[
-                alt.Tooltip('test_date:T', title='Test Date'),
-                alt.Tooltip('value:Q', title='Exam Score')
-            ],
-            color=alt.Color(
-                'variable:N',
-                legend=alt.Legend(
-                    title='Exam Scores',
-                    orient='bottom',
-                    labelExpr="'Practice Exam Score'"
-                )
-            )
-        )
+        with timer.section('charts', 'Practice Exam Scores'):
 
-        st.altair_chart(point_exam_scores,use_container_width=True)
+            point_exam_scores = exam_scores_chart(df_test_scores_student_filtered)
+
+            st.altair_chart(point_exam_scores,use_container_width=True)
         st.write(' ')
         st.write(' ')
 
@@ -603,9 +612,9 @@ if dashboard_type == "Individual Student Dashboard":
             '"Student Accuracy" is calculated as the percentage of correctly answered questions for a given subject, '
             'based on the total number of questions attempted.'
         )
-        exam_section = st.selectbox("Choose an exam section:", list(df_test_section_scores['Exam Section'].unique()))
+        exam_section = st.selectbox("Choose an exam section:", list(exam_topics.section_names))
         st.dataframe(
-            df_test_section_scores_student_filtered[df_test_section_scores_student_filtered['Exam Section'] == exam_section][['Exam Name','Question Topic','Question Frequency','Student Accuracy']].sort_values(by='Exam Name').reset_index(drop=True),
+            exam_topics.student_topic_table(student_id, exam_section),
             use_container_width=True)
 
         st.write(' ')
@@ -617,39 +626,11 @@ if dashboard_type == "Individual Student Dashboard":
         st.write(' ')
         st.write(' ')
 
-        line_engagement = alt.Chart(df_engagement_attendance_student_filtered).mark_line(point=True).transform_fold(
-                ['completed_lessons'],
-                as_=['variable', 'value']
-            ).encode(
-                x=alt.X(
-                    'week:O',
-                    axis=alt.Axis(
-                        labelAngle=0,
-                        title='Week'
-                    )
-                ),
-                y=alt.Y(
-                    'value:Q',
-                    axis=alt.Axis(
-                        title='Completed Count',
-                    )
-                ),
-                tooltip=[
-                    alt.Tooltip('week:O', title='Week'),
-                    alt.Tooltip('date_range:N', title='Date Range'),
-                    alt.Tooltip('value:Q', title='Completed Number of Lessons')
-                ],
-                color=alt.Color(
-                    'variable:N',
-                    legend=alt.Legend(
-                        title='Type',
-                        orient='bottom',
-                        labelExpr="'Completed Course Lessons'"
-                    )
-                )
-        )
+        with timer.section('charts', 'Self-Learning Lessons'):
+
+            line_engagement = lessons_chart(df_engagement_chart)
 
-        st.altair_chart(line_engagement,use_container_width=True)
+            st.altair_chart(line_engagement,use_container_width=True)
 
         st.write(' ')
         st.write(' ')
@@ -659,28 +640,11 @@ if dashboard_type == "Individual Student Dashboard":
         st.write(' ')
         st.write(' ')
 
-        line_question_sets = alt.Chart(df_engagement_attendance_student_filtered).mark_line(point=True).encode(
-            x=alt.X(
-                'week:O',
-                axis=alt.Axis(
-                    labelAngle=0,
-                    title='Week'
-                )
-            ),
-            y=alt.Y(
-                'total_completed_passages_discrete_sets',
-                axis=alt.Axis(
-                    title='Completed Number of Question Sets'
-                )
-            ),
-            tooltip=[
-                alt.Tooltip('week:O', title='Week'),
-                alt.Tooltip('date_range:N', title='Date Range'),
-                alt.Tooltip('total_completed_passages_discrete_sets', title='Completed Count')
-            ],
-        )
+        with timer.section('charts', 'Completed Question Sets'):
 
-        st.altair_chart(line_question_sets,use_container_width=True)
+            line_question_sets = question_sets_chart(df_engagement_chart)
+
+            st.altair_chart(line_question_sets,use_container_width=True)
 
         st.header('Participation')
         st.subheader('Class and Homework Participation')
@@ -693,40 +657,11 @@ if dashboard_type == "Individual Student Dashboard":
         st.write(' ')
         st.write(' ')
 
-        line_participation = alt.Chart(df_engagement_attendance_student_filtered).mark_line(point=True).transform_fold(
-            fold=['class_participation', 'homework_participation'], 
-            as_=['variable', 'value']
-        ).encode(
-            x=alt.X(
-                'week:O',
-                axis=alt.Axis(
-                    labelAngle=0,
-                    title='Week'
-                )
-            ),
-            y=alt.Y(
-                'value:Q',
-                axis=alt.Axis(
-                    title='Participation Rate',
-                    format='%'
-                )
-            ),
-            tooltip=[
-                alt.Tooltip('week:O', title='Week'),
-                alt.Tooltip('date_range:N', title='Date Range'),
-                alt.Tooltip('value:Q', title='Participation Rate', format='0.1%')
-            ],
-            color=alt.Color(
-                'variable:N',
-                legend=alt.Legend(
-                    title='Type',
-                    orient='bottom',
-                    labelExpr="datum.value == 'class_participation' ? 'Class Participation' : 'Homework Completion'"
-                )
-            )
-        )
+        with timer.section('charts', 'Class and Homework Participation'):
 
-        st.altair_chart(line_participation,use_container_width=True)
+            line_participation = participation_chart(df_engagement_chart)
+
+            st.altair_chart(line_participation,use_container_width=True)
 
         st.write(' ')
         st.write(' ')
@@ -740,40 +675,11 @@ if dashboard_type == "Individual Student Dashboard":
         st.write(' ')
         st.write(' ')
 
-        line_engagement_accuracy = alt.Chart(df_engagement_attendance_student_filtered).mark_line(point=True).transform_fold(
-            fold=['sciences_accuracy', 'cars_accuracy','class_accuracy'], 
-            as_=['variable', 'value']
-        ).encode(
-            x=alt.X(
-                'week:O',
-                axis=alt.Axis(
-                    labelAngle=0,
-                    title='Week'
-                )
-            ),
-            y=alt.Y(
-                'value:Q',
-                axis=alt.Axis(
-                    title='Average Accuracy (%)',
-                    format='%'
-                )
-            ),
-            tooltip=[
-                alt.Tooltip('week:O', title='Week'),
-                alt.Tooltip('date_range:N', title='Date Range'),
-                alt.Tooltip('value:Q', title='Accuracy Rate', format='0.1%')
-            ],
-            color=alt.Color(
-                'variable:N',
-                legend=alt.Legend(
-                    title='Subject',
-                    orient='bottom',
-                    labelExpr="datum.value == 'cars_accuracy' ? 'CARS Questions' : datum.value == 'class_accuracy' ? 'In-Class Questions' : 'Science Questions'"
-                )
-            )
-        )
+        with timer.section('charts', 'Average Accuracy'):
+
+            line_engagement_accuracy = accuracy_chart(df_engagement_chart)
 
-        st.altair_chart(line_engagement_accuracy,use_container_width=True)
+            st.altair_chart(line_engagement_accuracy,use_container_width=True)
 
         st.write(' ')
         st.write(' ')
@@ -786,103 +692,80 @@ if dashboard_type == "Individual Student Dashboard":
         st.write(' ')
         st.write(' ')
 
-        line_attendance = alt.Chart(df_engagement_attendance_student_filtered).mark_line(point=True).transform_fold(
-            fold=['large_session','small_session'],
-            as_=['variable','value']
-        ).encode(
-            x=alt.X(
-                'week:O',
-                axis=alt.Axis(
-                    labelAngle=0,
-                    title='Week'
-                )
-            ),
-            y=alt.Y(
-                'value:Q',
-                axis=alt.Axis(
-                    title='Cumulative Attendance Rate',
-                    format='%'
-                )
-            ),
-            tooltip=[
-                alt.Tooltip('week:O', title='Week'),
-                alt.Tooltip('date_range:N', title='Date Range'),
-                alt.Tooltip('value:Q', title='Cumulative Attendance Rate', format='0.1%')
-            ],
-            color=alt.Color(
-                'variable:N',
-                legend=alt.Legend(
-                    title='Session Type',
-                    orient='bottom',
-                    labelExpr="datum.value == 'large_session' ? 'Classes with All Students' : 'Small Group Sessions'"
-                )
-            )
-        )
+        with timer.section('charts', 'Attendance'):
+
+            line_attendance = attendance_chart(df_engagement_chart)
 
-        st.altair_chart(line_attendance,use_container_width=True)
+            st.altair_chart(line_attendance,use_container_width=True)
+
+        st.write(' ')
+        st.write(' ')
+        st.header('Students Like Me')
+        st.write(
+            'Other students whose exam topic accuracy and weekly engagement were most similar to this student\'s, '
+            'and how their practice exam scores turned out. Similarity is the cosine similarity of the standardized profiles.'
+        )
+        neighbor_count = st.slider("Number of similar students:", 3, 20, 5)
+        similarity_index, score_summary = load_similarity_index(individual_paths, data_version)
+        with timer.section('transforms', 'Students Like Me'):
+            similar_students = similarity_index.neighbors(student_id, neighbor_count).join(score_summary, on='student_id')
+        similar_students['similarity'] = (similar_students['similarity'] * 100).round(1)
+        st.dataframe(
+            similar_students.rename(columns={'student_id': 'Student', 'similarity': 'Similarity (%)'}),
+            hide_index=True,
+            use_container_width=True
+        )
 
 elif dashboard_type == "Students by School":
+    timer.page(dashboard_type)
     st.header("Students by School")
 
-    jfd_df = load_jfd_data()
+    jfd_path = partition.path('jfd')
+    jfd_version = dataset_version([jfd_path])
+    jfd_df = load_jfd_data(jfd_path, jfd_version)
 
     if jfd_df is None:
         st.error("Could not load `student-data/jfd-combined.csv`. Please make sure the file is in the correct location.")
         st.stop()
 
+    if len(institution_names) > 1:
+        with st.expander("Compare institutions"):
+            rollup_version = dataset_version([p.path('jfd') for p in partitions])
+            school_rollup = load_school_rollup(rollup_version)
+            st.dataframe(
+                school_rollup.rename(columns={
+                    'institution': 'Institution', 'cohort': 'Cohort', 'students': 'Students',
+                    'highest_exam_score': 'Mean Highest Exam Score', 'exam_count': 'Mean Exams Taken'
+                }).round(1),
+                hide_index=True,
+                use_container_width=True
+            )
+
     # Create JFD dropdown filter
     jfd_list = ['All Schools'] + sorted(jfd_df['jfd'].dropna().unique().astype(int).tolist())
     selected_jfd = st.selectbox("Choose a School ID to filter students:", jfd_list)
 
-    # Filter dataframe based on selection
-    if selected_jfd != 'All Schools':
-        filtered_jfd_df = jfd_df[jfd_df['jfd'] == selected_jfd].copy()
-    else:
-        filtered_jfd_df = jfd_df.copy()
-
-
-    # Fill NA for display and consistent filtering
-    filtered_jfd_df.fillna({'all_exams_and_scores': 'No scores reported', 'highest_exam_score': 0}, inplace=True)
-    
-    # Define categories
-    categories = {
-        "Category 1: No Reported Scores": 
-            filtered_jfd_df['exam_count'] == 0,
-        
-        "Category 2: Students <502 & No Anticipated Exam Date":
-            (filtered_jfd_df['highest_exam_score'] < 502) & (filtered_jfd_df['anticipated_exam_date'].isnull()),
+    # Categorize the selected school's students (cached per selection)
+    filtered_jfd_df = categorize_jfd_students(jfd_path, selected_jfd, jfd_version)
+    category_bits = rule_bits(SCHOOL_CATEGORIES)
+    # Tables are paged server-side: only the visible rows are sent to the browser
+    school_roster = load_school_roster(jfd_path, selected_jfd, jfd_version)
 
-        "Category 3: <495 & Tier 3 Across All Metrics":
-            ((filtered_jfd_df['highest_exam_score'] < 495) &
-            (filtered_jfd_df['survey_tier'] == 'Tier 3') &
-            (filtered_jfd_df['large_group_tier'] == 'Tier 3') &
-            (filtered_jfd_df['small_group_tier'] == 'Tier 3') &
-            (filtered_jfd_df['class_participation_tier'] == 'Tier 3')),
-
-        "Category 4: <495 & Survey Tier 3":
-            (filtered_jfd_df['highest_exam_score'] < 495) & (filtered_jfd_df['survey_tier'] == 'Tier 3'),
-
-        "Category 5: 495–500 & Small Group Tier 3":
-            ((filtered_jfd_df['highest_exam_score'] >= 495) & (filtered_jfd_df['highest_exam_score'] <= 500) &
-            (filtered_jfd_df['small_group_tier'] == 'Tier 3')),
-
-        "Category 6: <495 & Large Group Tier 3":
-            (filtered_jfd_df['highest_exam_score'] < 495) & (filtered_jfd_df['large_group_tier'] == 'Tier 3')
-    }
-
-    display_cols = ['student_id', 'highest_exam_score', 'survey_tier', 'large_group_tier', 'small_group_tier', 'class_participation_tier', 'all_exams_and_scores']
-    
-    all_jfd_student_indices = set()
+    # Category counts per school, and students who fall into more than one category
+    if not filtered_jfd_df.empty:
+        with st.expander("Category Summary"):
+            st.markdown("**Students per category by School ID**")
+            st.dataframe(rule_counts(filtered_jfd_df['category_mask'], SCHOOL_CATEGORIES, by=filtered_jfd_df['jfd']))
+            overlaps = rule_overlaps(filtered_jfd_df['category_mask'], SCHOOL_CATEGORIES)
+            st.markdown("**Category overlap**")
+            if not overlaps.empty:
+                st.dataframe(overlaps, hide_index=True)
+            else:
+                st.info("No students matched any category.")
 
-    for category_name, condition in categories.items():
+    for category_name, bit in category_bits.items():
         st.subheader(category_name)
-        category_df = filtered_jfd_df[condition].copy()
-        
-        if not category_df.empty:
-            st.dataframe(category_df[display_cols])
-            all_jfd_student_indices.update(category_df.index)
-        else:
-            st.info("No students in this category.")
+        render_roster(school_roster, f'category-{bit}', category_bit=bit, empty_message="No students in this category.")
 
     # Display the complete list for the selected JFD
     if selected_jfd == 'All Schools':
@@ -892,38 +775,28 @@ elif dashboard_type == "Students by School":
         st.header(f"Complete Student List for JFD {selected_jfd}")
         st.write(f"This list includes all students for program directors {selected_jfd}, regardless of their category.")
     
-    if not filtered_jfd_df.empty:
-        st.dataframe(filtered_jfd_df[display_cols].sort_values('student_id'))
-    else:
-        st.info(f"No students found for this school {selected_jfd}.")
+    render_roster(school_roster, 'all-students', empty_message=f"No students found for this school {selected_jfd}.")
 
 else:
     # Analysis Dashboard
+    # Plotly is only needed by the analysis pages, so it is imported here to
+    # keep it off the cold-start path of the student and school dashboards
+    import plotly.express as px
     
     # Load and clean MCAT analysis data
-    @st.cache_data
-    def load_and_clean_data():
+    @timer.timed('loaders')
+    @shared_resource(max_entries=MAX_CACHED_PARTITIONS)
+    def load_and_clean_data(file_path, data_version=None):
         """Load and clean the MCAT data"""
-        # Load CSV data for tier analysis - try multiple paths for deployment compatibility
-        import os
+        # Load the selected partition's CSV data for tier analysis
         csv_df = None
         
-        # Try different possible file paths
-        possible_files = [
-            'data_outcomes_with_tiers.csv',
-            './data_outcomes_with_tiers.csv',
-            'data/data_outcomes_with_tiers.csv',
-            './data/data_outcomes_with_tiers.csv'
-        ]
-        
-        for file_path in possible_files:
+        if file_path is not None:
             try:
-                if os.path.exists(file_path):
-                    csv_df = pd.read_csv(file_path)
-                    st.session_state.csv_data_available = True
-                    break
+                csv_df = read_table(file_path)
+                st.session_state.csv_data_available = True
             except Exception as e:
-                continue
+                csv_df = None
         
         if csv_df is None:
             st.session_state.csv_data_available = False
@@ -932,28 +805,11 @@ else:
         else:
             pass
         
-        # Load data (replace with your file path or upload mechanism)
-        data = {
-            'Student_ID': [5, 88, 6, 130, 10, 22, 116, 8, 7, 60, 47, 85, 1, 112, 126, 31, 127, 16, 72, 128, 30, 87, 37, 28, 123, 32, 33, 50, 78, 139, 56, 96, 135, 107, 93, 62, 48, 95, 55, 90, 44, 108, 102, 57, 140, 91, 53, 12, 59, 68, 61, 147, 29, 34, 81, 4, 35, 41, 149, 51, 66, 67, 86, 122, 136, 99, 89, 27, 39, 71, 65, 19, 73, 121, 64, None, 43, 75, 131, 125, 84, 2, 13, 101, 15, 124, 104, 105, 49, 100, 80, 83, 11, 120, 23, 76, 94, 133, 97, 20, 3, 18, 111, 98, 137, 117, 110, 106, 114, 115, 26, 69, 63, 17, 25, 14, 36, 118, 24, 144, 52, 82, 9, 129, 138, 74, 142, 150, 132, 134, 70, 103, 113, 79, 92, 58, 145, 46, 141, 148, 77],
-            'Baseline_Score': [492, 496, 493, 500, 506, 484, 503, None, 492, 498, 494, 504, 494, 490, 495, 506, 500, 0, 0, 490, 0, 491, 496, 0, 498, 0, 490, 505, 499, 495, 510, 0, 505, 505, 497, 494, 495, 498, 497, 499, None, 497, 501, 497, 498, 495, 491, 498, 497, 493, 496, 495, 505, None, 498, 502, 506, 494, 504, 501, 489, 494, 490, 494, 498, 502, 493, 500, 498, 501, 493, 504, 503, 503, 493, None, 494, 495, 493, 494, 499, 503, None, 500, 500, 502, 494, 485, 503, 497, 491, 506, 511, 497, 493, 497, 503, 486, 494, 497, 494, 495, 498, None, None, 493, 506, 491, 492, 487, 496, 495, None, 508, 491, 503, 495, 488, 491, 491, 497, 495, 498, 501, 491, 501, 490, 502, 498, None, 487, 493, 492, 504, 502, 495, 495, 493, 504, 491, 491],
-            'Number_of_Practice_Exams': [4, 1, None, 3, 2, None, 1, 1, 3, 3, 1, 7, 1, 3, None, 3, 2, 2, 1, None, 1, 6, None, None, 1, None, 1, None, 4, 5, None, None, 5, None, 4, 1, 2, 1, None, 6, 1, 6, 1, 3, 6, 5, 3, 1, 4, None, 3, 1, 1, 1, 1, 4, 3, 2, 2, 2, 1, None, 2, 6, 5, 1, 2, 2, 12, 9, 5, 1, 3, 5, 4, None, 4, 1, 10, 5, None, 1, 1, 6, None, 5, None, 2, 6, 1, None, 6, 2, 5, 4, None, 2, 3, None, 3, 4, 2, 6, None, 1, 2, 2, 5, 4, 5, 2, 1, 3, 4, 1, 2, 2, 4, 1, 3, 5, 5, 2, 6, 9, 2, None, 1, None, 3, 7, 2, 1, 3, 4, 1, 1, 5, None, None, None],
-            'Most_Recent_Practice_Exam': [493, 496, None, 513, 506, None, 503, None, 493, 500, 494, 506, 494, 491, None, 506, 501, None, 409, None, 498, 494, None, None, 500, None, 490, None, 493, 505, None, None, 513, None, 497, 494, 490, 498, None, 495, 500, 499, 501, 497, 499, 496, 492, 498, 496, None, 494, 495, 505, None, 498, 499, 518, 497, 502, 501, 489, None, 490, 509, 499, 500, 493, 507, 511, 504, 518, 504, 502, 509, 502, None, 494, 495, 497, 500, None, 503, None, 502, None, 500, None, 485, 516, 497, None, 517, 509, 506, 496, None, 503, 501, None, 499, 491, 503, 517, None, 503, 493, 511, 494, 485, 496, 497, 487, 508, 491, 507, 501, 488, 484, 495, 502, 497, 506, 499, 489, 501, 481, 513, 498, None, 487, None, 492, 519, 506, 495, 497, 494, 499, 491, 494, None],
-            'Actual_MCAT': [499, 501, 488, None, 514, 508, 506, None, 487, 510, 493, 509, 493, 478, 501, None, 508, None, None, None, 502, 497, 494, 485, 495, 508, None, None, None, 500, None, None, None, None, 496, None, 488, 493, None, 504, None, 502, 496, None, None, 492, 490, 491, 493, 498, 492, 478, 515, 490, 495, None, 525, 502, 488, 495, 506, 481, None, 509, None, None, 497, 487, 504, None, 491, None, 498, 510, None, 497, 489, 497, 506, 505, 491, None, None, 495, 491, 496, None, 485, None, 501, 496, 518, 517, None, None, 495, None, 501, 495, None, None, 485, None, 496, None, 506, 494, None, 482, 486, 487, 494, None, None, 496, 484, None, None, 480, 493, 483, 501, None, 508, None, 492, None, 482, 516, 490, 487, 481, 483, 495, None, None, 494, 496, 495, 508, 493],
-            'Score_Difference': [None, 5, 0, 13, 8, 29, 8, 0, 0, 17, -1, 10, 4, -7, 11, 0, 13, None, None, None, 4, 11, 3, None, 2, None, 0, None, -1, 10, None, None, 13, None, 4, 5, -2, 0, 0, 10, None, 10, 0, 0, 1, 2, 4, -2, 1, 10, 1, -12, 15, None, 2, -3, 24, 13, -16, -6, 22, -8, 0, 20, 6, 3, 4, -8, 11, 8, -2, 0, 0, 7, 9, None, 5, 5, 13, 16, -3, 5, None, 0, -4, -6, 0, 0, 13, 9, 5, 17, 6, 14, 8, 3, 0, 0, 6, 7, -9, 8, -2, 0, 3, 6, 10, -4, -1, 5, 3, 7, None, -12, -2, 9, 6, -3, 7, -3, 9, 7, 15, 3, 3, 5, 1, 19, -8, None, -6, -5, 8, 20, 9, 4, -1, 7, 9, 7, 7],
-            'Total_Completed_Passages_Discrete_Sets': [45, 23, None, 67, 34, None, 12, 18, 56, 78, 29, 89, 15, 44, None, 52, 31, 28, 19, None, 25, 73, None, None, 22, None, 17, None, 63, 85, None, None, 76, None, 58, 26, 39, 21, None, 82, 14, 91, 33, 49, 88, 67, 41, 16, 55, None, 46, 24, 18, 30, 27, 61, 48, 35, 42, 38, 20, None, 37, 79, 84, 23, 44, 36, 95, 102, 71, 19, 51, 68, 59, None, 62, 28, 87, 74, None, 25, 32, 83, None, 69, None, 40, 86, 22, None, 92, 47, 77, 53, None, 43, 50, None, 56, 66, 31, 89, None, 18, 45, 38, 72, 61, 78, 29, 16, 54, 65, 24, 41, 33, 57, 26, 49, 81, 75, 35, 88, 96, 42, None, 27, None, 52, 93, 46, 23, 58, 70, 19, 36, 64, None, None, None]
-        }
-        
-        # Ensure all arrays have the same length by standardizing to 141 elements
-        max_length = 141
-        for key, values in data.items():
-            if len(values) < max_length:
-                # Pad with None values
-                data[key] = values + [None] * (max_length - len(values))
-            elif len(values) > max_length:
-                # Truncate to max_length
-                data[key] = values[:max_length]
-        
-        df = pd.DataFrame(data)
+        # Derive the per-student outcome table from the weekly CSV
+        if csv_df is not None:
+            df = build_outcome_table(csv_df)
+        else:
+            df = pd.DataFrame(columns=['Student_ID'] + list(OUTCOME_SOURCE_COLUMNS.values()) + ['Total_Completed_Passages_Discrete_Sets'], dtype=float)
         
         # Clean data
         # Replace 0 values in baseline scores with NaN (these seem to be missing data)
@@ -963,13 +819,8 @@ else:
         df['Practice_Improvement'] = df['Most_Recent_Practice_Exam'] - df['Baseline_Score']
         df['Had_Practice_Exams'] = df['Number_of_Practice_Exams'].notna() & (df['Number_of_Practice_Exams'] > 0)
         
-        # Calculate total completed passages/discrete sets per student
-        # Group by Student_ID and sum the Total_Completed_Passages_Discrete_Sets
-        student_totals = df.groupby('Student_ID')['Total_Completed_Passages_Discrete_Sets'].sum().reset_index()
-        student_totals.rename(columns={'Total_Completed_Passages_Discrete_Sets': 'Total_Completed_Sum'}, inplace=True)
-        
-        # Merge back to main dataframe
-        df = df.merge(student_totals, on='Student_ID', how='left')
+        # Total completed passages/discrete sets per student (the table is already one row per student)
+        df['Total_Completed_Sum'] = df['Total_Completed_Passages_Discrete_Sets'].fillna(0)
         
         # Categorize number of practice exams
         df['Practice_Category'] = pd.cut(df['Number_of_Practice_Exams'], 
@@ -980,14 +831,101 @@ else:
         return df, csv_df
 
 
+    @timer.timed('loaders')
+    @shared_resource(max_entries=MAX_CACHED_PARTITIONS)
+    def load_student_features(file_path, data_version=None):
+        """Per-student feature table shared by the analysis pages (None without the CSV)."""
+        df, csv_df = load_and_clean_data(file_path, data_version)
+        if csv_df is None:
+            return None
+        return build_student_features(df, csv_df)
+
+    @timer.timed('loaders')
+    @shared_resource(max_entries=MAX_CACHED_PARTITIONS)
+    def load_insights_data(file_path, data_version=None):
+        """Student features for Key Actionable Insights, with the >5 point improvement outcome."""
+        student_features = load_student_features(file_path, data_version)
+        if student_features is None:
+            return None
+        analysis_data = student_features.drop(columns=['class_participation']).rename(
+            columns={'class_participation_rate': 'class_participation'}
+        ).dropna(subset=['Score_Difference'])
+        improvement = cohort_membership(analysis_data, IMPROVEMENT_COHORTS)
+        analysis_data['high_improvement'] = improvement.iloc[:, 0].astype(int)
+        return analysis_data
+
+    @timer.timed('loaders')
+    @shared_resource(max_entries=MAX_CACHED_PARTITIONS)
+    def load_predictor_results(file_path, data_version=None):
+        """Ranked predictor tests and per-tier success rates, computed once per data version."""
+        return test_predictors(load_insights_data(file_path, data_version), 'high_improvement')
+
+    @timer.timed('loaders')
+    @shared_resource(max_entries=MAX_CACHED_PARTITIONS)
+    def load_tier_intervals(file_path, data_version=None):
+        """95% bootstrap CIs for success rate and score change in every tier, once per data version."""
+        analysis_data = load_insights_data(file_path, data_version)
+        return group_confidence_intervals(
+            analysis_data.assign(success_rate=analysis_data['high_improvement'] * 100),
+            ['Small Group Tier', 'Class Participation Tier', 'Large Group Tier', 'Survey Tier'],
+            ['success_rate', 'Score_Difference']
+        )
+
+
+    @timer.timed('loaders')
+    @shared_resource(max_entries=MAX_CACHED_PARTITIONS)
+    def load_sorted_tests(file_path, data_version=None):
+        """Practice exam rows sorted once by student and test date."""
+        return sort_tests(read_table(file_path, parse_dates=['test_date']))
+
+    @timer.timed('loaders')
+    @st.cache_resource(max_entries=MAX_CACHED_PARTITIONS)
+    def load_progression_roster(file_path, data_version=None):
+        """Sortable progression leaderboard (rank 1 = featured student), built once per data version."""
+        board = leaderboard(progressions(load_sorted_tests(file_path, data_version)))
+        board.insert(0, 'rank', np.arange(1, len(board) + 1))
+        board['slope'] = board['slope'].round(2)
+        return RosterIndex(board, ['rank'] + list(LEADERBOARD_LABELS), search_columns=['student_id'],
+                           labels=dict(LEADERBOARD_LABELS, rank='Rank'))
+
+    @timer.timed('loaders')
+    @shared_resource(max_entries=32)
+    def load_cohort_comparison(file_path, table, cohort_spec, metrics, reference=None, data_version=None):
+        """compare_cohorts over the outcome rows ('outcomes') or per-student features ('features').
+
+        Cached per frozen cohort spec and metrics, so redefining a cohort only
+        recomputes that one comparison.
+        """
+        if table == 'outcomes':
+            data = load_and_clean_data(file_path, data_version)[0].dropna(subset=['Student_ID'])
+        else:
+            data = load_student_features(file_path, data_version)
+        return compare_cohorts(data, dict(cohort_spec), list(metrics), reference)
+
+
+    @timer.timed('loaders')
+    @st.cache_resource(max_entries=MAX_CACHED_PARTITIONS)
+    def load_analytics_db(file_path, data_version=None):
+        """Embedded DuckDB/SQLite database over the weekly outcomes, built once per data version."""
+        return AnalyticsDB(file_path)
+
+
     # Load data
-    df, csv_df = load_and_clean_data()
+    outcomes_path = partition.path('outcomes')
+    outcomes_version = dataset_version([outcomes_path])
+    df, csv_df = load_and_clean_data(outcomes_path, outcomes_version)
     
     # Analysis Type Selection
     analysis_type = st.sidebar.radio(
         "Choose Analysis Type:",
         ["Key Actionable Insights", "Exam Analysis", "Question Bank Analytics", "Attendance Analysis", "Performer Analysis"]
     )
+    timer.page(analysis_type)
+    use_sql_backend = st.sidebar.toggle(
+        f"Aggregate with {'DuckDB' if default_engine() == 'duckdb' else 'SQLite'}",
+        value=False,
+        help="Run the attendance tier pivots and tier means as SQL queries in an embedded database instead of pandas."
+    )
     
     if analysis_type == "Key Actionable Insights":
         st.header("Key Actionable Insights")
@@ -1031,83 +969,57 @@ else:
         
         # Load and prepare data for statistical analysis
         if csv_df is not None:
-            # Process data same as in the analysis
-            student_data = csv_df.groupby('student_id').agg({
-                'class_accuracy': 'mean',
-                'class_participation': lambda x: (x > 0).sum() / len(x) * 100,
-                'num_attended_large_session': 'sum',
-                'num_scheduled_large_session': 'sum', 
-                'num_attended_small_session': 'sum',
-                'num_scheduled_small_session': 'sum',
-                'total_completed_passages_discrete_sets': 'sum',
-                'completed_lessons': 'sum',
-                'homework_participation': 'mean',
-                'Small Group Tier': 'first',
-                'Large Group Tier': 'first',
-                'Class Participation Tier': 'first'
-            }).reset_index()
-            
-            student_data['large_attendance_rate'] = student_data['num_attended_large_session'] / student_data['num_scheduled_large_session'] * 100
-            student_data['small_attendance_rate'] = student_data['num_attended_small_session'] / student_data['num_scheduled_small_session'] * 100
-            
-            # Merge with main data
-            analysis_data = df[['Student_ID', 'Baseline_Score', 'Number_of_Practice_Exams', 'Score_Difference', 'Total_Completed_Passages_Discrete_Sets']].merge(
-                student_data, left_on='Student_ID', right_on='student_id', how='inner'
-            ).dropna(subset=['Score_Difference'])
-            
-            analysis_data['high_improvement'] = (analysis_data['Score_Difference'] > 5).astype(int)
+            # Per-student features (weekly data rolled up and joined to outcomes)
+            analysis_data = load_insights_data(outcomes_path, outcomes_version)
+            predictor_results, tier_rates = load_predictor_results(outcomes_path, outcomes_version)
+            tier_intervals = load_tier_intervals(outcomes_path, outcomes_version)
+            success_intervals = tier_intervals[tier_intervals['metric'] == 'success_rate']
             
             high_improvement_count = analysis_data['high_improvement'].sum()
             low_improvement_count = len(analysis_data) - high_improvement_count
             
             # Sample size info
-            st.info(f"**Analysis Sample:** {len(analysis_data)} students | **Improvement (>5 pts):** {high_improvement_count} students ({high_improvement_count/len(analysis_data)*100:.1f}%) | **Lower, No, or Negative Score Change (≤5 pts):** {low_improvement_count} students ({low_improvement_count/len(analysis_data)*100:.1f}%)")
+            improved_label, other_label = IMPROVEMENT_COHORTS
+            st.info(f"**Analysis Sample:** {len(analysis_data)} students | **{improved_label}:** {high_improvement_count} students ({high_improvement_count/len(analysis_data)*100:.1f}%) | **{other_label}:** {low_improvement_count} students ({low_improvement_count/len(analysis_data)*100:.1f}%)")
             
-            # Key findings summary
+            # Key findings summary, ranked live from the loaded cohort
             st.markdown("### Top 5 Statistically Significant Predictors")
             
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                st.markdown("""
-                **1. • Small Group Attendance Tier** *(p = 0.0001)*
-                - **Tier 1:** 57.9% success rate (22/38 students)
-                - **Tier 2:** 87.5% success rate (7/8 students) 
-                - **Tier 3:** 27.3% success rate (21/77 students)
-                - **Impact:** 2.7x higher success rate for top tier
-                
-                **2. • Number of Practice Exams** *(p = 0.0145)*
-                - **Improvement:** 3.87 exams average
-                - **Lower, No, or Negative Score Change:** 2.80 exams average
-                - **Impact:** +1.06 more practice exams for success
-                
-                **3. • Question Bank Usage** *(p = 0.0161)*
-                - **Improvement:** 57.4 sets completed
-                - **Lower, No, or Negative Score Change:** 46.0 sets completed
-                - **Impact:** +11.4 more sets for success
+                top_predictors = predictor_results[predictor_results['p_value'] < 0.05].head(5)
+                if top_predictors.empty:
+                    st.info("No predictor reaches p < 0.05 for the current cohort.")
+                st.markdown('\n\n'.join(
+                    describe_predictor(rank, result, tier_rates)
+                    for rank, (_, result) in enumerate(top_predictors.iterrows(), start=1)
+                ))
                 
-                **4. • Class Participation Tier** *(p = 0.0230)*
-                - **Tier 1:** 68.4% success rate (13/19 students)
-                - **Tier 3:** 35.0% success rate (35/100 students)
-                - **Impact:** 1.9x higher success rate for top tier
-                
-                **5. • Total Weekly Question Sets** *(p = 0.0278)*
-                - **Improvement:** 214.4 total sets
-                - **Lower, No, or Negative Score Change:** 170.2 total sets
-                - **Impact:** +44.1 more total sets for success
-                """)
+                with st.expander("All tested predictors"):
+                    st.dataframe(
+                        predictor_results[['label', 'test', 'statistic', 'p_value', 'mannwhitney_p', 'n', 'success_mean', 'other_mean']].rename(columns={
+                            'label': 'Predictor', 'test': 'Test', 'statistic': 'Statistic', 'p_value': 'p-value',
+                            'mannwhitney_p': 'Mann-Whitney p', 'n': 'Students',
+                            'success_mean': 'Improvement Mean', 'other_mean': 'Other Mean'
+                        }),
+                        hide_index=True,
+                        use_container_width=True
+                    )
             
             with col2:
                 st.markdown("### Success Rates by Tier")
                 
                 # Small Group Tier visualization
-                small_group_success = [57.9, 87.5, 27.3]
+                small_group_rates = success_intervals[success_intervals['feature'] == 'Small Group Tier']
                 fig_small = px.bar(
-                    x=['Tier 1', 'Tier 2', 'Tier 3'],
-                    y=small_group_success,
+                    x=small_group_rates['tier'],
+                    y=small_group_rates['estimate'],
+                    error_y=small_group_rates['ci_high'] - small_group_rates['estimate'],
+                    error_y_minus=small_group_rates['estimate'] - small_group_rates['ci_low'],
                     title='Small Group Attendance',
                     labels={'x': 'Attendance Tier', 'y': 'Success Rate (%)'},
-                    text=[f'{rate:.1f}%' for rate in small_group_success]
+                    text=[f'{rate:.1f}%' for rate in small_group_rates['estimate']]
                 )
                 fig_small.update_traces(
                     textposition='outside', 
@@ -1116,16 +1028,19 @@ else:
                 )
                 fig_small.update_layout(showlegend=False, height=300)
                 fig_small = apply_light_mode_styling(fig_small)
-                st.plotly_chart(fig_small, use_container_width=True)
+                with timer.section('charts', 'Small Group Tier success rates'):
+                    st.plotly_chart(fig_small, use_container_width=True)
                 
                 # Class Participation Tier visualization
-                participation_success = [68.4, 50.0, 35.0]
+                participation_rates = success_intervals[success_intervals['feature'] == 'Class Participation Tier']
                 fig_participation = px.bar(
-                    x=['Tier 1', 'Tier 2', 'Tier 3'],
-                    y=participation_success,
+                    x=participation_rates['tier'],
+                    y=participation_rates['estimate'],
+                    error_y=participation_rates['ci_high'] - participation_rates['estimate'],
+                    error_y_minus=participation_rates['estimate'] - participation_rates['ci_low'],
                     title='Class Participation',
                     labels={'x': 'Participation Tier', 'y': 'Success Rate (%)'},
-                    text=[f'{rate:.1f}%' for rate in participation_success]
+                    text=[f'{rate:.1f}%' for rate in participation_rates['estimate']]
                 )
                 fig_participation.update_traces(
                     textposition='outside', 
@@ -1134,7 +1049,19 @@ else:
                 )
                 fig_participation.update_layout(showlegend=False, height=300)
                 fig_participation = apply_light_mode_styling(fig_participation)
-                st.plotly_chart(fig_participation, use_container_width=True)
+                with timer.section('charts', 'Class Participation Tier success rates'):
+                    st.plotly_chart(fig_participation, use_container_width=True)
+                
+                st.caption("Error bars are 95% bootstrap confidence intervals (5,000 resamples); small tiers have wide intervals.")
+                with st.expander("Confidence intervals for every tier"):
+                    st.dataframe(
+                        tier_intervals.rename(columns={
+                            'feature': 'Tier Column', 'tier': 'Tier', 'metric': 'Metric', 'estimate': 'Estimate',
+                            'ci_low': 'CI Low', 'ci_high': 'CI High', 'n': 'Students'
+                        }).replace({'Metric': {'success_rate': 'Success Rate (%)', 'Score_Difference': 'Score Change'}}),
+                        hide_index=True,
+                        use_container_width=True
+                    )
             
             # Key actionable insights
             st.markdown("### Key Actionable Insights")
@@ -1166,50 +1093,23 @@ else:
                 - Engagement beats initial ability
                 """)
             
-            # Explanation of Question Bank Usage vs Total Weekly Question Sets
-            st.markdown("---")
-            st.markdown("### Understanding Question Bank Metrics")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("""
-                #### 📊 Question Bank Usage (57.4 sets)
+            # Question Bank Usage, from the same live predictor results
+            qbank_result = predictor_results[predictor_results['feature'] == 'total_completed_passages_discrete_sets']
+            if not qbank_result.empty:
+                qbank_result = qbank_result.iloc[0]
+                st.markdown("---")
+                st.markdown("### Understanding Question Bank Metrics")
+                st.markdown(f"""
+                #### 📊 Question Bank Usage ({qbank_result['success_mean']:.1f} sets)
                 **Weekly Engagement Data (CSV)**
                 - **Calculation:** Sum of weekly question sets per student from detailed weekly tracking
                 - **Data source:** CSV file with weekly records (`total_completed_passages_discrete_sets` per week)
-                - **High performers:** 57.4 total sets per student
-                - **Low performers:** 46.0 total sets per student
-                - **Impact:** +11.4 more sets for success
-                - **Statistical significance:** p = 0.0161
-                
-                **Higher predictive power**
+                - **High performers:** {qbank_result['success_mean']:.1f} total sets per student
+                - **Low performers:** {qbank_result['other_mean']:.1f} total sets per student
+                - **Impact:** {qbank_result['difference']:+.1f} more sets for success
+                - **Statistical significance:** {format_p_value(qbank_result['p_value'])} (Welch's t-test), {format_p_value(qbank_result['mannwhitney_p'])} (Mann-Whitney)
                 """)
             
-            with col2:
-                st.markdown("""
-                #### 📈 Total Weekly Question Sets (214.4 sets)
-                **Alternative Data Source**
-                - **Calculation:** Sum per student from main dataset
-                - **Data source:** Main dataset (`Total_Completed_Passages_Discrete_Sets`)
-                - **High performers:** 214.4 total sets per student
-                - **Low performers:** 170.2 total sets per student
-                - **Impact:** +44.1 more total sets for success
-                - **Statistical significance:** p = 0.0278
-                
-                **Lower predictive power**
-                """)
-            
-            st.info("""
-            **Key Insight:** Both metrics sum all question sets completed by each student, but from different data collection systems.
-            
-            The **Question Bank Usage** (57.4) comes from detailed weekly tracking records, while **Total Weekly Question Sets** (214.4) comes from a different data source in the main dataset. 
-            
-            The weekly tracking data shows lower totals but higher statistical significance (p = 0.0161 vs p = 0.0278), suggesting it may be more accurate for predicting MCAT success.
-            
-            **Recommendation:** The weekly tracking data (57.4 range) appears to be the more reliable predictor of MCAT improvement.
-            """)
-            
         else:
             st.error("**Data not available for insights analysis**")
             st.info("**Troubleshooting:** The Key Actionable Insights require the `data_outcomes_with_tiers.csv` file with detailed engagement data.")
@@ -1271,10 +1171,22 @@ else:
                 x='Practice_Exams',
                 y='Score_Improvement',
                 title='Score Improvement vs Number of Practice Exams',
-                trendline='ols',
                 color_discrete_sequence=[BRAND_COLORS['primary']]
             )
             
+            # Least-squares trendline with NumPy (trendline='ols' would import statsmodels)
+            if eff_df['Practice_Exams'].nunique() > 1:
+                slope, intercept = np.polyfit(eff_df['Practice_Exams'], eff_df['Score_Improvement'], 1)
+                x_range = np.array([eff_df['Practice_Exams'].min(), eff_df['Practice_Exams'].max()])
+                fig_effectiveness.add_scatter(
+                    x=x_range,
+                    y=slope * x_range + intercept,
+                    mode='lines',
+                    showlegend=False,
+                    line=dict(color=BRAND_COLORS['primary']),
+                    hovertemplate=f'Score_Improvement = {slope:.2f} * Practice_Exams + {intercept:.2f}<extra>OLS trendline</extra>'
+                )
+            
             # Set y-axis to start at 0 and find max value
             max_improvement = eff_df['Score_Improvement'].max()
             
@@ -1296,7 +1208,8 @@ else:
             )
             
             fig_effectiveness = apply_light_mode_styling(fig_effectiveness)
-            st.plotly_chart(fig_effectiveness, use_container_width=True)
+            with timer.section('charts', 'Practice Exam Effectiveness'):
+                st.plotly_chart(fig_effectiveness, use_container_width=True)
         
         # Score Growth Ranges Analysis
         st.markdown("---")
@@ -1370,7 +1283,8 @@ else:
             )
             
             fig_growth = apply_light_mode_styling(fig_growth)
-            st.plotly_chart(fig_growth, use_container_width=True)
+            with timer.section('charts', 'High Score Growth'):
+                st.plotly_chart(fig_growth, use_container_width=True)
             
             # Breakdown by score ranges
             col1, col2, col3 = st.columns(3)
@@ -1440,53 +1354,37 @@ else:
         
         # Load individual test data
         try:
-            test_data_paths = [
-                'student-data/institution-1-test-data.csv',
-                './student-data/institution-1-test-data.csv',
-                'institution-1-test-data.csv'
-            ]
-            
             test_df = None
-            for path in test_data_paths:
+            test_path = partition.path('tests')
+            if test_path is not None:
                 try:
-                    if os.path.exists(path):
-                        test_df = pd.read_csv(path, parse_dates=['test_date'])
-                        break
+                    test_df = load_sorted_tests(test_path, dataset_version([test_path]))
                 except:
-                    continue
+                    test_df = None
             
             if test_df is not None:
-                # Look for a specific student with good progression
-                # Select a student with multiple exams and clear improvement pattern
-                student_exam_counts = test_df.groupby('student_id').size()
-                students_with_multiple_exams = student_exam_counts[student_exam_counts >= 4].index
-                
-                # Try to find a student with strong improvement
-                for target_id in students_with_multiple_exams:
-                    student_data = test_df[test_df['student_id'] == target_id].sort_values('test_date')
-                    if len(student_data) >= 4:
-                        first_score = student_data['actual_exam_score'].iloc[0]
-                        last_score = student_data['actual_exam_score'].iloc[-1]
-                        if last_score - first_score >= 10:  # Good improvement
-                            featured_student_id = target_id
-                            break
-                else:
-                    # Fallback to any student with multiple exams
-                    featured_student_id = students_with_multiple_exams[0] if len(students_with_multiple_exams) > 0 else None
+                # The featured student is the top of the progression leaderboard:
+                # the largest first-to-last improvement among students with 4+ exams
+                progression_board = load_progression_roster(test_path, dataset_version([test_path]))
+                featured = progression_board.frame.iloc[0] if len(progression_board) > 0 else None
+                # Only feature a student who actually improved
+                if featured is not None and not featured['improvement'] > 0:
+                    featured = None
                 
-                if featured_student_id is not None:
-                    # Get this student's test data
-                    student_test_data = test_df[test_df['student_id'] == featured_student_id].sort_values('test_date')
+                if featured is not None:
+                    featured_student_id = progression_board.frame['student_id'].iloc[0]
+                    # Get this student's test data (rows are already sorted by student and date)
+                    student_test_data = test_df[test_df['student_id'] == featured_student_id]
                     
                     # Get additional info from main dataset
                     student_info = df[df['Student_ID'] == featured_student_id]
                     baseline_score = student_info['Baseline_Score'].iloc[0] if len(student_info) > 0 else None
                     
                     # Calculate key metrics
-                    first_score = student_test_data['actual_exam_score'].iloc[0]
-                    last_score = student_test_data['actual_exam_score'].iloc[-1]
-                    total_improvement = last_score - first_score
-                    num_exams = len(student_test_data)
+                    first_score = featured['first_score']
+                    last_score = featured['last_score']
+                    total_improvement = featured['improvement']
+                    num_exams = int(featured['exams'])
                     
                     # Display metrics
                     col1, col2, col3, col4 = st.columns(4)
@@ -1497,7 +1395,7 @@ else:
                     with col3:
                         st.metric("Final Score", f"{last_score:.0f}")
                     with col4:
-                        st.metric("Improvement", f"+{total_improvement:.0f} pts")
+                        st.metric("Improvement", f"{total_improvement:+.0f} pts")
                     
                     # Create progression chart
                     fig_progression = px.line(
@@ -1519,7 +1417,7 @@ else:
                     )
                     
                     # Add reference lines if available
-                    if baseline_score is not None:
+                    if baseline_score is not None and pd.notna(baseline_score):
                         fig_progression.add_hline(
                             y=baseline_score,
                             line_dash="dash",
@@ -1548,7 +1446,8 @@ else:
                     )
                     
                     fig_progression = apply_light_mode_styling(fig_progression)
-                    st.plotly_chart(fig_progression, use_container_width=True)
+                    with timer.section('charts', 'Student Progression'):
+                        st.plotly_chart(fig_progression, use_container_width=True)
                     
                     # Analysis summary
                     improvement_per_exam = total_improvement / (num_exams - 1) if num_exams > 1 else 0
@@ -1570,6 +1469,11 @@ else:
                     progress_table.columns = ['Date', 'Exam', 'Score', 'Change']
                     
                     st.dataframe(progress_table, use_container_width=True, hide_index=True)
+                    
+                    # Every student's progression, ranked the same way
+                    st.markdown("#### 🏆 Score Progression Leaderboard")
+                    st.markdown(f"*Students with at least {MIN_EXAMS} scored practice exams, ranked by improvement from first to last exam*")
+                    render_roster(progression_board, 'progression-leaderboard', default_page_size=25)
                 
                 else:
                     st.warning("No suitable student found for score progression analysis.")
@@ -1683,53 +1587,44 @@ else:
         qbank_data = df[['Score_Difference', 'Total_Completed_Sum', 'Student_ID']].dropna()
         
         if len(qbank_data) > 0:
-            # Group students by score improvement
-            high_improvement = qbank_data[qbank_data['Score_Difference'] > 8]
-            low_improvement = qbank_data[qbank_data['Score_Difference'] < 7]
+            # Group students by score improvement (cutoffs adjustable; each pair is cached)
+            with st.expander("Group definitions"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    high_cutoff = st.number_input("High improvement: more than (pts)", value=8.0, step=1.0)
+                with col2:
+                    low_cutoff = st.number_input("Low improvement: fewer than (pts)", value=7.0, step=1.0)
+            qbank_cohorts = improvement_cohorts(high_cutoff, low_cutoff)
+            high_label, low_label = qbank_cohorts
+            comparison = load_cohort_comparison(
+                outcomes_path, 'outcomes', freeze_cohorts(qbank_cohorts), ('Total_Completed_Sum',), low_label, outcomes_version
+            ).set_index('cohort')
+            high_stats = comparison.loc[high_label]
+            low_stats = comparison.loc[low_label]
             
             # Calculate statistics for comparison visualization
-            if len(high_improvement) > 0 and len(low_improvement) > 0:
-                high_avg = high_improvement['Total_Completed_Sum'].mean()
-                low_avg = low_improvement['Total_Completed_Sum'].mean()
-                avg_difference = high_avg - low_avg
-                
-                # Perform t-test
-                t_stat, p_value = ttest_ind(high_improvement['Total_Completed_Sum'], low_improvement['Total_Completed_Sum'])
+            if high_stats['size'] > 0 and low_stats['size'] > 0:
+                avg_difference = high_stats['difference']
                 
                 st.subheader("Comparison: High vs Low Score Improvement")
                 
                 st.info("High improvement students completed significantly more amount of questions from the JW Question Bank than scholars that demonstrated lower, negative, or no improvement.")
             
-            # Display key statistics
-            if avg_difference > 0:
-                st.info(f"High improvement students completed {avg_difference:.1f} more passages/sets on average")
-            elif avg_difference < 0:
-                st.info(f"Low improvement students completed {abs(avg_difference):.1f} more passages/sets on average")
-            else:
-                st.info("Both groups completed similar amounts of question bank content")
-            
-            # Comparison visualization
-            if len(high_improvement) > 0 and len(low_improvement) > 0:
-                st.subheader("Comparison Visualization")
-                
-                # Create comparison data for plotting
-                comparison_data = []
-                
-                for _, row in high_improvement.iterrows():
-                    comparison_data.append({
-                        'Total_Completed': row['Total_Completed_Sum'],
-                        'Group': 'High Improvement (>8 pts)',
-                        'Score_Difference': row['Score_Difference']
-                    })
+                # Display key statistics
+                if avg_difference > 0:
+                    st.info(f"High improvement students completed {avg_difference:.1f} more passages/sets on average")
+                elif avg_difference < 0:
+                    st.info(f"Low improvement students completed {abs(avg_difference):.1f} more passages/sets on average")
+                else:
+                    st.info("Both groups completed similar amounts of question bank content")
                 
-                for _, row in low_improvement.iterrows():
-                    comparison_data.append({
-                        'Total_Completed': row['Total_Completed_Sum'],
-                        'Group': 'Low Improvement (<7 pts)',
-                        'Score_Difference': row['Score_Difference']
-                    })
+                # Comparison visualization
+                st.subheader("Comparison Visualization")
                 
-                comparison_df = pd.DataFrame(comparison_data)
+                # Member rows of both groups for plotting
+                comparison_df = cohort_rows(
+                    qbank_data, qbank_cohorts, ['Total_Completed_Sum', 'Score_Difference'], label='Group'
+                ).rename(columns={'Total_Completed_Sum': 'Total_Completed'})
                 
                 # Box plot comparison
                 fig_box = px.box(
@@ -1743,44 +1638,40 @@ else:
                     },
                     color='Group',
                     color_discrete_map={
-                        'High Improvement (>8 pts)': BRAND_COLORS['success'],
-                        'Low Improvement (<7 pts)': BRAND_COLORS['error']
+                        high_label: BRAND_COLORS['success'],
+                        low_label: BRAND_COLORS['error']
                     }
                 )
                 fig_box = apply_light_mode_styling(fig_box)
-                st.plotly_chart(fig_box, use_container_width=True)
+                with timer.section('charts', 'Question Bank box plot'):
+                    st.plotly_chart(fig_box, use_container_width=True)
                 
                 # Statistical comparison
                 st.subheader("Statistical Comparison")
                 
-                # Calculate statistics
-                if len(high_improvement) > 0 and len(low_improvement) > 0:
-                    high_median = high_improvement['Total_Completed_Sum'].median()
-                    low_median = low_improvement['Total_Completed_Sum'].median()
-                    avg_difference = high_avg - low_avg
-                    median_difference = high_median - low_median
-                    
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.metric(
-                            "Average Difference", 
-                            f"{avg_difference:+.1f}",
-                            help="High improvement group average minus low improvement group average"
-                        )
-                    
-                    with col2:
-                        st.metric(
-                            "Median Difference", 
-                            f"{median_difference:+.1f}",
-                            help="High improvement group median minus low improvement group median"
-                        )
-            
-                    with col3:
-                        # Perform t-test
-                        t_stat, p_value = ttest_ind(high_improvement['Total_Completed_Sum'], low_improvement['Total_Completed_Sum'])
-                        significance = "Significant" if p_value < 0.05 else "Not Significant"
-                        st.metric("T-test P-value", f"{p_value:.4f}", delta=significance)
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.metric(
+                        "Average Difference", 
+                        f"{avg_difference:+.1f}",
+                        help="High improvement group average minus low improvement group average"
+                    )
+                
+                with col2:
+                    st.metric(
+                        "Median Difference", 
+                        f"{high_stats['median_difference']:+.1f}",
+                        help="High improvement group median minus low improvement group median"
+                    )
+        
+                with col3:
+                    # Student's t-test, as scipy.stats.ttest_ind
+                    p_value = high_stats['p_value']
+                    significance = "Significant" if p_value < 0.05 else "Not Significant"
+                    st.metric("T-test P-value", f"{p_value:.4f}", delta=significance)
+            else:
+                st.warning("Both groups need at least one student for the comparison.")
         else:
             st.warning("Insufficient data available for question bank comparison analysis.")
 
@@ -1789,115 +1680,81 @@ else:
         
         if csv_df is not None:
             # Process attendance data with tier information
-            attendance_data = csv_df.groupby('student_id').agg({
-                'num_attended_large_session': 'sum',
-                'num_scheduled_large_session': 'sum',
-                'num_attended_small_session': 'sum',
-                'num_scheduled_small_session': 'sum',
-                'Large Group Tier': 'first',
-                'Small Group Tier': 'first'
-            }).reset_index()
-            
-            attendance_data['large_attendance_rate'] = (attendance_data['num_attended_large_session'] / 
-                                                       attendance_data['num_scheduled_large_session'] * 100)
-            attendance_data['small_attendance_rate'] = (attendance_data['num_attended_small_session'] / 
-                                                       attendance_data['num_scheduled_small_session'] * 100)
+            attendance_data = load_student_features(outcomes_path, outcomes_version)
             
             # Create heat map for tier distribution
             st.subheader("Tier Distribution by Baseline MCAT Score")
             
-            # Merge with baseline scores
-            baseline_data = df[['Student_ID', 'Baseline_Score']].dropna()
-            tier_baseline = attendance_data.merge(baseline_data, left_on='student_id', right_on='Student_ID', how='inner')
-            
-            # Create baseline score ranges
-            tier_baseline['Score_Range'] = pd.cut(tier_baseline['Baseline_Score'], 
-                                                bins=[480, 490, 500, 510, 520], 
-                                                labels=['480-489', '490-499', '500-509', '510-520'])
-            
-            # Create pivot tables for heat maps
-            large_group_pivot = tier_baseline.pivot_table(
-                values='student_id', 
-                index='Score_Range', 
-                columns='Large Group Tier', 
-                aggfunc='count', 
-                fill_value=0
-            )
-            
-            small_group_pivot = tier_baseline.pivot_table(
-                values='student_id', 
-                index='Score_Range', 
-                columns='Small Group Tier', 
-                aggfunc='count', 
-                fill_value=0
-            )
+            if use_sql_backend:
+                analytics_db = load_analytics_db(outcomes_path, outcomes_version)
+                with timer.section('transforms', f'{analytics_db.engine} tier pivots'):
+                    large_group_pivot = analytics_db.tier_pivot('Large Group Tier')
+                    small_group_pivot = analytics_db.tier_pivot('Small Group Tier')
+            else:
+                # Students with a baseline score
+                tier_baseline = attendance_data.dropna(subset=['Baseline_Score'])
+                
+                # Create baseline score ranges
+                tier_baseline['Score_Range'] = pd.cut(tier_baseline['Baseline_Score'], 
+                                                    bins=[480, 490, 500, 510, 520], 
+                                                    labels=['480-489', '490-499', '500-509', '510-520'])
+                
+                # Create pivot tables for heat maps
+                large_group_pivot = tier_baseline.pivot_table(
+                    values='student_id', 
+                    index='Score_Range', 
+                    columns='Large Group Tier', 
+                    aggfunc='count', 
+                    fill_value=0
+                )
+                
+                small_group_pivot = tier_baseline.pivot_table(
+                    values='student_id', 
+                    index='Score_Range', 
+                    columns='Small Group Tier', 
+                    aggfunc='count', 
+                    fill_value=0
+                )
             
             col1, col2 = st.columns(2)
             
+            heatmap_style = dict(
+                colorscale=[[0, '#FFFF99'], [0.5, '#FF9900'], [1, '#FF0000']],
+                textfont=dict(color="black", size=12, family="Arial Black"),
+                style=apply_light_mode_styling
+            )
+
             with col1:
                 # Large Group Heat Map
-                fig_large = px.imshow(
-                    large_group_pivot.values,
-                    x=large_group_pivot.columns,
-                    y=large_group_pivot.index,
-                    color_continuous_scale=[[0, '#FFFF99'], [0.5, '#FF9900'], [1, '#FF0000']],
-                    aspect="auto",
-                    title="Large Group Attendance Tiers by Baseline Score"
-                )
-                
-                # Add annotations
-                for i, row in enumerate(large_group_pivot.index):
-                    for j, col in enumerate(large_group_pivot.columns):
-                        fig_large.add_annotation(
-                            x=j, y=i,
-                            text=str(large_group_pivot.iloc[i, j]),
-                            showarrow=False,
-                            font=dict(color="black", size=12, family="Arial Black")
-                        )
-                
-                fig_large = apply_light_mode_styling(fig_large)
-                st.plotly_chart(fig_large, use_container_width=True)
+                with timer.section('charts', 'Large Group attendance heatmap'):
+                    render_heatmap(large_group_pivot, 'large-group-heatmap',
+                                   title="Large Group Attendance Tiers by Baseline Score", **heatmap_style)
             
             with col2:
                 # Small Group Heat Map
-                fig_small = px.imshow(
-                    small_group_pivot.values,
-                    x=small_group_pivot.columns,
-                    y=small_group_pivot.index,
-                    color_continuous_scale=[[0, '#FFFF99'], [0.5, '#FF9900'], [1, '#FF0000']],
-                    aspect="auto",
-                    title="Small Group Attendance Tiers by Baseline Score"
-                )
-                
-                # Add annotations
-                for i, row in enumerate(small_group_pivot.index):
-                    for j, col in enumerate(small_group_pivot.columns):
-                        fig_small.add_annotation(
-                            x=j, y=i,
-                            text=str(small_group_pivot.iloc[i, j]),
-                            showarrow=False,
-                            font=dict(color="black", size=12, family="Arial Black")
-                        )
-                
-                fig_small = apply_light_mode_styling(fig_small)
-                st.plotly_chart(fig_small, use_container_width=True)
+                with timer.section('charts', 'Small Group attendance heatmap'):
+                    render_heatmap(small_group_pivot, 'small-group-heatmap',
+                                   title="Small Group Attendance Tiers by Baseline Score", **heatmap_style)
             
             # Tier Performance Analysis
             st.subheader("Attendance Tier Performance Analysis")
             
             # Calculate tier success rates
-            tier_attendance = attendance_data.merge(df[['Student_ID', 'Score_Difference']], 
-                                                   left_on='student_id', right_on='Student_ID', how='inner')
-            tier_attendance = tier_attendance.dropna(subset=['Score_Difference'])
+            tier_attendance = attendance_data.dropna(subset=['Score_Difference'])
             
             if len(tier_attendance) > 0:
-                # Large Group Tier Analysis
-                large_tier_stats = tier_attendance.groupby('Large Group Tier')['Score_Difference'].agg(['mean', 'count']).reset_index()
-                large_tier_stats.columns = ['Tier', 'Avg_Score_Improvement', 'Student_Count']
-                
-                # Small Group Tier Analysis  
-                small_tier_stats = tier_attendance.groupby('Small Group Tier')['Score_Difference'].agg(['mean', 'count']).reset_index()
-                small_tier_stats.columns = ['Tier', 'Avg_Score_Improvement', 'Student_Count']
+                if use_sql_backend:
+                    with timer.section('transforms', f'{analytics_db.engine} tier means'):
+                        large_tier_stats = analytics_db.tier_means('Large Group Tier')
+                        small_tier_stats = analytics_db.tier_means('Small Group Tier')
+                else:
+                    # Large Group Tier Analysis
+                    large_tier_stats = tier_attendance.groupby('Large Group Tier')['Score_Difference'].agg(['mean', 'count']).reset_index()
+                    large_tier_stats.columns = ['Tier', 'Avg_Score_Improvement', 'Student_Count']
+                    
+                    # Small Group Tier Analysis  
+                    small_tier_stats = tier_attendance.groupby('Small Group Tier')['Score_Difference'].agg(['mean', 'count']).reset_index()
+                    small_tier_stats.columns = ['Tier', 'Avg_Score_Improvement', 'Student_Count']
                 
                 col1, col2 = st.columns(2)
                 
@@ -1933,27 +1790,25 @@ else:
         st.subheader("High vs Low Performing Students")
         
         if csv_df is not None:
-            # Process data for performance-based analysis
-            tier_data = csv_df.groupby('student_id').agg({
-                'Small Group Tier': 'first',
-                'Large Group Tier': 'first', 
-                'class_accuracy': 'mean',
-                'class_participation': 'mean',
-                'homework_participation': 'mean',
-                'num_attended_large_session': 'sum',
-                'num_scheduled_large_session': 'sum',
-                'num_attended_small_session': 'sum', 
-                'num_scheduled_small_session': 'sum',
-                'total_completed_passages_discrete_sets': 'sum'
-            }).reset_index()
-            
-            # Calculate relative class participation (for online compatibility)
-            tier_data['class_participation_relative'] = tier_data['class_participation'] / tier_data['class_participation'].max() * 100
-            
-            # Merge with score improvement and MCAT data
-            performance_data = df[['Student_ID', 'Score_Difference', 'Actual_MCAT', 'Baseline_Score', 'Number_of_Practice_Exams', 'Total_Completed_Sum']].merge(
-                tier_data, left_on='Student_ID', right_on='student_id', how='inner'
+            # Per-student features merged with score improvement and MCAT data
+            performance_data = load_student_features(outcomes_path, outcomes_version)
+            
+            # High and low performers, plus the low performers with a low baseline, compared in one pass
+            low_baseline_threshold = 495  # Define what's considered low baseline
+            performer_cohorts = dict(PERFORMER_COHORTS)
+            performer_cohorts['Low Baseline Low Performers'] = (
+                PERFORMER_COHORTS['Low Performers'] + [('Baseline_Score', '<', low_baseline_threshold)]
             )
+            performer_metrics = [
+                'Score_Difference', 'Baseline_Score', 'Actual_MCAT', 'class_accuracy', 'total_completed_passages_discrete_sets',
+                ('Small Group Tier 1+2', [('Small Group Tier', 'in', ('Tier 1', 'Tier 2'))])
+            ]
+            performer_comparison = load_cohort_comparison(
+                outcomes_path, 'features', freeze_cohorts(performer_cohorts), freeze_metrics(performer_metrics),
+                None, outcomes_version
+            )
+            performer_means = cohort_table(performer_comparison)
+            performer_sizes = cohort_table(performer_comparison, 'size').iloc[:, 0]
             
             # Key Findings at the top
             st.subheader("Key Findings")
@@ -1966,55 +1821,42 @@ else:
             with col1:
                 st.info(f"**{improvement_rate:.0f}% of students** showed positive MCAT score improvement with an average gain of **+{avg_improvement:.1f} points**")
             with col2:
-                high_performers_count = len(performance_data[
-                    ((performance_data['Score_Difference'] > 12) & (performance_data['Score_Difference'].notna())) |
-                    ((performance_data['Actual_MCAT'] > 505) & (performance_data['Actual_MCAT'].notna()))
-                ])
+                high_performers_count = performer_sizes['High Performers']
                 high_performer_rate = high_performers_count / total_students_analyzed * 100 if total_students_analyzed > 0 else 0
                 st.success(f"**{high_performer_rate:.0f}% achieved exceptional results** (>12pt improvement or >505 MCAT score)")
             
             st.markdown("---")
             
-            # Define High and Low Performers based on new criteria
             # High Performing: >12 point improvement OR >505 actual MCAT
-            high_performers = performance_data[
-                ((performance_data['Score_Difference'] > 12) & (performance_data['Score_Difference'].notna())) |
-                ((performance_data['Actual_MCAT'] > 505) & (performance_data['Actual_MCAT'].notna()))
-            ]
-            
             # Low Performing: ≤0 point improvement OR <502 actual MCAT
-            low_performers = performance_data[
-                ((performance_data['Score_Difference'] <= 0) & (performance_data['Score_Difference'].notna())) |
-                ((performance_data['Actual_MCAT'] < 502) & (performance_data['Actual_MCAT'].notna()))
-            ]
+            high_count = performer_sizes['High Performers']
+            low_count = performer_sizes['Low Performers']
             
             # High Performer Analysis
             st.subheader("High Performing Students")
             st.markdown('<p style="color: black; font-weight: normal;">Criteria: >12 point score improvement OR >505 actual MCAT score</p>', unsafe_allow_html=True)
             
-            if len(high_performers) > 0:
-                avg_improvement_high = high_performers['Score_Difference'].mean()
-                avg_baseline_high = high_performers['Baseline_Score'].mean()
-                avg_actual_high = high_performers['Actual_MCAT'].mean()
-                st.info(f"**High Performer Sample:** {len(high_performers)} students | **Average Score Improvement:** {avg_improvement_high:.1f} points | **Average Baseline Score:** {avg_baseline_high:.1f} | **Average Actual MCAT:** {avg_actual_high:.1f}")
+            if high_count > 0:
+                high_means = performer_means.loc['High Performers']
+                avg_improvement_high = high_means['Score_Difference']
+                avg_baseline_high = high_means['Baseline_Score']
+                avg_actual_high = high_means['Actual_MCAT']
+                st.info(f"**High Performer Sample:** {high_count} students | **Average Score Improvement:** {avg_improvement_high:.1f} points | **Average Baseline Score:** {avg_baseline_high:.1f} | **Average Actual MCAT:** {avg_actual_high:.1f}")
                 
                 # High performer metrics
                 col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
-                    st.metric("Average Class Accuracy", f"{high_performers['class_accuracy'].mean():.1%}")
+                    st.metric("Average Class Accuracy", f"{high_means['class_accuracy']:.1%}")
                 with col2:
                     # Calculate average weekly questions answered (total completed / number of weeks in program)
-                    avg_weekly_questions = high_performers['total_completed_passages_discrete_sets'].mean()
+                    avg_weekly_questions = high_means['total_completed_passages_discrete_sets']
                     st.metric("Avg Weekly Questions", f"{avg_weekly_questions:.0f}", help="Average question sets completed per week")
                 with col3:
                     st.metric("Baseline MCAT", f"{avg_baseline_high:.1f}")
                 with col4:
-                    # Calculate % in Tier 1 and 2 attendance
-                    small_tier_dist_high = high_performers['Small Group Tier'].value_counts()
-                    tier1_count = small_tier_dist_high.get('Tier 1', 0)
-                    tier2_count = small_tier_dist_high.get('Tier 2', 0)
-                    tier1_tier2_pct = (tier1_count + tier2_count) / len(high_performers) * 100 if len(high_performers) > 0 else 0
+                    # % in Small Group Tier 1 and 2 attendance
+                    tier1_tier2_pct = high_means['Small Group Tier 1+2'] * 100
                     st.metric("Tier 1+2 Attendance", f"{tier1_tier2_pct:.0f}%", help="Percentage in top attendance tiers")
                 
                 # Store for comparison later
@@ -2028,27 +1870,25 @@ else:
             st.subheader("Low Performing Students")
             st.markdown('<p style="color: black; font-weight: normal;">Criteria: ≤0 point score improvement OR <502 actual MCAT score</p>', unsafe_allow_html=True)
             
-            if len(low_performers) > 0:
-                avg_improvement_low = low_performers['Score_Difference'].mean()
-                avg_baseline_low = low_performers['Baseline_Score'].mean()
-                avg_actual_low = low_performers['Actual_MCAT'].mean()
-                st.info(f"**Low Performer Sample:** {len(low_performers)} students | **Average Score Change:** {avg_improvement_low:.1f} points | **Average Baseline Score:** {avg_baseline_low:.1f} | **Average Actual MCAT:** {avg_actual_low:.1f}")
+            if low_count > 0:
+                low_means = performer_means.loc['Low Performers']
+                avg_improvement_low = low_means['Score_Difference']
+                avg_baseline_low = low_means['Baseline_Score']
+                avg_actual_low = low_means['Actual_MCAT']
+                st.info(f"**Low Performer Sample:** {low_count} students | **Average Score Change:** {avg_improvement_low:.1f} points | **Average Baseline Score:** {avg_baseline_low:.1f} | **Average Actual MCAT:** {avg_actual_low:.1f}")
                 
                 # Low performer metrics
                 col1, col2, col3, col4 = st.columns(4)
                 with col1:
-                    st.metric("Average Class Accuracy", f"{low_performers['class_accuracy'].mean():.1%}")
+                    st.metric("Average Class Accuracy", f"{low_means['class_accuracy']:.1%}")
                 with col2:
-                    avg_weekly_questions_low = low_performers['total_completed_passages_discrete_sets'].mean()
+                    avg_weekly_questions_low = low_means['total_completed_passages_discrete_sets']
                     st.metric("Avg Weekly Questions", f"{avg_weekly_questions_low:.0f}", help="Average question sets completed per week")
                 with col3:
                     st.metric("Baseline MCAT", f"{avg_baseline_low:.1f}")
                 with col4:
-                    # Calculate % in Tier 1 and 2 attendance
-                    small_tier_dist_low = low_performers['Small Group Tier'].value_counts()
-                    tier1_count_low = small_tier_dist_low.get('Tier 1', 0)
-                    tier2_count_low = small_tier_dist_low.get('Tier 2', 0)
-                    tier1_tier2_pct_low = (tier1_count_low + tier2_count_low) / len(low_performers) * 100 if len(low_performers) > 0 else 0
+                    # % in Small Group Tier 1 and 2 attendance
+                    tier1_tier2_pct_low = low_means['Small Group Tier 1+2'] * 100
                     st.metric("Tier 1+2 Attendance", f"{tier1_tier2_pct_low:.0f}%", help="Percentage in top attendance tiers")
                 
                 # Calculate tier comparison
@@ -2061,10 +1901,9 @@ else:
                 st.warning("**Immediate Actions for Low Performers:**")
                 
                 # Flag low baseline MCAT scorers
-                low_baseline_threshold = 495  # Define what's considered low baseline
-                low_baseline_students = low_performers[low_performers['Baseline_Score'] < low_baseline_threshold]
-                if len(low_baseline_students) > 0:
-                    st.error(f"**⚠️ Priority Alert:** {len(low_baseline_students)} students have baseline MCAT scores below {low_baseline_threshold} - require immediate intensive support")
+                low_baseline_count = performer_sizes['Low Baseline Low Performers']
+                if low_baseline_count > 0:
+                    st.error(f"**⚠️ Priority Alert:** {low_baseline_count} students have baseline MCAT scores below {low_baseline_threshold} - require immediate intensive support")
                 
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -2092,10 +1931,10 @@ else:
             st.markdown("---")
             st.subheader("High vs Low Performer Comparison")
             
-            if len(high_performers) > 0 and len(low_performers) > 0:
+            if high_count > 0 and low_count > 0:
                 comparison_data = pd.DataFrame({
                     'Group': ['High Performers', 'Low Performers'],
-                    'Student Count': [len(high_performers), len(low_performers)],
+                    'Student Count': [high_count, low_count],
                     'Avg Score Improvement': [avg_improvement_high, avg_improvement_low],
                     'Avg Baseline Score': [avg_baseline_high, avg_baseline_low],
                     'Avg Actual MCAT': [avg_actual_high, avg_actual_low]
@@ -2116,7 +1955,8 @@ else:
                 )
                 fig_comparison.update_traces(texttemplate='%{text:.1f}', textposition='outside')
                 fig_comparison = apply_light_mode_styling(fig_comparison)
-                st.plotly_chart(fig_comparison, use_container_width=True)
+                with timer.section('charts', 'Performer comparison'):
+                    st.plotly_chart(fig_comparison, use_container_width=True)
             
         else:
             st.error("**Performer analysis requires tier data which is not available**")
@@ -2130,3 +1970,5 @@ else:
             
             **Current status:** CSV data loading failed.
             """)
+
+timer.finish()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Institution / cohort partitioned data layout.
+
+Each institution's data lives in its own directory, one subdirectory per
+cohort, with the same file names in every partition:
+
+    student-data/institutions/<institution>/<cohort>/
+        engagement-data.csv
+        test-data.csv
+        exam-data-jw-exams.csv
+        tierdata.csv
+        jfd-combined.csv
+        data_outcomes_with_tiers.csv
+
+The original flat layout (institution-1-* files in student-data/, outcomes
+in the root or data/) is mapped to a single institution-1 partition, so
+existing deployments keep working unchanged.
+
+Discovery only lists paths; nothing is read until a page asks for a table of
+the selected partition. Cross-institution rollups prune the partition list
+first (by institution, cohort and which tables a partition actually has) and
+read only the needed columns of what is left.
+"""
+import os
+
+import pandas as pd
+
+from data_store import dataset_version, find_data_file, read_table
+
+# Directories searched for the partitioned layout, in order
+PARTITION_ROOTS = [
+    'student-data/institutions/',
+    './student-data/institutions/',
+    'institutions/'
+]
+
+# Table -> file name inside a partition directory
+PARTITION_FILES = {
+    'engagement': 'engagement-data.csv',
+    'tests': 'test-data.csv',
+    'jw_exams': 'exam-data-jw-exams.csv',
+    'tiers': 'tierdata.csv',
+    'jfd': 'jfd-combined.csv',
+    'outcomes': 'data_outcomes_with_tiers.csv'
+}
+
+# Tables of the Individual Student Dashboard, in load_individual_tables order
+INDIVIDUAL_TABLES = ['engagement', 'tests', 'jw_exams', 'tiers']
+
+# Partitions a Streamlit loader keeps in memory at once; older ones are
+# evicted and reloaded from their columnar cache if selected again
+MAX_CACHED_PARTITIONS = 2
+
+# The flat layout: table -> (file name, directories searched)
+LEGACY_INSTITUTION = 'institution-1'
+LEGACY_COHORT = '2025'
+LEGACY_FILES = {
+    'engagement': ('institution-1-engagement-data.csv', None),
+    'tests': ('institution-1-test-data.csv', None),
+    'jw_exams': ('institution-1-2025-exam-data-jw-exams.csv', None),
+    'tiers': ('tierdata.csv', None),
+    'jfd': ('jfd-combined.csv', ['student-data/', './student-data/']),
+    'outcomes': ('data_outcomes_with_tiers.csv', ['', './', 'data/', './data/'])
+}
+
+
+class Partition:
+    """One institution's cohort: its name and the paths of the tables it has."""
+
+    def __init__(self, institution, cohort, files):
+        self.institution = institution
+        self.cohort = cohort
+        self.files = files
+
+    def __repr__(self):
+        return f'Partition({self.institution!r}, {self.cohort!r}, {sorted(self.files)})'
+
+    @property
+    def label(self):
+        return f'{self.institution} / {self.cohort}'
+
+    def path(self, table):
+        """Path of `table` in this partition, or None if it does not have it."""
+        return self.files.get(table)
+
+    def paths(self, tables):
+        """Paths of several tables (None for missing ones), as a hashable tuple."""
+        return tuple(self.files.get(t) for t in tables)
+
+    def has(self, tables):
+        return all(t in self.files for t in tables)
+
+    def version(self, tables):
+        """Cache key for the given tables of this partition."""
+        return dataset_version(self.paths(tables))
+
+
+def _partition_files(directory):
+    files = {}
+    for table, filename in PARTITION_FILES.items():
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            files[table] = path
+    return files
+
+
+def legacy_partition():
+    """The flat institution-1 layout as a partition, or None if none of its files exist."""
+    files = {}
+    for table, (filename, search_dirs) in LEGACY_FILES.items():
+        path = find_data_file(filename, search_dirs)
+        if path is not None:
+            files[table] = path
+    return Partition(LEGACY_INSTITUTION, LEGACY_COHORT, files) if files else None
+
+
+def discover_partitions(roots=None):
+    """All partitions on disk, sorted by institution and cohort.
+
+    Only the first existing partition root is scanned. The flat layout is
+    added as institution-1 unless the partitioned layout already has that
+    institution and cohort.
+    """
+    partitions = []
+    for root in roots if roots is not None else PARTITION_ROOTS:
+        if not os.path.isdir(root):
+            continue
+        for institution in sorted(os.listdir(root)):
+            institution_dir = os.path.join(root, institution)
+            if institution.startswith('.') or not os.path.isdir(institution_dir):
+                continue
+            for cohort in sorted(os.listdir(institution_dir)):
+                cohort_dir = os.path.join(institution_dir, cohort)
+                if cohort.startswith('.') or not os.path.isdir(cohort_dir):
+                    continue
+                files = _partition_files(cohort_dir)
+                if files:
+                    partitions.append(Partition(institution, cohort, files))
+        break
+
+    legacy = legacy_partition()
+    if legacy is not None and not any((p.institution, p.cohort) == (LEGACY_INSTITUTION, LEGACY_COHORT) for p in partitions):
+        partitions.append(legacy)
+    return sorted(partitions, key=lambda p: (p.institution, p.cohort))
+
+
+def institutions(partitions):
+    """Institution names in sorted order."""
+    return sorted({p.institution for p in partitions})
+
+
+def prune_partitions(partitions, institutions=None, cohorts=None, tables=None):
+    """Partitions matching the institution and cohort filters that have every table in `tables`."""
+    return [
+        p for p in partitions
+        if (institutions is None or p.institution in institutions)
+        and (cohorts is None or p.cohort in cohorts)
+        and (tables is None or p.has(tables))
+    ]
+
+
+def find_partition(partitions, institution, cohort=None):
+    """The partition for `institution` (its latest cohort if `cohort` is None), or None."""
+    matches = prune_partitions(partitions, [institution], None if cohort is None else [cohort])
+    return matches[-1] if matches else None
+
+
+def read_partitions(partitions, table, columns=None, **read_kwargs):
+    """Read one table from each partition that has it, tagged with institution and cohort.
+
+    Partitions without the table are skipped without touching the disk, and
+    with `columns` only those columns are read from each columnar cache.
+    """
+    frames = []
+    for p in prune_partitions(partitions, tables=[table]):
+        df = read_table(p.path(table), columns=columns, **read_kwargs)
+        frames.append(df.assign(institution=p.institution, cohort=p.cohort))
+    if not frames:
+        return pd.DataFrame(columns=(list(columns) if columns is not None else []) + ['institution', 'cohort'])
+    combined = pd.concat(frames, ignore_index=True)
+    combined['institution'] = combined['institution'].astype('category')
+    combined['cohort'] = combined['cohort'].astype('category')
+    return combined
+
+
+def rollup(partitions, table, metrics, institutions=None, cohorts=None, id_column='student_id'):
+    """Students and mean of each metric per institution and cohort, reading only the needed partitions and columns."""
+    selected = prune_partitions(partitions, institutions, cohorts, [table])
+    df = read_partitions(selected, table, columns=[id_column] + list(metrics))
+    df[list(metrics)] = df[list(metrics)].apply(pd.to_numeric, errors='coerce')
+    grouped = df.groupby(['institution', 'cohort'], observed=True)
+    summary = grouped[list(metrics)].mean()
+    summary.insert(0, 'students', grouped[id_column].nunique())
+    return summary.reset_index()
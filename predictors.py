@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""Live significance tests for the Key Actionable Insights predictors.
+
+Every candidate feature is tested against a binary outcome (e.g. a score
+improvement of more than 5 points) in one batch:
+
+* tier columns    - chi-square test of independence on the tier x outcome
+                    contingency table, plus the success rate per tier
+* numeric columns - Welch's t-test and Mann-Whitney U between the success and
+                    non-success groups, computed column-wise over a matrix
+
+Results are ranked by p-value, so the page can show the strongest predictors
+for whatever cohort is loaded.
+"""
+import numpy as np
+import pandas as pd
+
+# Numeric candidates: column -> (display label, unit for the group means, number format)
+NUMERIC_PREDICTORS = {
+    'Number_of_Practice_Exams': ('Number of Practice Exams', 'exams average', '.2f'),
+    'total_completed_passages_discrete_sets': ('Question Bank Usage', 'sets completed', '.1f'),
+    'completed_lessons': ('Completed Course Lessons', 'lessons completed', '.1f'),
+    'class_accuracy': ('In-Class Accuracy', 'average accuracy', '.2f'),
+    'class_participation': ('Class Participation Rate', '% of weeks', '.1f'),
+    'homework_participation': ('Homework Completion', 'average completion', '.2f'),
+    'large_attendance_rate': ('Class Attendance Rate', '% attended', '.1f'),
+    'small_attendance_rate': ('Small Group Attendance Rate', '% attended', '.1f'),
+    'Baseline_Score': ('Baseline Score', 'points', '.1f'),
+}
+
+# Tier candidates: column -> display label
+TIER_PREDICTORS = {
+    'Small Group Tier': 'Small Group Attendance Tier',
+    'Large Group Tier': 'Class Attendance Tier',
+    'Class Participation Tier': 'Class Participation Tier',
+    'Survey Tier': 'Survey Completion Tier',
+}
+
+RESULT_COLUMNS = [
+    'feature', 'label', 'kind', 'test', 'statistic', 'p_value', 'mannwhitney_p',
+    'n', 'success_mean', 'other_mean', 'difference'
+]
+
+
+def tier_success_rates(data, outcome, tier_columns):
+    """Success counts and rates per tier level for every tier column, in long format."""
+    long = data[tier_columns + [outcome]].melt(id_vars=outcome, var_name='feature', value_name='tier')
+    long = long.dropna(subset=['tier'])
+    rates = long.groupby(['feature', 'tier'], sort=True)[outcome].agg(successes='sum', students='count').reset_index()
+    rates['rate'] = rates['successes'] / rates['students'] * 100
+    return rates
+
+
+def _chi_square(rates):
+    """Chi-square test per feature from the long-format success counts."""
+    # scipy.stats is slow to import; only the Key Actionable Insights page gets here
+    from scipy import stats
+    rates = rates.assign(failures=rates['students'] - rates['successes'])
+    totals = rates.groupby('feature')[['successes', 'failures', 'students']].transform('sum')
+    observed = rates[['successes', 'failures']].to_numpy(dtype=float)
+    column_totals = totals[['successes', 'failures']].to_numpy(dtype=float)
+    expected = rates['students'].to_numpy(dtype=float)[:, None] * column_totals / totals['students'].to_numpy(dtype=float)[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cells = np.where(expected > 0, (observed - expected) ** 2 / expected, 0.0)
+    rates['chi2'] = cells.sum(axis=1)
+    grouped = rates.groupby('feature')
+    chi2 = grouped['chi2'].sum()
+    levels = grouped.size()
+    n = grouped['students'].sum()
+    # Both outcome classes must be present for the test to be defined
+    valid = (grouped['successes'].sum() > 0) & (grouped['successes'].sum() < n) & (levels > 1)
+    dof = (levels - 1).clip(lower=1)
+    p_values = pd.Series(stats.chi2.sf(chi2, dof), index=chi2.index).where(valid)
+    return pd.DataFrame({'statistic': chi2.where(valid), 'p_value': p_values, 'n': n})
+
+
+def _welch_t_test(success, other):
+    """Welch's t-test for every column of two NaN-padded matrices."""
+    from scipy import stats
+    n1 = np.sum(~np.isnan(success), axis=0)
+    n2 = np.sum(~np.isnan(other), axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean1 = np.nanmean(success, axis=0)
+        mean2 = np.nanmean(other, axis=0)
+        var1 = np.nanvar(success, axis=0, ddof=1) / n1
+        var2 = np.nanvar(other, axis=0, ddof=1) / n2
+        t = (mean1 - mean2) / np.sqrt(var1 + var2)
+        dof = (var1 + var2) ** 2 / (var1 ** 2 / (n1 - 1) + var2 ** 2 / (n2 - 1))
+    p_values = 2 * stats.t.sf(np.abs(t), dof)
+    return t, p_values, mean1, mean2, n1 + n2
+
+
+def test_predictors(data, outcome, tier_columns=None, numeric_columns=None):
+    """Test every candidate predictor against the binary `outcome` column.
+
+    Returns (results, tier_rates): one row per predictor ranked by p-value, and
+    the per-tier success counts and rates behind the chi-square tests.
+    """
+    if tier_columns is None:
+        tier_columns = [c for c in TIER_PREDICTORS if c in data.columns]
+    if numeric_columns is None:
+        numeric_columns = [c for c in NUMERIC_PREDICTORS if c in data.columns]
+    from scipy import stats
+
+    data = data.dropna(subset=[outcome])
+    success = data[outcome].to_numpy().astype(bool)
+
+    results = []
+    tier_rates = tier_success_rates(data, outcome, tier_columns) if tier_columns else pd.DataFrame(
+        columns=['feature', 'tier', 'successes', 'students', 'rate'])
+    if tier_columns:
+        chi = _chi_square(tier_rates.copy())
+        results.append(pd.DataFrame({
+            'feature': chi.index,
+            'label': [TIER_PREDICTORS.get(c, c) for c in chi.index],
+            'kind': 'tier',
+            'test': 'Chi-square',
+            'statistic': chi['statistic'].to_numpy(),
+            'p_value': chi['p_value'].to_numpy(),
+            'n': chi['n'].to_numpy()
+        }))
+
+    if numeric_columns:
+        matrix = data[numeric_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        success_matrix = np.where(success[:, None], matrix, np.nan)
+        other_matrix = np.where(~success[:, None], matrix, np.nan)
+        t, p_values, mean1, mean2, n = _welch_t_test(success_matrix, other_matrix)
+        if success.any() and (~success).any():
+            mann_whitney = stats.mannwhitneyu(
+                matrix[success], matrix[~success], axis=0, nan_policy='omit', method='asymptotic'
+            ).pvalue
+        else:
+            mann_whitney = np.full(len(numeric_columns), np.nan)
+        results.append(pd.DataFrame({
+            'feature': numeric_columns,
+            'label': [NUMERIC_PREDICTORS.get(c, (c,))[0] for c in numeric_columns],
+            'kind': 'numeric',
+            'test': "Welch's t-test",
+            'statistic': t,
+            'p_value': p_values,
+            'mannwhitney_p': np.asarray(mann_whitney, dtype=float),
+            'n': n,
+            'success_mean': mean1,
+            'other_mean': mean2,
+            'difference': mean1 - mean2
+        }))
+
+    if not results:
+        return pd.DataFrame(columns=RESULT_COLUMNS), tier_rates
+    ranked = pd.concat(results, ignore_index=True).reindex(columns=RESULT_COLUMNS)
+    ranked = ranked.sort_values('p_value', na_position='last', kind='stable', ignore_index=True)
+    return ranked, tier_rates
+
+
+def format_p_value(p_value):
+    """p-value as shown on the page (p < 0.0001 for very small values)."""
+    if pd.isna(p_value):
+        return 'n/a'
+    return 'p < 0.0001' if p_value < 0.0001 else f'p = {p_value:.4f}'
+
+
+def describe_predictor(rank, result, tier_rates, success_label='Improvement', other_label='Lower, No, or Negative Score Change'):
+    """Markdown block for one ranked predictor, in the Key Actionable Insights layout."""
+    lines = [f"**{rank}. • {result['label']}** *({format_p_value(result['p_value'])})*"]
+    if result['kind'] == 'tier':
+        levels = tier_rates[tier_rates['feature'] == result['feature']]
+        for level in levels.itertuples(index=False):
+            lines.append(f"- **{level.tier}:** {level.rate:.1f}% success rate ({level.successes}/{level.students} students)")
+        if len(levels) > 1 and levels['rate'].iloc[-1] > 0:
+            ratio = levels['rate'].iloc[0] / levels['rate'].iloc[-1]
+            lines.append(f"- **Impact:** {ratio:.1f}x success rate for {levels['tier'].iloc[0]} vs {levels['tier'].iloc[-1]}")
+    else:
+        _, unit, fmt = NUMERIC_PREDICTORS.get(result['feature'], (result['label'], '', '.2f'))
+        lines.append(f"- **{success_label}:** {result['success_mean']:{fmt}} {unit}")
+        lines.append(f"- **{other_label}:** {result['other_mean']:{fmt}} {unit}")
+        lines.append(f"- **Impact:** {result['difference']:+{fmt}} for success (Mann-Whitney {format_p_value(result['mannwhitney_p'])})")
+    return '\n'.join(lines)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Server-side paginated, sortable and searchable student roster tables.
+
+A RosterIndex is built once per roster (and cached with the data): it keeps
+the display columns, one precomputed stable sort order per column and a
+lowercased search key per row. A rerun then only filters positions with
+boolean masks, picks the order it needs and slices one page, so only the
+visible rows are serialized to Arrow and sent to the browser.
+"""
+import math
+
+import numpy as np
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+class RosterIndex:
+    """Display columns of a roster with per-column sort orders and a search key."""
+
+    def __init__(self, df, columns, search_columns=None, labels=None):
+        self.frame = df[columns].reset_index(drop=True)
+        self.columns = list(columns)
+        self.labels = labels or {}
+        # Category bitmasks (or any per-row integer) for filtering, if present
+        self.category_mask = df['category_mask'].to_numpy() if 'category_mask' in df.columns else None
+
+        # Ascending orders with missing values last; descending reuses them
+        self._orders = {}
+        self._valid = {}
+        for col in self.columns:
+            order = self.frame[col].sort_values(kind='stable', na_position='last').index.to_numpy()
+            self._orders[col] = order
+            self._valid[col] = int(self.frame[col].notna().sum())
+
+        search_columns = search_columns or self.columns
+        search_key = self.frame[search_columns[0]].astype(str)
+        for col in search_columns[1:]:
+            search_key = search_key + ' ' + self.frame[col].astype(str)
+        self._search_key = search_key.str.lower()
+
+    def __len__(self):
+        return len(self.frame)
+
+    def count(self, category_bit=None):
+        """Rows in the roster, or in one category."""
+        if category_bit is None or self.category_mask is None:
+            return len(self.frame)
+        return int(np.count_nonzero(self.category_mask & category_bit))
+
+    def order(self, sort_by, descending=False):
+        """Row positions sorted by `sort_by`, missing values last in both directions."""
+        order = self._orders[sort_by]
+        if not descending:
+            return order
+        valid = self._valid[sort_by]
+        return np.concatenate([order[:valid][::-1], order[valid:]])
+
+    def positions(self, sort_by=None, descending=False, search='', category_bit=None):
+        """Sorted positions of the rows matching the search text and category bit."""
+        keep = np.ones(len(self.frame), dtype=bool)
+        if category_bit is not None and self.category_mask is not None:
+            keep &= (self.category_mask & category_bit) != 0
+        search = search.strip().lower()
+        if search:
+            keep &= self._search_key.str.contains(search, regex=False).to_numpy()
+        order = self.order(sort_by or self.columns[0], descending)
+        return order[keep[order]]
+
+    def page(self, positions, page, page_size):
+        """Rows of one page (1-based) of `positions`, with display labels as headers."""
+        start = (page - 1) * page_size
+        rows = self.frame.iloc[positions[start:start + page_size]]
+        return rows.rename(columns=self.labels)
+
+
+def render_roster(index, key, category_bit=None, empty_message="No students found.", default_page_size=50):
+    """Search, sort and page controls plus the visible page of `index`.
+
+    Widget state is kept per `key`, so several rosters can share a page.
+    """
+    if index.count(category_bit) == 0:
+        st.info(empty_message)
+        return
+
+    search_col, sort_col, order_col, size_col = st.columns([3, 2, 1, 1])
+    with search_col:
+        search = st.text_input("Search", key=f'{key}-search', placeholder="Student ID, tier or exam...")
+    with sort_col:
+        sort_by = st.selectbox("Sort by", index.columns, key=f'{key}-sort',
+                               format_func=lambda col: index.labels.get(col, col))
+    with order_col:
+        descending = st.toggle("Descending", key=f'{key}-descending')
+    with size_col:
+        page_size = st.selectbox("Rows", PAGE_SIZES, index=PAGE_SIZES.index(default_page_size), key=f'{key}-size')
+
+    positions = index.positions(sort_by, descending, search, category_bit)
+    if len(positions) == 0:
+        st.info("No students match the search.")
+        return
+
+    pages = max(1, math.ceil(len(positions) / page_size))
+    page = 1
+    if pages > 1:
+        # Keyed by the page count so a new search or page size starts again at page 1
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=f'{key}-page-{pages}')
+        page = min(int(page), pages)
+    start = (page - 1) * page_size
+    st.caption(f"Showing {start + 1:,}-{min(start + page_size, len(positions)):,} of {len(positions):,} students")
+    st.dataframe(index.page(positions, page, page_size), hide_index=True, use_container_width=True)
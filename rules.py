@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""Declarative row rules evaluated in a single vectorized pass.
+
+A rule is a list of conditions that must all hold. A condition is a
+`(column, op, value)` tuple, e.g. `('highest_exam_score', '<', 495)` or
+`('anticipated_exam_date', 'isnull', None)`. Alternatives are written with
+`any_of`, a condition that holds when any of its rules does, e.g.
+`any_of([('Score_Difference', '>', 12)], [('Actual_MCAT', '>', 505)])`.
+A named set of rules is compiled into one integer bitmask per row (bit i set
+when rule i matches). Conditions shared between rules are only evaluated once.
+"""
+import numpy as np
+import pandas as pd
+
+OPERATORS = {
+    '==': lambda s, v: s == v,
+    '!=': lambda s, v: s != v,
+    '<': lambda s, v: s < v,
+    '<=': lambda s, v: s <= v,
+    '>': lambda s, v: s > v,
+    '>=': lambda s, v: s >= v,
+    'between': lambda s, v: s.between(v[0], v[1]),
+    'in': lambda s, v: s.isin(v),
+    'isnull': lambda s, v: s.isna(),
+    'notnull': lambda s, v: s.notna(),
+}
+
+
+# Risk categories for the "Students by School" page. Each category is a list of
+# (column, operator, value) conditions that must all hold.
+SCHOOL_CATEGORIES = {
+    "Category 1: No Reported Scores": [
+        ('exam_count', '==', 0)
+    ],
+    "Category 2: Students <502 & No Anticipated Exam Date": [
+        ('highest_exam_score', '<', 502),
+        ('anticipated_exam_date', 'isnull', None)
+    ],
+    "Category 3: <495 & Tier 3 Across All Metrics": [
+        ('highest_exam_score', '<', 495),
+        ('survey_tier', '==', 'Tier 3'),
+        ('large_group_tier', '==', 'Tier 3'),
+        ('small_group_tier', '==', 'Tier 3'),
+        ('class_participation_tier', '==', 'Tier 3')
+    ],
+    "Category 4: <495 & Survey Tier 3": [
+        ('highest_exam_score', '<', 495),
+        ('survey_tier', '==', 'Tier 3')
+    ],
+    "Category 5: 495–500 & Small Group Tier 3": [
+        ('highest_exam_score', 'between', (495, 500)),
+        ('small_group_tier', '==', 'Tier 3')
+    ],
+    "Category 6: <495 & Large Group Tier 3": [
+        ('highest_exam_score', '<', 495),
+        ('large_group_tier', '==', 'Tier 3')
+    ]
+}
+
+
+def any_of(*rules):
+    """A condition that holds when any of `rules` (each a list of conditions) holds."""
+    return ('any', tuple(tuple(tuple(condition) for condition in rule) for rule in rules))
+
+
+def _evaluate_condition(df, condition, condition_masks=None):
+    if condition[0] == 'any' and len(condition) == 2:
+        mask = np.zeros(len(df), dtype=bool)
+        for rule in condition[1]:
+            mask |= rule_mask(df, rule, condition_masks)
+        return mask
+    column, op, value = condition
+    if op not in OPERATORS:
+        raise ValueError(f"Unknown rule operator {op!r} in {condition!r}")
+    return OPERATORS[op](df[column], value).fillna(False).to_numpy(dtype=bool)
+
+
+def _mask_dtype(rules):
+    if len(rules) > 64:
+        raise ValueError(f"At most 64 rules can share a bitmask, got {len(rules)}")
+    return np.uint32 if len(rules) <= 32 else np.uint64
+
+
+def rule_mask(df, conditions, condition_masks=None):
+    """Boolean array of the rows of `df` matching every condition.
+
+    `condition_masks` caches evaluated conditions across calls.
+    """
+    if condition_masks is None:
+        condition_masks = {}
+    mask = np.ones(len(df), dtype=bool)
+    for condition in conditions:
+        condition = tuple(condition)
+        if condition not in condition_masks:
+            condition_masks[condition] = _evaluate_condition(df, condition, condition_masks)
+        mask &= condition_masks[condition]
+    return mask
+
+
+def evaluate_rules(df, rules):
+    """Evaluate named `rules` over `df` and return the per-row bitmask as a Series."""
+    dtype = _mask_dtype(rules)
+    bitmask = np.zeros(len(df), dtype=dtype)
+    condition_masks = {}
+
+    for bit, conditions in enumerate(rules.values()):
+        mask = rule_mask(df, conditions, condition_masks)
+        bitmask |= mask.astype(dtype) << dtype(bit)
+
+    return pd.Series(bitmask, index=df.index, name='category_mask')
+
+
+def rule_bits(rules):
+    """Map each rule name to its bit value in the mask."""
+    return {name: 1 << bit for bit, name in enumerate(rules)}
+
+
+def rule_matrix(bitmask, rules):
+    """Expand a bitmask into a boolean DataFrame with one column per rule."""
+    values = bitmask.to_numpy()
+    bits = np.arange(len(rules), dtype=values.dtype)
+    matrix = ((values[:, None] >> bits) & 1).astype(bool)
+    return pd.DataFrame(matrix, index=bitmask.index, columns=list(rules))
+
+
+def rule_counts(bitmask, rules, by=None):
+    """Number of rows matching each rule, optionally grouped by a key Series."""
+    matrix = rule_matrix(bitmask, rules)
+    if by is None:
+        return matrix.sum()
+    return matrix.groupby(by).sum()
+
+
+def rule_overlaps(bitmask, rules):
+    """Count rows per distinct combination of matched rules (rows matching none are skipped)."""
+    counts = bitmask[bitmask != 0].value_counts()
+    names = list(rules)
+    labels = [
+        ' + '.join(name for bit, name in enumerate(names) if int(mask) >> bit & 1)
+        for mask in counts.index
+    ]
+    return pd.DataFrame({
+        'Categories': labels,
+        'Category Count': [bin(int(mask)).count('1') for mask in counts.index],
+        'Students': counts.to_numpy()
+    })
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Column dtypes applied when a data file is first parsed.
+
+read_table looks the file up here by name and casts its columns before the
+Parquet copy is written, so every later read is already compact:
+
+* tier     - ordered categorical ("Tier 1" < "Tier 2" < ...)
+* category - categorical, for strings repeated on many rows (exam names, topics)
+* score    - nullable Int16 (MCAT-scale scores and score differences)
+* rate     - float32 (accuracies, participation and other fractions)
+
+Casts are lossless or skipped: a score column holding non-integer values
+stays float64, and columns missing from a file are ignored.
+"""
+import math
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+TIER_COLUMNS = ['Survey Tier', 'Large Group Tier', 'Small Group Tier', 'Class Participation Tier']
+JFD_TIER_COLUMNS = ['survey_tier', 'large_group_tier', 'small_group_tier', 'class_participation_tier']
+ENGAGEMENT_RATES = [
+    'cars_accuracy', 'sciences_accuracy', 'class_accuracy', 'score_trends_on_completed_dailies',
+    'class_participation', 'homework_participation'
+]
+
+ENGAGEMENT_SCHEMA = {col: 'rate' for col in ENGAGEMENT_RATES}
+TEST_SCHEMA = {
+    'test_name': 'category',
+    'actual_exam_score': 'score',
+    'low_predicted_exam_score': 'score',
+    'high_predicted_exam_score': 'score'
+}
+JW_EXAM_SCHEMA = {
+    'Exam Name': 'category',
+    'Exam Section': 'category',
+    'Question Topic': 'category',
+    'Student Accuracy': 'rate',
+    'Site Accuracy': 'rate',
+    'student_score': 'score'
+}
+TIER_SCHEMA = {col: 'tier' for col in TIER_COLUMNS}
+JFD_SCHEMA = dict({col: 'tier' for col in JFD_TIER_COLUMNS}, highest_exam_score='score')
+OUTCOMES_SCHEMA = dict(
+    {col: 'rate' for col in ENGAGEMENT_RATES},
+    **{col: 'tier' for col in TIER_COLUMNS},
+    **{col: 'score' for col in ['Baseline Score', 'Most Recent Practice Exam', 'Actual MCAT', 'Score Difference']}
+)
+
+# File name -> schema, for both the flat institution-1 layout and the partitioned layout
+FILE_SCHEMAS = {
+    'institution-1-engagement-data.csv': ENGAGEMENT_SCHEMA,
+    'engagement-data.csv': ENGAGEMENT_SCHEMA,
+    'institution-1-test-data.csv': TEST_SCHEMA,
+    'test-data.csv': TEST_SCHEMA,
+    'institution-1-2025-exam-data-jw-exams.csv': JW_EXAM_SCHEMA,
+    'exam-data-jw-exams.csv': JW_EXAM_SCHEMA,
+    'tierdata.csv': TIER_SCHEMA,
+    'jfd-combined.csv': JFD_SCHEMA,
+    'data_outcomes_with_tiers.csv': OUTCOMES_SCHEMA
+}
+
+SCORE_RANGE = (np.iinfo(np.int16).min, np.iinfo(np.int16).max)
+
+
+def schema_for(path):
+    """The schema registered for the file at `path`, or None."""
+    return FILE_SCHEMAS.get(os.path.basename(path))
+
+
+def _tier_key(tier):
+    """Sort key ordering tiers by their number, so "Tier 2" comes before "Tier 10"."""
+    match = re.search(r'\d+', str(tier))
+    return (int(match.group()) if match else math.inf, str(tier))
+
+
+def _cast(series, kind):
+    if kind == 'tier':
+        if isinstance(series.dtype, pd.CategoricalDtype) and series.dtype.ordered:
+            return series
+        values = series.astype(object).where(series.notna())
+        return pd.Series(pd.Categorical(values, categories=sorted(values.dropna().unique(), key=_tier_key), ordered=True),
+                         index=series.index, name=series.name)
+    if kind == 'category':
+        return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+    if kind == 'rate':
+        return series.astype(np.float32) if pd.api.types.is_float_dtype(series) or pd.api.types.is_integer_dtype(series) else series
+    if kind == 'score':
+        if not (pd.api.types.is_float_dtype(series) or pd.api.types.is_integer_dtype(series)):
+            return series
+        values = series.dropna()
+        if len(values) and (not (values == np.round(values)).all()
+                            or values.min() < SCORE_RANGE[0] or values.max() > SCORE_RANGE[1]):
+            return series
+        return series.astype('Int16')
+    raise ValueError(f"Unknown column kind: {kind}")
+
+
+def apply_schema(df, schema):
+    """Cast the columns of `df` named in `schema`; returns a new frame."""
+    columns = {col: _cast(df[col], kind) for col, kind in schema.items() if col in df.columns}
+    return df.assign(**columns) if columns else df
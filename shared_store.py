@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Process-wide, read-only store for the dashboard's DataFrames.
+
+st.cache_data pickles its result and hands every caller a fresh unpickled
+copy, so N concurrent sessions hold N copies of each table. Loaders wrapped
+with `shared_resource` are cached once per process with st.cache_resource
+instead, and each call returns a snapshot: shallow copies of the cached
+DataFrames that share their column buffers.
+
+pandas' Copy-on-Write (always on from pandas 3) makes the snapshot safe to
+treat as private: adding or replacing columns, .loc assignment and inplace
+methods copy just the touched data and never reach the shared frame. NumPy
+arrays are handed out as read-only views for the same reason. requirements.txt
+pins pandas>=3; on an older pandas, Copy-on-Write is switched on at import so
+a session can never write through to the shared frame.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Snapshots share buffers with the cached frame; without Copy-on-Write an
+# inplace edit in one session would change it for every session
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+
+def snapshot(value):
+    """A copy-on-write view of a cached value (recursing into tuples, lists and dicts)."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, tuple):
+        return tuple(snapshot(v) for v in value)
+    if isinstance(value, list):
+        return [snapshot(v) for v in value]
+    if isinstance(value, dict):
+        return {k: snapshot(v) for k, v in value.items()}
+    return value
+
+
+def shared_resource(func=None, max_entries=None):
+    """Cache `func` once per process and return copy-on-write snapshots of its result.
+
+    Usable bare (@shared_resource) or with arguments (@shared_resource(max_entries=2)).
+    """
+    def decorate(func):
+        cached = st.cache_resource(max_entries=max_entries)(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return snapshot(cached(*args, **kwargs))
+
+        wrapper.clear = cached.clear
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Nearest neighbours ("students like me") on topic accuracy and engagement.
+
+Each student is described by two blocks of features:
+
+* engagement - mean accuracy and participation, completed work and cumulative
+               attendance rates, from the engagement running totals
+* topics     - accuracy per JW exam topic, averaged over the exams taken
+
+Features are z-scored (missing values become the cohort mean) and each block
+is scaled by 1/sqrt(columns) so the ~90 topic columns do not drown out the
+engagement block. Rows are L2-normalized once, so the cosine similarity of one
+student to everyone else is a single matrix-vector product and the top k
+come from np.argpartition.
+"""
+import numpy as np
+import pandas as pd
+
+from engagement_ingest import running_totals, totals_profile
+
+def engagement_profiles(df_engagement):
+    """Per-student engagement features from the weekly engagement rows."""
+    return totals_profile(running_totals(df_engagement))
+
+
+def topic_profiles(exam_topics):
+    """Per-student accuracy on every topic, averaged over the exams the student took."""
+    taken = exam_topics.present.sum(axis=1)
+    totals = np.where(exam_topics.present, exam_topics.accuracy, 0).sum(axis=1, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accuracy = totals / taken
+    columns = [f'{exam_topics.section_names[s]}: {t}' for s, t in zip(exam_topics.topic_sections, exam_topics.topic_names)]
+    return pd.DataFrame(accuracy, index=pd.Index(exam_topics.student_ids, name='student_id'), columns=columns)
+
+
+def score_outcomes(df_tests):
+    """First, latest and best practice exam score per student."""
+    scores = df_tests.dropna(subset=['actual_exam_score']).sort_values(['student_id', 'test_date'], kind='stable')
+    grouped = scores.groupby('student_id')['actual_exam_score']
+    outcomes = pd.DataFrame({
+        'First Score': grouped.first(),
+        'Latest Score': grouped.last(),
+        'Best Score': grouped.max(),
+        'Exams Taken': grouped.count()
+    })
+    outcomes['Score Change'] = outcomes['Latest Score'] - outcomes['First Score']
+    return outcomes
+
+
+def _standardize_block(block):
+    values = block.to_numpy(dtype=np.float64)
+    observed = ~np.isnan(values)
+    count = np.maximum(observed.sum(axis=0), 1)
+    mean = np.where(observed, values, 0).sum(axis=0) / count
+    centered = np.where(observed, values - mean, 0)
+    std = np.sqrt((centered ** 2).sum(axis=0) / count)
+    z = centered / np.where(std > 0, std, 1.0)
+    return z / np.sqrt(max(values.shape[1], 1))
+
+
+class SimilarityIndex:
+    """Cosine-similarity index over per-student feature blocks sharing a student_id index."""
+
+    def __init__(self, blocks):
+        student_ids = pd.Index([])
+        for block in blocks:
+            student_ids = student_ids.union(block.index)
+        self.student_ids = student_ids.to_numpy()
+        self._rows = {student_id: row for row, student_id in enumerate(self.student_ids.tolist())}
+
+        matrix = np.hstack([_standardize_block(block.reindex(student_ids)) for block in blocks])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.vectors = (matrix / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+
+    def __contains__(self, student_id):
+        return student_id in self._rows
+
+    def __len__(self):
+        return len(self.student_ids)
+
+    def neighbors(self, student_id, k=5):
+        """The k most similar other students as a DataFrame of student_id and similarity."""
+        row = self._rows.get(student_id)
+        if row is None or len(self.student_ids) < 2:
+            return pd.DataFrame({'student_id': [], 'similarity': []})
+        similarity = self.vectors @ self.vectors[row]
+        similarity[row] = -np.inf
+        k = min(k, len(similarity) - 1)
+        top = np.argpartition(similarity, -k)[-k:]
+        top = top[np.argsort(similarity[top])[::-1]]
+        return pd.DataFrame({'student_id': self.student_ids[top], 'similarity': similarity[top].astype(np.float64)})
+
+
+def build_similarity_index(engagement, exam_topics):
+    """Similarity index over engagement and topic accuracy profiles.
+
+    `engagement` is a per-student profile (see engagement_ingest.totals_profile)
+    or the weekly engagement rows.
+    """
+    if 'week' in engagement.columns:
+        engagement = engagement_profiles(engagement)
+    return SimilarityIndex([engagement, topic_profiles(exam_topics)])
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""Data loading, transforms and charts for the Individual Student Dashboard.
+
+Shared by the Streamlit page in main.py and the headless batch exporter in
+export_reports.py, so both render the same content for a student.
+"""
+import altair as alt
+from chart_data import chart_data
+from data_store import read_table
+
+INDIVIDUAL_DATA_FILES = [
+    'institution-1-engagement-data.csv',
+    'institution-1-test-data.csv',
+    'institution-1-2025-exam-data-jw-exams.csv',
+    'tierdata.csv'
+]
+
+# (display label, tierdata.csv column) for the tier cards
+TIER_CATEGORIES = [
+    ('Survey Completion', 'Survey Tier'),
+    ('Class Attendance', 'Large Group Tier'),
+    ('Small Group Attendance', 'Small Group Tier'),
+    ('Class Participation', 'Class Participation Tier')
+]
+
+TIER_COLORS = {
+    'Tier 1': '#1B5E20',  # Dark green
+    'Tier 2': '#FF9800',  # Light orange
+    'Tier 3': '#EF5350',  # Red
+    'Tier 4': '#EF5350'   # Red
+}
+
+
+def load_individual_tables(base_path):
+    """Read the engagement, test, JW exam and tier tables.
+
+    `base_path` is a directory with the INDIVIDUAL_DATA_FILES, or the four
+    paths in that order (e.g. from partitions.Partition.paths).
+    """
+    if isinstance(base_path, str):
+        base_path = [f'{base_path}{f}' for f in INDIVIDUAL_DATA_FILES]
+    engagement_path, tests_path, sections_path, tiers_path = base_path
+    df_engagement_attendance = read_table(engagement_path, parse_dates=['start_date','end_date'])
+    df_test_scores = read_table(tests_path, parse_dates=['test_date'])
+    df_test_section_scores = read_table(sections_path)
+    df_tier_data = read_table(tiers_path)
+    df_test_scores['test_date'] = df_test_scores['test_date'].dt.date
+    return df_engagement_attendance, df_test_scores, df_test_section_scores, df_tier_data
+
+
+def tier_badge_html(tier):
+    """Colored badge for a tier (grey if the tier is not recognized)."""
+    color = TIER_COLORS.get(tier, '#9E9E9E')
+    return f"<div style='background-color: {color}; padding: 10px; border-radius: 5px; text-align: center; color: white; font-weight: bold;'>{tier}</div>"
+
+
+def student_tiers(df_tier_student):
+    """(label, tier) pairs for a student's tier cards, or [] without tier data."""
+    if df_tier_student.empty:
+        return []
+    row = df_tier_student.iloc[0]
+    return [(label, row[column]) for label, column in TIER_CATEGORIES]
+
+
+def prepare_student_engagement(df_engagement_student):
+    """Add tooltip date ranges and cumulative attendance rates to one student's weekly rows."""
+    df = df_engagement_student.copy()
+    # Create date_range column for tooltips
+    df['date_range'] = df['start_date'].dt.strftime('%m/%d/%y') + ' - ' + df['end_date'].dt.strftime('%m/%d/%y')
+    df['num_attended_large_session_cumsum'] = df['num_attended_large_session'].cumsum()
+    df['num_scheduled_large_session_cumsum'] = df['num_scheduled_large_session'].cumsum()
+    df['num_attended_small_session_cumsum'] = df['num_attended_small_session'].cumsum()
+    df['num_scheduled_small_session_cumsum'] = df['num_scheduled_small_session'].cumsum()
+    df['large_session'] = df['num_attended_large_session_cumsum'] / df['num_scheduled_large_session_cumsum']
+    df['small_session'] = df['num_attended_small_session_cumsum'] / df['num_scheduled_small_session_cumsum']
+    return df
+
+
+def engagement_averages(df_engagement_student):
+    """Mean participation and accuracy for a student, plus overall participation."""
+    averages = df_engagement_student[['class_participation','homework_participation','cars_accuracy','sciences_accuracy','class_accuracy']].mean()
+    averages['overall_participation'] = (averages['class_participation'] + averages['homework_participation']) / 2
+    return averages
+
+
+def exam_scores_chart(df_test_student):
+    """Practice exam scores over time."""
+    return alt.Chart(chart_data(df_test_student, 'exam_scores')).mark_point().transform_fold(
+        fold=['actual_exam_score'],
+        as_=['variable','value']
+    ).encode(
+        x=alt.X(
+            'yearmonthdate(test_date):O',
+            axis=alt.Axis(
+                labelAngle=-45,
+                title='Test Date'
+            )
+        ),
+        y=alt.Y(
+            'value:Q',
+            axis=alt.Axis(
+                title='Practice Exam Score'
+            ),
+            scale=alt.Scale(domain=[470, 528])
+        ),
+        tooltip=[
+            alt.Tooltip('test_date:T', title='Test Date'),
+            alt.Tooltip('value:Q', title='Exam Score')
+        ],
+        color=alt.Color(
+            'variable:N',
+            legend=alt.Legend(
+                title='Exam Scores',
+                orient='bottom',
+                labelExpr="'Practice Exam Score'"
+            )
+        )
+    )
+
+
+def lessons_chart(df_engagement_student):
+    """Completed course lessons per week."""
+    return alt.Chart(chart_data(df_engagement_student, 'lessons')).mark_line(point=True).transform_fold(
+            ['completed_lessons'],
+            as_=['variable', 'value']
+        ).encode(
+            x=alt.X(
+                'week:O',
+                axis=alt.Axis(
+                    labelAngle=0,
+                    title='Week'
+                )
+            ),
+            y=alt.Y(
+                'value:Q',
+                axis=alt.Axis(
+                    title='Completed Count',
+                )
+            ),
+            tooltip=[
+                alt.Tooltip('week:O', title='Week'),
+                alt.Tooltip('date_range:N', title='Date Range'),
+                alt.Tooltip('value:Q', title='Completed Number of Lessons')
+            ],
+            color=alt.Color(
+                'variable:N',
+                legend=alt.Legend(
+                    title='Type',
+                    orient='bottom',
+                    labelExpr="'Completed Course Lessons'"
+                )
+            )
+    )
+
+
+def question_sets_chart(df_engagement_student):
+    """Completed question bank sets per week."""
+    return alt.Chart(chart_data(df_engagement_student, 'question_sets')).mark_line(point=True).encode(
+        x=alt.X(
+            'week:O',
+            axis=alt.Axis(
+                labelAngle=0,
+                title='Week'
+            )
+        ),
+        y=alt.Y(
+            'total_completed_passages_discrete_sets:Q',
+            axis=alt.Axis(
+                title='Completed Number of Question Sets'
+            )
+        ),
+        tooltip=[
+            alt.Tooltip('week:O', title='Week'),
+            alt.Tooltip('date_range:N', title='Date Range'),
+            alt.Tooltip('total_completed_passages_discrete_sets:Q', title='Completed Count')
+        ],
+    )
+
+
+def participation_chart(df_engagement_student):
+    """Weekly class and homework participation rates."""
+    return alt.Chart(chart_data(df_engagement_student, 'participation')).mark_line(point=True).transform_fold(
+        fold=['class_participation', 'homework_participation'],
+        as_=['variable', 'value']
+    ).encode(
+        x=alt.X(
+            'week:O',
+            axis=alt.Axis(
+                labelAngle=0,
+                title='Week'
+            )
+        ),
+        y=alt.Y(
+            'value:Q',
+            axis=alt.Axis(
+                title='Participation Rate',
+                format='%'
+            )
+        ),
+        tooltip=[
+            alt.Tooltip('week:O', title='Week'),
+            alt.Tooltip('date_range:N', title='Date Range'),
+            alt.Tooltip('value:Q', title='Participation Rate', format='0.1%')
+        ],
+        color=alt.Color(
+            'variable:N',
+            legend=alt.Legend(
+                title='Type',
+                orient='bottom',
+                labelExpr="datum.value == 'class_participation' ? 'Class Participation' : 'Homework Completion'"
+            )
+        )
+    )
+
+
+def accuracy_chart(df_engagement_student):
+    """Weekly science, CARS and in-class question accuracy."""
+    return alt.Chart(chart_data(df_engagement_student, 'accuracy')).mark_line(point=True).transform_fold(
+        fold=['sciences_accuracy', 'cars_accuracy','class_accuracy'],
+        as_=['variable', 'value']
+    ).encode(
+        x=alt.X(
+            'week:O',
+            axis=alt.Axis(
+                labelAngle=0,
+                title='Week'
+            )
+        ),
+        y=alt.Y(
+            'value:Q',
+            axis=alt.Axis(
+                title='Average Accuracy (%)',
+                format='%'
+            )
+        ),
+        tooltip=[
+            alt.Tooltip('week:O', title='Week'),
+            alt.Tooltip('date_range:N', title='Date Range'),
+            alt.Tooltip('value:Q', title='Accuracy Rate', format='0.1%')
+        ],
+        color=alt.Color(
+            'variable:N',
+            legend=alt.Legend(
+                title='Subject',
+                orient='bottom',
+                labelExpr="datum.value == 'cars_accuracy' ? 'CARS Questions' : datum.value == 'class_accuracy' ? 'In-Class Questions' : 'Science Questions'"
+            )
+        )
+    )
+
+
+def attendance_chart(df_engagement_student):
+    """Cumulative large-class and small-group attendance rates by week."""
+    return alt.Chart(chart_data(df_engagement_student, 'attendance')).mark_line(point=True).transform_fold(
+        fold=['large_session','small_session'],
+        as_=['variable','value']
+    ).encode(
+        x=alt.X(
+            'week:O',
+            axis=alt.Axis(
+                labelAngle=0,
+                title='Week'
+            )
+        ),
+        y=alt.Y(
+            'value:Q',
+            axis=alt.Axis(
+                title='Cumulative Attendance Rate',
+                format='%'
+            )
+        ),
+        tooltip=[
+            alt.Tooltip('week:O', title='Week'),
+            alt.Tooltip('date_range:N', title='Date Range'),
+            alt.Tooltip('value:Q', title='Cumulative Attendance Rate', format='0.1%')
+        ],
+        color=alt.Color(
+            'variable:N',
+            legend=alt.Legend(
+                title='Session Type',
+                orient='bottom',
+                labelExpr="datum.value == 'large_session' ? 'Classes with All Students' : 'Small Group Sessions'"
+            )
+        )
+    )
+
+
+# (section title, chart builder, uses engagement rows) in dashboard order. Builders
+# take a student's rows, or an alt.NamedData reference to a dataset shared by
+# several charts (see chart_data.shared_data).
+STUDENT_CHARTS = [
+    ('Practice Exam Scores', exam_scores_chart, False),
+    ('Self-Learning with Jack Westin Course or Question Bank', lessons_chart, True),
+    ('Completed Question Sets', question_sets_chart, True),
+    ('Class and Homework Participation', participation_chart, True),
+    ('Average Accuracy (%) on Question Sets Per Week', accuracy_chart, True),
+    ('Attendance', attendance_chart, True)
+]
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Student-level tables for the Analysis Dashboard.
+
+data_outcomes_with_tiers.csv is weekly-grain. The outcome table (one row per
+student with baseline/practice/actual scores) is derived from it, and Key
+Actionable Insights, Attendance Analysis and Performer Analysis all need the
+weekly data rolled up to one row per student and joined to those outcomes,
+so both are built here once and shared by every page.
+"""
+import numpy as np
+
+TIER_COLUMNS = ['Survey Tier', 'Large Group Tier', 'Small Group Tier', 'Class Participation Tier']
+
+# Outcome fields repeated on every weekly row, and their names in the outcome table
+OUTCOME_SOURCE_COLUMNS = {
+    'Baseline Score': 'Baseline_Score',
+    'Number of Practice Exams': 'Number_of_Practice_Exams',
+    'Most Recent Practice Exam': 'Most_Recent_Practice_Exam',
+    'Actual MCAT': 'Actual_MCAT',
+    'Score Difference': 'Score_Difference',
+}
+
+OUTCOME_COLUMNS = [
+    'Student_ID', 'Baseline_Score', 'Number_of_Practice_Exams', 'Most_Recent_Practice_Exam',
+    'Actual_MCAT', 'Score_Difference', 'Total_Completed_Passages_Discrete_Sets', 'Total_Completed_Sum'
+]
+
+
+def build_outcome_table(csv_df):
+    """Derive the one-row-per-student outcome table from the weekly outcomes CSV.
+
+    Outcome fields are constant within a student, so the first row is kept;
+    Total_Completed_Passages_Discrete_Sets is the student's weekly sets summed.
+    """
+    grouped = csv_df.dropna(subset=['student_id']).groupby('student_id', sort=False)
+    outcomes = grouped[list(OUTCOME_SOURCE_COLUMNS)].first().rename(columns=OUTCOME_SOURCE_COLUMNS)
+    outcomes['Total_Completed_Passages_Discrete_Sets'] = grouped['total_completed_passages_discrete_sets'].sum(min_count=1)
+    outcomes.index.name = 'Student_ID'
+    return outcomes.reset_index()
+
+
+def aggregate_weekly_data(csv_df):
+    """Roll the weekly engagement rows up to one row per student."""
+    aggregations = {
+        'class_accuracy': ('class_accuracy', 'mean'),
+        'class_participation': ('class_participation', 'mean'),
+        'homework_participation': ('homework_participation', 'mean'),
+        'num_attended_large_session': ('num_attended_large_session', 'sum'),
+        'num_scheduled_large_session': ('num_scheduled_large_session', 'sum'),
+        'num_attended_small_session': ('num_attended_small_session', 'sum'),
+        'num_scheduled_small_session': ('num_scheduled_small_session', 'sum'),
+        'total_completed_passages_discrete_sets': ('total_completed_passages_discrete_sets', 'sum'),
+        'completed_lessons': ('completed_lessons', 'sum'),
+    }
+    for tier_col in TIER_COLUMNS:
+        if tier_col in csv_df.columns:
+            aggregations[tier_col] = (tier_col, 'first')
+
+    student_data = csv_df.groupby('student_id').agg(**aggregations)
+
+    # Share of weeks with any class participation (%), counting weeks with no record as 0
+    participated = (csv_df['class_participation'] > 0).groupby(csv_df['student_id']).mean()
+    student_data['class_participation_rate'] = participated * 100
+    student_data['class_participation_relative'] = (
+        student_data['class_participation'] / student_data['class_participation'].max() * 100
+    )
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        student_data['large_attendance_rate'] = (student_data['num_attended_large_session'] /
+                                                 student_data['num_scheduled_large_session'] * 100)
+        student_data['small_attendance_rate'] = (student_data['num_attended_small_session'] /
+                                                 student_data['num_scheduled_small_session'] * 100)
+
+    return student_data.reset_index()
+
+
+def build_student_features(df, csv_df):
+    """Join the per-student roll-up of `csv_df` to the outcome table `df`.
+
+    Returns one row per student present in both tables, carrying the outcome
+    columns (Baseline_Score, Score_Difference, ...) alongside the engagement,
+    attendance and tier features.
+    """
+    student_data = aggregate_weekly_data(csv_df)
+    outcome_cols = [c for c in OUTCOME_COLUMNS if c in df.columns]
+    return df[outcome_cols].merge(
+        student_data, left_on='Student_ID', right_on='student_id', how='inner'
+    )
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Per-student partitioned views of the dashboard tables.
+
+Tables are sorted once by student_id and the start/stop offsets of each
+student's block are kept, so selecting a student is a positional slice over
+that student's rows instead of a boolean mask over the whole roster.
+"""
+import numpy as np
+
+
+class StudentPartitions:
+    """A table sorted by student_id with offset ranges for each student."""
+
+    def __init__(self, df, key='student_id'):
+        self.key = key
+        df = df[df[key].notna()]
+        # Stable sort keeps each student's rows in their original (week/date) order
+        order = np.argsort(df[key].to_numpy(), kind='stable')
+        self.frame = df.iloc[order].reset_index(drop=True)
+
+        keys = self.frame[key].to_numpy()
+        self.student_ids, starts = np.unique(keys, return_index=True)
+        stops = np.append(starts[1:], len(keys))
+        self._offsets = {
+            sid: (int(start), int(stop))
+            for sid, start, stop in zip(self.student_ids.tolist(), starts, stops)
+        }
+
+    def __contains__(self, student_id):
+        return student_id in self._offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def get(self, student_id):
+        """Rows for one student (an empty frame if the student has none)."""
+        bounds = self._offsets.get(student_id)
+        if bounds is None:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[bounds[0]:bounds[1]]
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Opt-in render timing for the dashboard.
+
+Enable with the `DASHBOARD_TIMING=1` environment variable or by opening the
+app with `?timing=1`. Each rerun then records how long its loaders, page
+sections and charts took, shows the breakdown in a sidebar expander and
+appends one JSON line per timed section to a local log file
+(`DASHBOARD_TIMING_LOG`, default `dashboard-timings.jsonl`):
+
+    {"run_id": "...", "timestamp": "...", "page": "Attendance Analysis",
+     "category": "charts", "name": "Large Group Tier heatmap", "ms": 41.2}
+
+When timing is off every call is a no-op, so the hooks can stay in place.
+"""
+import contextlib
+import functools
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+TIMING_ENV_VAR = 'DASHBOARD_TIMING'
+TIMING_LOG_ENV_VAR = 'DASHBOARD_TIMING_LOG'
+DEFAULT_LOG_PATH = 'dashboard-timings.jsonl'
+
+
+def timing_enabled():
+    """True when timing is switched on by environment variable or query parameter."""
+    if os.environ.get(TIMING_ENV_VAR, '').lower() in ('1', 'true', 'yes'):
+        return True
+    try:
+        return st.query_params.get('timing', '') in ('1', 'true')
+    except Exception:
+        return False
+
+
+class RunTimer:
+    """Collects timings for one script run. Create a new one at the top of every rerun."""
+
+    def __init__(self, enabled=None, log_path=None):
+        self.enabled = timing_enabled() if enabled is None else enabled
+        self.log_path = log_path or os.environ.get(TIMING_LOG_ENV_VAR, DEFAULT_LOG_PATH)
+        self.run_id = uuid.uuid4().hex[:12]
+        self.records = []
+        self.page_name = None
+        self._run_start = time.perf_counter()
+        self._page_start = None
+
+    @contextlib.contextmanager
+    def section(self, category, name):
+        """Time the enclosed block as `category` / `name`."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(category, name, time.perf_counter() - start)
+
+    def timed(self, category, name=None):
+        """Decorator form of `section`; the name defaults to the function name."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.section(category, name or func.__name__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def page(self, name):
+        """Mark the start of a page body; it is timed until `finish`."""
+        self.page_name = name
+        self._page_start = time.perf_counter()
+
+    def finish(self):
+        """Close the run: show the sidebar breakdown and append the records to the log."""
+        if not self.enabled:
+            return
+        end = time.perf_counter()
+        if self._page_start is not None:
+            self._record('pages', self.page_name, end - self._page_start)
+        self._record('run', 'total', end - self._run_start)
+        self.render_sidebar()
+        self.write_log()
+
+    def _record(self, category, name, seconds):
+        self.records.append({'category': category, 'name': name, 'ms': round(seconds * 1000, 2)})
+
+    def summary(self):
+        """Timings for this run as a DataFrame, slowest first."""
+        df = pd.DataFrame(self.records, columns=['category', 'name', 'ms'])
+        return df.sort_values('ms', ascending=False, ignore_index=True)
+
+    def render_sidebar(self):
+        total = next((r['ms'] for r in self.records if r['category'] == 'run'), 0)
+        with st.sidebar.expander(f"⏱ Render timing ({total:,.0f} ms)"):
+            summary = self.summary()
+            st.dataframe(summary[summary['category'] != 'run'], hide_index=True, use_container_width=True)
+            st.caption(f"Run {self.run_id}; sections can nest, so times overlap. Log: {self.log_path}")
+
+    def write_log(self):
+        timestamp = datetime.now().isoformat(timespec='milliseconds')
+        lines = [
+            json.dumps({'run_id': self.run_id, 'timestamp': timestamp, 'page': self.page_name, **record})
+            for record in self.records
+        ]
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+        except OSError:
+            # Timing must never break the page
+            pass